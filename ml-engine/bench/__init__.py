@@ -0,0 +1 @@
+"""Load generation for the GuardQuote ML Engine."""
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Load generator for the GuardQuote ML Engine.
+Drives /quote, /quote/rule-based and /risk-assessment at stepped
+concurrency levels and reports throughput, latency percentiles and error
+rate per step, plus the knee of the saturation curve.
+
+Targets:
+    in-process  the FastAPI app through httpx's ASGI transport (default;
+                client and server share one event loop, so use it for
+                relative comparisons, not capacity planning)
+    --url       an already running engine
+    --spawn     a local uvicorn started with --workers N
+
+Usage:
+    python -m bench.load_test --model models/trained/guardquote_models.pkl
+    python -m bench.load_test --spawn --workers 4 --concurrency 1,2,4,8,16,32,64
+    python -m bench.load_test --url http://localhost:8000 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import httpx
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+ENDPOINTS = ("/api/v1/quote", "/api/v1/quote/rule-based", "/api/v1/risk-assessment")
+DEFAULT_LEVELS = (1, 2, 4, 8, 16, 32, 64)
+
+# The knee is the lowest concurrency reaching this share of peak throughput
+KNEE_FRACTION = 0.9
+
+
+def summarize_step(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Throughput, latency percentiles (ms) and error rate for one step."""
+    total = len(latencies) + errors
+    ms = np.asarray(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'requests': total,
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'error_rate': errors / total if total else 0.0,
+    }
+
+
+def find_knee(steps: list[dict], max_error_rate: float = 0.01) -> dict | None:
+    """Lowest-concurrency step reaching KNEE_FRACTION of the peak throughput.
+
+    Steps with an error rate above ``max_error_rate`` do not count. Beyond
+    the knee, more concurrency mostly adds queueing latency, not throughput.
+    """
+    healthy = [step for step in steps if step['error_rate'] <= max_error_rate]
+    if not healthy:
+        return None
+    peak = max(step['throughput_rps'] for step in healthy)
+    for step in sorted(healthy, key=lambda s: s['concurrency']):
+        if step['throughput_rps'] >= KNEE_FRACTION * peak:
+            return step
+    return None
+
+
+async def run_step(client: httpx.AsyncClient, endpoint: str, bodies: list[dict],
+                   concurrency: int, duration: float) -> dict:
+    """Closed loop: ``concurrency`` clients each send back-to-back requests."""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset: int):
+        nonlocal errors
+        i = offset
+        while time.perf_counter() < deadline:
+            body = bodies[i % len(bodies)]
+            i += concurrency
+            start = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    step = summarize_step(latencies, errors, time.perf_counter() - start)
+    step['concurrency'] = concurrency
+    return step
+
+
+async def run_load(client: httpx.AsyncClient, bodies: list[dict], endpoints=ENDPOINTS,
+                   levels=DEFAULT_LEVELS, duration: float = 5.0, warmup: float = 1.0,
+                   log=print) -> dict:
+    """Step every endpoint through ``levels``; returns per-endpoint steps and knee."""
+    report = {}
+    for endpoint in endpoints:
+        await run_step(client, endpoint, bodies, max(levels), warmup)
+        steps = []
+        for concurrency in levels:
+            step = await run_step(client, endpoint, bodies, concurrency, duration)
+            steps.append(step)
+            log(f"{endpoint:<28} c={concurrency:<4} {step['throughput_rps']:>8.1f} rps  "
+                f"p50 {step['p50_ms']:>7.2f}  p95 {step['p95_ms']:>7.2f}  "
+                f"p99 {step['p99_ms']:>7.2f} ms  err {step['error_rate']:.1%}")
+        knee = find_knee(steps)
+        report[endpoint] = {'steps': steps, 'knee': knee}
+        if knee is not None:
+            log(f"{endpoint:<28} knee at c={knee['concurrency']} "
+                f"({knee['throughput_rps']:.1f} rps, p99 {knee['p99_ms']:.2f} ms)")
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def uvicorn_server(workers: int, ready_timeout: float = 120.0):
+    """Start ``uvicorn src.main:app`` locally and wait for /api/v1/ready."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + ready_timeout
+        async with httpx.AsyncClient(base_url=url) as probe:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+                try:
+                    if (await probe.get("/api/v1/ready")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become ready in time")
+                await asyncio.sleep(0.2)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@asynccontextmanager
+async def target_client(url: str | None, spawn: bool, workers: int, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(30.0)
+    if spawn:
+        async with uvicorn_server(workers) as spawned:
+            async with httpx.AsyncClient(base_url=spawned, limits=limits,
+                                         timeout=timeout) as client:
+                yield client
+    elif url:
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+            yield client
+    else:
+        from src.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     timeout=timeout) as client:
+            yield client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a running engine")
+    target.add_argument("--spawn", action="store_true", help="Start a local uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    parser.add_argument("--model", help="guardquote_models.pkl for the in-process target")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_LEVELS)),
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per step")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Warmup seconds per endpoint")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    from benchmark_suite import load_samples
+
+    if args.model:
+        from src.models import trained_predictor
+
+        trained_predictor.MODEL_PATH = args.model
+    levels = sorted({int(level) for level in args.concurrency.split(",")})
+    endpoints = args.endpoints.split(",")
+    bodies = [sample['request'] for sample in load_samples(count=args.samples)]
+
+    async def run():
+        async with target_client(args.url, args.spawn, args.workers, max(levels)) as client:
+            return await run_load(client, bodies, endpoints, levels, args.duration, args.warmup)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'target': args.url or ("uvicorn" if args.spawn else "in-process"),
+            'workers': args.workers if args.spawn else None,
+            'cpus': os.cpu_count(),
+            'duration_s': args.duration,
+            'levels': levels,
+        },
+        'endpoints': asyncio.run(run()),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Model load benchmark: pickle vs memory-mapped export.
+Starts N concurrent worker processes per format and reports load time,
+RSS and PSS (proportional set size, which splits shared pages between
+the processes mapping them).
+
+Usage:
+    python scripts/benchmark_model_load.py \\
+        --pickle models/trained/guardquote_models.pkl \\
+        --export models/trained/guardquote_models --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _memory_kb() -> dict:
+    usage = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                usage['rss'] = int(line.split()[1])
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                usage['pss'] = int(line.split()[1])
+    return usage
+
+
+def _worker(model_format, pickle_path, export_path, ready, done, results):
+    sys.path.insert(0, ROOT)
+    os.environ["MODEL_FORMAT"] = model_format
+    from src.models import trained_predictor
+
+    trained_predictor.MODEL_PATH = pickle_path
+    trained_predictor.EXPORT_PATH = export_path
+    before = _memory_kb()
+
+    start = time.perf_counter()
+    predictor = trained_predictor.TrainedPredictor()
+    load_seconds = time.perf_counter() - start
+    if not predictor.loaded:
+        results.put({'error': f"{model_format} artifact failed to load"})
+        return
+
+    # Touch every tree so all pages are resident before measuring
+    import numpy as np
+    predictor.price_model.predict(np.zeros((64, len(predictor.encoder.price_features))))
+    predictor.risk_model.predict_proba(np.zeros((64, len(predictor.encoder.risk_features))))
+
+    ready.wait()
+    after = _memory_kb()
+    results.put({
+        'load_ms': load_seconds * 1000,
+        'rss_mb': after['rss'] / 1024,
+        'pss_mb': after['pss'] / 1024,
+        'model_rss_mb': (after['rss'] - before['rss']) / 1024,
+    })
+    done.wait()
+
+
+def measure(model_format: str, pickle_path: str, export_path: str, workers: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Barrier(workers + 1)
+    done = ctx.Barrier(workers + 1)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker,
+                    args=(model_format, pickle_path, export_path, ready, done, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    ready.wait()
+    rows = [results.get() for _ in processes]
+    done.wait()
+    for process in processes:
+        process.join()
+
+    errors = [row['error'] for row in rows if 'error' in row]
+    if errors:
+        raise SystemExit(errors[0])
+    return {key: sum(row[key] for row in rows) / len(rows) for key in rows[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pickle", required=True, help="guardquote_models.pkl")
+    parser.add_argument("--export", required=True, help="Exported artifact directory")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    pickle_path = os.path.abspath(args.pickle)
+    export_path = os.path.abspath(args.export)
+
+    print(f"{args.workers} concurrent workers per format (averages per worker)")
+    print(f"{'format':<8} {'load ms':>9} {'RSS MB':>8} {'PSS MB':>8} {'model RSS MB':>13}")
+    for model_format in ("pickle", "mmap"):
+        stats = measure(model_format, pickle_path, export_path, args.workers)
+        print(f"{model_format:<8} {stats['load_ms']:>9.1f} {stats['rss_mb']:>8.1f} "
+              f"{stats['pss_mb']:>8.1f} {stats['model_rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the ML quote endpoint.
+Drives /api/v1/quote in-process and reports p50/p99 latency.
+
+Usage:
+    python scripts/benchmark_quote.py --model models/trained/guardquote_models.pkl
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+QUOTE = {
+    "event_type": "concert",
+    "location_zip": "90210",
+    "num_guards": 6,
+    "hours": 8,
+    "date": "2026-03-14T20:00:00",
+    "is_armed": True,
+    "crowd_size": 1500,
+}
+
+
+def percentiles(samples: list[float]) -> dict:
+    ms = np.array(samples) * 1000
+    return {
+        'p50': float(np.percentile(ms, 50)),
+        'p99': float(np.percentile(ms, 99)),
+        'mean': float(ms.mean()),
+    }
+
+
+def time_calls(fn, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Path to guardquote_models.pkl")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    args = parser.parse_args()
+
+    from src.models import trained_predictor
+
+    if args.model:
+        trained_predictor.MODEL_PATH = args.model
+    predictor = trained_predictor.get_predictor()
+    if not predictor.loaded:
+        sys.exit("Models not loaded - benchmark would only measure the fallback path")
+
+    from fastapi.testclient import TestClient
+    from src.main import app
+
+    client = TestClient(app)
+
+    def quote():
+        response = client.post("/api/v1/quote", json=QUOTE)
+        response.raise_for_status()
+
+    inputs = {
+        'event_type': QUOTE['event_type'], 'state': 'CA', 'zip_code': QUOTE['location_zip'],
+        'risk_zone': 'medium', 'num_guards': QUOTE['num_guards'], 'hours': QUOTE['hours'],
+        'crowd_size': QUOTE['crowd_size'], 'event_date': datetime.fromisoformat(QUOTE['date']),
+        'is_armed': QUOTE['is_armed'], 'has_vehicle': False,
+    }
+    risk_inputs = {k: v for k, v in inputs.items() if k not in ('risk_zone', 'has_vehicle')}
+
+    def separate():
+        predictor.predict_price(**inputs)
+        predictor.predict_risk(**risk_inputs)
+
+    def fused():
+        predictor.predict_quote(**inputs)
+
+    cases = {'POST /api/v1/quote': quote, 'predict_price + predict_risk': separate}
+    if hasattr(predictor, 'predict_quote'):
+        cases['predict_quote (fused)'] = fused
+
+    print(f"{'case':<32} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, fn in cases.items():
+        stats = time_calls(fn, args.iterations, args.warmup)
+        print(f"{name:<32} {stats['p50']:>9.3f} {stats['p99']:>9.3f} {stats['mean']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
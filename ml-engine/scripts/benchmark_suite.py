@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the GuardQuote ML Engine.
+Times the rule-based engine, the trained predictor and full /api/v1/quote
+round-trips on requests sampled from the 2026 training data, writes the
+results as JSON and optionally fails on regressions against a baseline run.
+
+Usage:
+    python scripts/benchmark_suite.py --model models/trained/guardquote_models.pkl \\
+        --output bench-results.json
+    python scripts/benchmark_suite.py --model ... --baseline bench-results.json \\
+        --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from src.models.pricing_engine import TRAINING_EVENT_TYPES as API_EVENT_TYPES  # noqa: E402
+
+DEFAULT_DATA = os.path.join(ROOT, "data", "processed", "training_data_2026.csv")
+
+STATS = ('p50', 'p95', 'p99', 'mean')
+
+
+def _event_date(month: int, day_of_week: int, hour: int) -> datetime:
+    """First 2026 date in ``month`` falling on ``day_of_week`` (Monday=0) at ``hour``."""
+    date = datetime(2026, month, 1, hour)
+    return date + timedelta(days=(day_of_week - date.weekday()) % 7)
+
+
+def _state_zips() -> dict:
+    from generate_training_data_2026 import LOCATIONS_2026
+
+    zips: dict = {}
+    for zip_code, _, state, _, _, risk_zone, _ in LOCATIONS_2026:
+        zips.setdefault(state, {}).setdefault(risk_zone, zip_code)
+    return zips
+
+
+def load_samples(path: str = DEFAULT_DATA, count: int = 200, seed: int = 2026) -> list[dict]:
+    """Sample training rows as (API request body, predictor kwargs) pairs.
+
+    Rows the API would reject (e.g. shifts over 24 hours) are skipped.
+    """
+    import pandas as pd
+    from pydantic import ValidationError
+    from src.models.schemas import QuoteRequest
+
+    sys.path.insert(0, os.path.join(ROOT, "scripts"))
+    zips = _state_zips()
+    rows = pd.read_csv(path).sample(frac=1.0, random_state=seed)
+
+    samples = []
+    for row in rows.itertuples(index=False):
+        if len(samples) == count:
+            break
+        by_zone = zips.get(row.state, {})
+        zip_code = by_zone.get(row.risk_zone) or next(iter(by_zone.values()), "90001")
+        event_date = _event_date(int(row.month), int(row.day_of_week), int(row.hour_of_day))
+        inputs = {
+            'event_type': row.event_type,
+            'state': row.state,
+            'zip_code': zip_code,
+            'risk_zone': row.risk_zone,
+            'num_guards': int(row.guards),
+            'hours': float(row.duration),
+            'crowd_size': int(row.crowd_size),
+            'event_date': event_date,
+            'is_armed': bool(row.is_armed),
+            'has_vehicle': bool(row.has_vehicle),
+        }
+        request = {
+            'event_type': API_EVENT_TYPES.get(row.event_type, 'private'),
+            'location_zip': zip_code,
+            'num_guards': inputs['num_guards'],
+            'hours': inputs['hours'],
+            'date': event_date.isoformat(),
+            'is_armed': inputs['is_armed'],
+            'requires_vehicle': inputs['has_vehicle'],
+            'crowd_size': inputs['crowd_size'],
+        }
+        try:
+            QuoteRequest.model_validate(request)
+        except ValidationError:
+            continue
+        samples.append({'request': request, 'inputs': inputs})
+    return samples
+
+
+def summarize(samples: list[float]) -> dict:
+    us = np.asarray(samples) * 1e6
+    return {
+        'p50': float(np.percentile(us, 50)),
+        'p95': float(np.percentile(us, 95)),
+        'p99': float(np.percentile(us, 99)),
+        'mean': float(us.mean()),
+        'ops_per_sec': float(len(us) / (us.sum() / 1e6)),
+        'iterations': len(us),
+    }
+
+
+def time_sync(fn, args: list, iterations: int, warmup: int) -> dict:
+    """Time ``fn(arg)`` cycling through ``args``."""
+    for i in range(warmup):
+        fn(args[i % len(args)])
+    samples = []
+    for i in range(iterations):
+        arg = args[i % len(args)]
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def time_async(fn, args: list, iterations: int, warmup: int) -> dict:
+    """Like ``time_sync`` for a coroutine function, on one running event loop."""
+    for i in range(warmup):
+        await fn(args[i % len(args)])
+    samples = []
+    for i in range(iterations):
+        arg = args[i % len(args)]
+        start = time.perf_counter()
+        await fn(arg)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def _time_quote_endpoint(samples: list[dict], iterations: int, warmup: int) -> dict:
+    import httpx
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def quote(body):
+            response = await client.post("/api/v1/quote", json=body)
+            response.raise_for_status()
+
+        return await time_async(
+            quote, [sample['request'] for sample in samples], iterations, warmup
+        )
+
+
+def run_suite(predictor, samples: list[dict], iterations: int, warmup: int) -> dict:
+    """Time every case; returns ``{case: stats}`` with latencies in microseconds."""
+    from src.models.pricing_engine import get_pricing_engine
+    from src.models.schemas import QuoteRequest
+
+    engine = get_pricing_engine()
+    requests = [QuoteRequest.model_validate(sample['request']) for sample in samples]
+    inputs = [sample['inputs'] for sample in samples]
+    risk_inputs = [
+        {k: v for k, v in item.items() if k not in ('risk_zone', 'has_vehicle')}
+        for item in inputs
+    ]
+
+    results = {
+        'pricing_engine.calculate_quote': time_sync(
+            engine.calculate_quote, requests, iterations, warmup),
+        'pricing_engine.assess_risk': time_sync(
+            engine.assess_risk, requests, iterations, warmup),
+        'predictor.predict_price': time_sync(
+            lambda kwargs: predictor.predict_price(**kwargs), inputs, iterations, warmup),
+        'predictor.predict_risk': time_sync(
+            lambda kwargs: predictor.predict_risk(**kwargs), risk_inputs, iterations, warmup),
+    }
+    results['api.quote'] = asyncio.run(_time_quote_endpoint(samples, iterations, warmup))
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float, metric: str = 'p50') -> list[dict]:
+    """Cases whose ``metric`` grew by more than ``threshold`` (0.1 = 10%)."""
+    regressions = []
+    for case, stats in current['results'].items():
+        before = baseline.get('results', {}).get(case)
+        if before is None or before[metric] <= 0:
+            continue
+        change = stats[metric] / before[metric] - 1
+        if change > threshold:
+            regressions.append({
+                'case': case, 'metric': metric,
+                'baseline': before[metric], 'current': stats[metric], 'change': change,
+            })
+    return regressions
+
+
+def _metadata(predictor, args) -> dict:
+    import sklearn
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'model_version': predictor.version,
+        'inference_engines': predictor.engines,
+        'samples': args.samples,
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'prediction_cache': args.cache,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", help="Path to guardquote_models.pkl")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="CSV to sample requests from")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--cache", action="store_true",
+                        help="Keep the prediction cache on (off by default so every "
+                             "call reaches the models)")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown vs the baseline before failing (0.10 = 10%%)")
+    parser.add_argument("--metric", choices=STATS, default="p50")
+    args = parser.parse_args()
+
+    from src.config import get_settings
+    from src.models import trained_predictor
+
+    if not args.cache:
+        get_settings().prediction_cache_size = 0
+    if args.model:
+        trained_predictor.MODEL_PATH = args.model
+    predictor = trained_predictor.get_predictor()
+    if not predictor.loaded:
+        sys.exit("Models not loaded - benchmark would only measure the fallback path")
+
+    samples = load_samples(args.data, args.samples)
+    report = {
+        'meta': _metadata(predictor, args),
+        'results': run_suite(predictor, samples, args.iterations, args.warmup),
+    }
+
+    print(f"{'case':<32} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'ops/s':>10}",
+          file=sys.stderr)
+    for case, stats in report['results'].items():
+        print(f"{case:<32} {stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['p99']:>9.1f} "
+              f"{stats['ops_per_sec']:>10.0f}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold, args.metric)
+        for r in regressions:
+            print(f"✗ {r['case']}: {r['metric']} {r['baseline']:.1f} -> {r['current']:.1f} us "
+                  f"(+{r['change']:.0%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"✓ No {args.metric} regressions beyond {args.threshold:.0%}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """
 Mock Data Generator for GuardQuote ML Engine
 Generates realistic training data for the 3NF database schema.
+Needs the mock-data extra: pip install -e ".[mock-data]"
 """
 import random
 from datetime import datetime, timedelta
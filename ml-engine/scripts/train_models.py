@@ -2,88 +2,133 @@
 """
 ML Model Training Pipeline for GuardQuote
 Trains price prediction and risk assessment models.
+
+Usage:
+    python scripts/train_models.py                       # PostgreSQL (DB_* env vars)
+    python scripts/train_models.py --source data/processed/training_data_2026.csv
+    python scripts/train_models.py --source history.parquet --chunksize 250000
+    python scripts/train_models.py --incremental          # only rows since the last run
+    python scripts/train_models.py --no-feature-cache     # always re-preprocess
 """
+import argparse
+import inspect
 import os
 import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import NamedTuple
+
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.base import clone
+from sklearn.model_selection import KFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, RandomForestClassifier
 from sklearn.linear_model import Ridge, LogisticRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score, accuracy_score, classification_report
-import mysql.connector
 
-# Configuration
-DB_CONFIG = {
-    "host": "localhost",
-    "user": "root",
-    "database": "guardquote",
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.data.feature_cache import (  # noqa: E402
+    CachedFeatures, FeatureCache, cache_key, frame_digest, source_digest,
+)
+from src.data import sources  # noqa: E402
+from src.data.sources import (  # noqa: E402
+    DEFAULT_CHUNKSIZE, high_water_mark, load_training_frame, normalize_chunk, open_source,
+)
+from src.models.feature_encoder import DEFAULT_LABELS, DEFAULT_ZIP_REGION  # noqa: E402
+from src.models.location_index import get_location_index  # noqa: E402
 
 MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "models", "trained")
+FEATURE_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "cache", "features")
+
 
+def load_training_data(source="postgres", chunksize=DEFAULT_CHUNKSIZE, table="ml_training_data",
+                       since=None):
+    """Load ML training data chunk by chunk into compact dtypes.
 
-def load_training_data():
-    """Load ML training data from database."""
-    print("Loading training data from MySQL...")
-
-    conn = mysql.connector.connect(**DB_CONFIG)
-
-    query = """
-    SELECT
-        event_type_code,
-        zip_code,
-        state,
-        risk_zone,
-        num_guards,
-        hours_per_guard,
-        total_guard_hours,
-        crowd_size,
-        day_of_week,
-        hour_of_day,
-        month,
-        is_weekend,
-        is_night_shift,
-        is_armed,
-        has_vehicle,
-        final_price,
-        risk_score,
-        was_accepted
-    FROM ml_training_data
+    ``since`` (a high-water mark saved with earlier models) limits it to newer rows.
     """
+    source = open_source(source, chunksize, table, since)
+    print(f"Loading training data from {source}" + (f" after {since}..." if since else "..."))
 
-    df = pd.read_sql(query, conn)
-    conn.close()
+    df = load_training_frame(source)
 
-    print(f"  Loaded {len(df)} records")
+    print(f"  Loaded {len(df)} records ({df.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
     return df
 
 
-def preprocess_features(df):
-    """Preprocess features for model training."""
-    print("Preprocessing features...")
+def _fill_missing(column, value):
+    if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+        column = column.cat.add_categories([value])
+    return column.fillna(value)
+
 
-    # Create a copy
-    data = df.copy()
+def _label_encode(column, encoder=None):
+    """Label-encode ``column``; categoricals encode categories, not rows.
 
-    # Encode categorical variables
-    event_encoder = LabelEncoder()
-    state_encoder = LabelEncoder()
-    risk_zone_encoder = LabelEncoder()
+    A fitted ``encoder`` is reused as is, and raises ValueError on labels it
+    has not seen.
+    """
+    if encoder is None:
+        encoder = LabelEncoder()
+        encode = encoder.fit_transform
+    else:
+        encode = encoder.transform
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.cat.remove_unused_categories()
+        codes = column.cat.codes.to_numpy()
+        # Code -1 (missing) would silently index the last category
+        if (codes == -1).any():
+            raise ValueError(f"{column.name} has missing values; fill them before encoding")
+        labels = encode(column.cat.categories).astype(np.int16)
+        return encoder, labels[codes]
+    return encoder, encode(column)
+
+
+def _zip_region(column):
+    """First three ZIP digits; missing ZIPs get DEFAULT_ZIP_REGION, as in serving."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        regions = column.cat.categories.str[:3].astype(np.int16).to_numpy()
+        codes = column.cat.codes.to_numpy()
+        return np.where(codes == -1, np.int16(DEFAULT_ZIP_REGION), regions[codes])
+    return column.str[:3].astype(float).fillna(DEFAULT_ZIP_REGION).astype(int)
+
+
+def preprocess_features(df, encoders=None):
+    """Preprocess features for model training.
+
+    Encoded columns are added to ``df`` in place rather than to a copy, so
+    the full training history is held once. ``encoders`` from earlier models
+    are reused instead of fit (for incremental training).
+    """
+    print("Preprocessing features...")
 
-    data['event_type_encoded'] = event_encoder.fit_transform(data['event_type_code'])
-    data['state_encoded'] = state_encoder.fit_transform(data['state'])
-    data['risk_zone_encoded'] = risk_zone_encoder.fit_transform(data['risk_zone'].fillna('medium'))
+    data = df
+    encoders = encoders or {}
+
+    # Encode categorical variables; missing labels get serving's defaults
+    event_encoder, data['event_type_encoded'] = _label_encode(
+        _fill_missing(data['event_type_code'], DEFAULT_LABELS['event_type']),
+        encoders.get('event_type')
+    )
+    state_encoder, data['state_encoded'] = _label_encode(
+        _fill_missing(data['state'], DEFAULT_LABELS['state']), encoders.get('state')
+    )
+    risk_zone_encoder, data['risk_zone_encoded'] = _label_encode(
+        _fill_missing(data['risk_zone'], DEFAULT_LABELS['risk_zone']), encoders.get('risk_zone')
+    )
 
     # Extract zip region (first 3 digits)
-    data['zip_region'] = data['zip_code'].str[:3].astype(int)
+    data['zip_region'] = _zip_region(data['zip_code'])
 
-    # Convert booleans to int
+    # Convert non-bool flags (0/1 or Decimal from the database) to int
     bool_cols = ['is_weekend', 'is_night_shift', 'is_armed', 'has_vehicle', 'was_accepted']
     for col in bool_cols:
-        data[col] = data[col].astype(int)
+        if data[col].dtype != bool:
+            data[col] = data[col].astype(np.int8)
 
     # Feature columns for price prediction
     price_features = [
@@ -113,45 +158,223 @@ def preprocess_features(df):
     return data, price_features, risk_features, encoders
 
 
-def train_price_model(data, features):
-    """Train the price prediction model."""
-    print("\n" + "="*50)
-    print("Training Price Prediction Model")
-    print("="*50)
+def feature_definitions():
+    """Code, tables and location data that turn rows into features.
+
+    Editing any of them, or the location seed data behind the ZIPs filled
+    in for sources without them, changes cache keys.
+    """
+    code = "".join(inspect.getsource(function) for function in (
+        normalize_chunk, sources._parse_bools, sources.representative_zips, sources.concat_chunks,
+        _fill_missing, _label_encode, _zip_region, preprocess_features,
+    ))
+    tables = repr((sources.COLUMN_ALIASES, sources.BOOL_VALUES, DEFAULT_LABELS, DEFAULT_ZIP_REGION))
+    return f"{code}{tables}\nlocations:{get_location_index().digest()}"
 
-    X = data[features]
-    y = data['final_price']
 
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+def load_features(source="postgres", chunksize=DEFAULT_CHUNKSIZE, table="ml_training_data",
+                  cache_dir=FEATURE_CACHE_DIR):
+    """Preprocessed features of ``source``, from the feature cache when it has them.
+
+    File sources are keyed by a hash of their bytes and skip loading on a
+    hit; PostgreSQL rows are hashed once read. ``cache_dir=None`` disables
+    the cache.
+    """
+    cache = FeatureCache(cache_dir) if cache_dir else None
+    digest = source_digest(open_source(source, chunksize, table)) if cache else None
+    if digest is not None:
+        cached = _load_cached(cache, cache_key(digest, feature_definitions()))
+        if cached is not None:
+            return cached
+
+    df = load_training_data(source, chunksize, table)
+    mark = high_water_mark(df)
+    if cache and digest is None:
+        digest = frame_digest(df)
+        cached = _load_cached(cache, cache_key(digest, feature_definitions()))
+        if cached is not None:
+            return cached
+
+    data, price_features, risk_features, encoders = preprocess_features(df)
+    features = {'price': price_features, 'risk': risk_features,
+                'accept': risk_features + ['final_price']}
+    if cache:
+        key = cache_key(digest, feature_definitions())
+        cache.save(key, data, features, encoders, mark)
+        print(f"  ✓ Cached features as {key[:12]}")
+    return CachedFeatures(data, features, {}, encoders, mark)
+
+
+def _load_cached(cache, key):
+    cached = cache.load(key)
+    if cached is not None:
+        print(f"  ✓ Features from cache {key[:12]} ({len(cached.data)} rows, preprocessing skipped)")
+    return cached
+
+
+PRICE_CV_FOLDS = 5
+
+# Price candidates fit on standardized features; the rest fit on raw features
+SCALED_PRICE_MODELS = {'Ridge Regression'}
+
+RISK_LEVELS = ['low', 'medium', 'high', 'critical']
+
+# Explored by --search-budget; the hard-coded settings are always trial 0
+SEARCH_SPACES = {
+    ('price', 'Random Forest'): {
+        'n_estimators': [50, 100, 200, 300],
+        'max_depth': [8, 12, 15, 20],
+        'min_samples_leaf': [1, 2, 5],
+    },
+    ('price', 'Gradient Boosting'): {
+        'n_estimators': [50, 100, 200, 300],
+        'max_depth': [3, 4, 5, 6],
+        'learning_rate': [0.05, 0.1, 0.2],
+    },
+    ('risk', 'Random Forest'): {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [6, 8, 10, 14],
+        'min_samples_leaf': [1, 2, 5],
+    },
+}
 
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
 
-    # Train multiple models and compare
+def price_candidates(params=None):
+    """Candidate price models. n_jobs=1: the core budget is spent across fits."""
+    params = params or {}
     models = {
-        'Random Forest': RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42, n_jobs=-1),
+        'Random Forest': RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42, n_jobs=1),
         'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=42),
         'Ridge Regression': Ridge(alpha=1.0),
     }
+    for name, model in models.items():
+        model.set_params(**params.get(('price', name), {}))
+    return models
+
+
+def risk_classifier(params=None):
+    model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=1)
+    return model.set_params(**(params or {}).get(('risk', 'Random Forest'), {}))
+
+
+class FitTask(NamedTuple):
+    key: tuple  # (stage, model name, price CV fold (0 = holdout) or None)
+    estimator: object
+    features: list
+    target: str
+    train: np.ndarray
+    test: np.ndarray
+    scale: bool = False
+
+
+class FitResult(NamedTuple):
+    key: tuple
+    estimator: object
+    scaler: object
+    test: np.ndarray
+    y_pred: np.ndarray
+    seconds: float
+
+
+_worker_data = None
+
+
+def _init_worker(data):
+    """Hold the training frame once per process; tasks carry only row indices."""
+    global _worker_data
+    _worker_data = data
+
+
+def _run_fit(task):
+    start = time.perf_counter()
+    X_train = _worker_data[task.features].iloc[task.train]
+    X_test = _worker_data[task.features].iloc[task.test]
+    y_train = _worker_data[task.target].iloc[task.train]
+    if y_train.dtype == bool:
+        y_train = y_train.astype(int)
+
+    scaler = None
+    if task.scale:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+
+    task.estimator.fit(X_train, y_train)
+    y_pred = task.estimator.predict(X_test)
+    return FitResult(task.key, task.estimator, scaler, task.test, y_pred,
+                     time.perf_counter() - start)
+
+
+def run_fits(data, tasks, jobs=1):
+    """Run every fit in ``tasks`` on up to ``jobs`` processes; results by task key."""
+    jobs = max(1, min(jobs, len(tasks)))
+    print(f"\nRunning {len(tasks)} fits on {jobs} process(es)...")
+    start = time.perf_counter()
+
+    if jobs == 1:
+        _init_worker(data)
+        results = [_run_fit(task) for task in tasks]
+    else:
+        columns = sorted({name for task in tasks for name in task.features + [task.target]})
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(data[columns],)
+        ) as pool:
+            results = list(pool.map(_run_fit, tasks))
+
+    busy = sum(result.seconds for result in results)
+    elapsed = time.perf_counter() - start
+    print(f"  {busy:.1f}s of fitting in {elapsed:.1f}s wall time")
+    return {result.key: result for result in results}
+
+
+def _cv_folds(data):
+    """Shuffled (train, test) row indices of the PRICE_CV_FOLDS price CV folds."""
+    return list(KFold(PRICE_CV_FOLDS, shuffle=True, random_state=42).split(np.arange(len(data))))
+
+
+def _holdout_split(data):
+    """The 80/20 train/test split: CV fold 0, so that fold's fit is the holdout fit."""
+    return _cv_folds(data)[0]
+
+
+def price_tasks(data, features, params=None):
+    """CV fold fits per tree candidate; Ridge gets fold 0 (the holdout) only.
+
+    Fold 0 trains on the holdout training rows, so its estimator doubles as
+    the candidate's holdout model instead of being refit.
+    """
+    folds = _cv_folds(data)
+    tasks = []
+    for name, model in price_candidates(params).items():
+        scale = name in SCALED_PRICE_MODELS
+        for fold, (train, test) in enumerate(folds[:1] if scale else folds):
+            tasks.append(FitTask(('price', name, fold), clone(model), features, 'final_price',
+                                 train, test, scale))
+    return tasks
+
+
+def select_price_model(data, features, results):
+    """Report each candidate from its fold fits; keep the best holdout (fold 0) fit."""
+    print("\n" + "="*50)
+    print("Training Price Prediction Model")
+    print("="*50)
+
+    y = data['final_price'].to_numpy()
 
     best_model = None
     best_score = -float('inf')
     best_name = None
+    scaler = None
 
-    for name, model in models.items():
+    for name in price_candidates():
         print(f"\nTraining {name}...")
-
-        if name == 'Ridge Regression':
-            model.fit(X_train_scaled, y_train)
-            y_pred = model.predict(X_test_scaled)
-        else:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
+        folds = sorted((result for key, result in results.items() if key[:2] == ('price', name)),
+                       key=lambda result: result.key[2])
+        holdout = folds[0]
+        y_test = y[holdout.test]
+        y_pred = holdout.y_pred
+        if holdout.scaler is not None:
+            scaler = holdout.scaler
 
         # Calculate metrics
         mae = mean_absolute_error(y_test, y_pred)
@@ -162,18 +385,21 @@ def train_price_model(data, features):
         print(f"  RMSE: ${rmse:.2f}")
         print(f"  R² Score: {r2:.4f}")
 
-        # Cross-validation
-        if name != 'Ridge Regression':
-            cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='r2')
+        # Cross-validation, scored from the fold fits' own predictions
+        if len(folds) > 1:
+            cv_scores = np.array([r2_score(y[fold.test], fold.y_pred) for fold in folds])
             print(f"  CV R² Score: {cv_scores.mean():.4f} (+/- {cv_scores.std()*2:.4f})")
 
         if r2 > best_score:
             best_score = r2
-            best_model = model
+            best_model = holdout.estimator
             best_name = name
 
     print(f"\n✓ Best Model: {best_name} (R² = {best_score:.4f})")
 
+    if scaler is None:
+        scaler = StandardScaler().fit(data[features].iloc[_holdout_split(data)[0]])
+
     # Feature importance for tree-based models
     if hasattr(best_model, 'feature_importances_'):
         print("\nTop Feature Importances:")
@@ -188,50 +414,45 @@ def train_price_model(data, features):
     return best_model, scaler, best_name
 
 
-def train_risk_model(data, features):
-    """Train the risk classification model."""
-    print("\n" + "="*50)
-    print("Training Risk Assessment Model")
-    print("="*50)
+def train_price_model(data, features, jobs=1):
+    """Train the price prediction model."""
+    return select_price_model(data, features, run_fits(data, price_tasks(data, features), jobs))
 
-    X = data[features]
 
-    # Convert risk_score to risk levels for classification
-    def risk_to_level(score):
-        if score < 0.25:
-            return 0  # low
-        elif score < 0.5:
-            return 1  # medium
-        elif score < 0.75:
-            return 2  # high
-        return 3  # critical
+def add_risk_levels(data):
+    # Convert risk_score to risk levels (low/medium/high/critical) for classification
+    data['risk_level'] = np.digitize(data['risk_score'], [0.25, 0.5, 0.75]).astype(np.int8)
 
-    y = data['risk_score'].apply(risk_to_level)
 
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+def risk_tasks(data, features, params=None):
+    add_risk_levels(data)
+    train, test = _holdout_split(data)
+    return [FitTask(('risk', 'Random Forest', None), risk_classifier(params), features,
+                    'risk_level', train, test)]
 
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
 
-    # Train classifier
+def select_risk_model(data, features, results):
+    """Report the risk classifier fit."""
+    print("\n" + "="*50)
+    print("Training Risk Assessment Model")
+    print("="*50)
+
     print("\nTraining Random Forest Classifier...")
-    model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
-    model.fit(X_train, y_train)
+    fit = results[('risk', 'Random Forest', None)]
+    model = fit.estimator
+    y_test = data['risk_level'].to_numpy()[fit.test]
+    y_pred = fit.y_pred
 
-    y_pred = model.predict(X_test)
+    # Scale features
+    scaler = StandardScaler().fit(data[features].iloc[_holdout_split(data)[0]])
 
     # Metrics
     accuracy = accuracy_score(y_test, y_pred)
     print(f"\n  Accuracy: {accuracy:.4f}")
 
     print("\n  Classification Report:")
-    risk_labels = ['low', 'medium', 'high', 'critical']
-    report = classification_report(y_test, y_pred, target_names=risk_labels)
+    report = classification_report(y_test, y_pred, labels=range(len(RISK_LEVELS)),
+                                   target_names=RISK_LEVELS, zero_division=0)
     for line in report.split('\n'):
         print(f"    {line}")
 
@@ -248,43 +469,232 @@ def train_risk_model(data, features):
     return model, scaler
 
 
-def train_acceptance_model(data, features):
-    """Train model to predict quote acceptance."""
+def train_risk_model(data, features, jobs=1):
+    """Train the risk classification model."""
+    return select_risk_model(data, features, run_fits(data, risk_tasks(data, features), jobs))
+
+
+def acceptance_tasks(data, features):
+    # Add price as a feature for acceptance prediction
+    accept_features = features + ['final_price']
+    train, test = _holdout_split(data)
+    model = LogisticRegression(random_state=42, max_iter=1000)
+    return [FitTask(('accept', 'Logistic Regression', None), model, accept_features,
+                    'was_accepted', train, test, scale=True)]
+
+
+def select_acceptance_model(data, features, results):
+    """Report the acceptance model fit."""
     print("\n" + "="*50)
     print("Training Acceptance Prediction Model")
     print("="*50)
 
-    # Add price as a feature for acceptance prediction
-    accept_features = features + ['final_price']
+    print("\nTraining Logistic Regression...")
+    fit = results[('accept', 'Logistic Regression', None)]
+    y_test = data['was_accepted'].to_numpy().astype(int)[fit.test]
+    accuracy = accuracy_score(y_test, fit.y_pred)
+
+    print(f"  Accuracy: {accuracy:.4f}")
+
+    return fit.estimator, fit.scaler, features + ['final_price']
+
+
+def train_acceptance_model(data, features, jobs=1):
+    """Train model to predict quote acceptance."""
+    tasks = acceptance_tasks(data, features)
+    return select_acceptance_model(data, features, run_fits(data, tasks, jobs))
+
+
+def search_hyperparameters(data, price_features, risk_features, seconds, clock="wall", jobs=1,
+                           latency_weight=None, matrices=None):
+    """Successive-halving search of SEARCH_SPACES on the holdout training rows.
+
+    ``matrices`` (CachedFeatures.matrices) are searched as is instead of
+    being rebuilt from ``data``.
+    """
+    from src.models.hyperparameter_search import (
+        DEFAULT_LATENCY_WEIGHT, Budget, SearchFamily, successive_halving,
+    )
 
-    X = data[accept_features]
-    y = data['was_accepted'].astype(int)
+    print("\n" + "="*50)
+    print(f"Hyperparameter Search ({seconds:.0f}s {clock} budget)")
+    print("="*50)
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+    add_risk_levels(data)
+    families = [
+        SearchFamily(key, price_candidates()[key[1]], SEARCH_SPACES[key], price_features,
+                     'final_price')
+        for key in SEARCH_SPACES if key[0] == 'price'
+    ] + [
+        SearchFamily(('risk', 'Random Forest'), risk_classifier(),
+                     SEARCH_SPACES[('risk', 'Random Forest')], risk_features, 'risk_level'),
+    ]
+    searched = {'price': price_features, 'risk': risk_features}
+    prebuilt = {tuple(searched[name]): matrix
+                for name, matrix in (matrices or {}).items() if name in searched}
+    train, _ = _holdout_split(data)
+    return successive_halving(
+        families, data, train, Budget(seconds, clock), jobs=jobs,
+        latency_weight=DEFAULT_LATENCY_WEIGHT if latency_weight is None else latency_weight,
+        matrices=prebuilt,
     )
 
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
 
-    print("\nTraining Logistic Regression...")
-    model = LogisticRegression(random_state=42, max_iter=1000)
-    model.fit(X_train_scaled, y_train)
+def train_all(data, price_features, risk_features, jobs=1, params=None):
+    """Train the price, risk and acceptance stages together on one process pool.
 
-    y_pred = model.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
+    The stages are independent, so every fit (candidates, CV folds, risk and
+    acceptance) is queued at once and reports are printed in stage order.
+    ``params`` overrides hyperparameters per (stage, model name).
+    """
+    tasks = (
+        price_tasks(data, price_features, params)
+        + risk_tasks(data, risk_features, params)
+        + acceptance_tasks(data, risk_features)
+    )
+    results = run_fits(data, tasks, jobs)
+    return (
+        select_price_model(data, price_features, results),
+        select_risk_model(data, risk_features, results),
+        select_acceptance_model(data, risk_features, results),
+    )
 
-    print(f"  Accuracy: {accuracy:.4f}")
 
-    return model, scaler, accept_features
+def holdout_metrics(data, price_model, price_scaler, price_name, price_features,
+                    risk_model, risk_features, rows=None):
+    """Price MAE and risk accuracy on ``rows`` (default: the holdout split)."""
+    if rows is None:
+        rows = _holdout_split(data)[1]
+    X_price = data[price_features].iloc[rows]
+    if price_name in SCALED_PRICE_MODELS:
+        X_price = price_scaler.transform(X_price)
+    add_risk_levels(data)
+    return {
+        'price_mae': float(mean_absolute_error(
+            data['final_price'].to_numpy()[rows], price_model.predict(X_price))),
+        'risk_accuracy': float(accuracy_score(
+            data['risk_level'].to_numpy()[rows],
+            risk_model.predict(data[risk_features].iloc[rows]))),
+        'rows': int(len(rows)),
+    }
+
+
+# Incremental (warm-start) training
+DRIFT_THRESHOLD = 0.25
+MIN_INCREMENTAL_ROWS = 50
+
+# Saved with the models so the next incremental run knows where to resume
+TRACKING_KEYS = ('high_water_mark', 'training_rows', 'holdout_metrics',
+                 'incremental_updates', 'last_drift')
+
+
+class FullRetrainRequired(Exception):
+    """The saved models cannot be extended; train from the full history instead."""
+
+
+def load_previous_models(path=None):
+    path = path or os.path.join(MODEL_DIR, 'guardquote_models.pkl')
+    if not os.path.exists(path):
+        raise FullRetrainRequired(f"no saved models at {path}")
+    with open(path, 'rb') as f:
+        artifacts = pickle.load(f)
+    for key in ('high_water_mark', 'holdout_metrics'):
+        if key not in artifacts:
+            raise FullRetrainRequired(f"saved models have no {key}")
+    return artifacts
+
+
+def measure_drift(artifacts, data):
+    """Relative degradation of the saved models on rows they have never seen.
+
+    Price drift is the rise in MAE, risk drift the fall in accuracy, both as
+    a fraction of the holdout metrics recorded when the models were trained.
+    A zero or missing baseline cannot be compared against, so it forces a
+    full retrain.
+    """
+    baseline = artifacts.get('holdout_metrics') or {}
+    for metric in ('price_mae', 'risk_accuracy'):
+        if not baseline.get(metric, 0) > 0:
+            raise FullRetrainRequired(f"saved models have no usable {metric} baseline")
+    current = holdout_metrics(
+        data, artifacts['price_model'], artifacts['price_scaler'],
+        artifacts['price_model_name'], artifacts['price_features'],
+        artifacts['risk_model'], artifacts['risk_features'], rows=np.arange(len(data)),
+    )
+    return {
+        'price': current['price_mae'] / baseline['price_mae'] - 1,
+        'risk': 1 - current['risk_accuracy'] / baseline['risk_accuracy'],
+    }
+
+
+def extend_ensemble(model, X, y, seen_rows):
+    """Add trees (forests) or boosting stages fit on ``X``, in proportion to its share of rows."""
+    if not isinstance(model, (RandomForestRegressor, RandomForestClassifier,
+                              GradientBoostingRegressor)):
+        raise FullRetrainRequired(f"{type(model).__name__} cannot be warm-started")
+    added = max(1, round(model.n_estimators * len(X) / seen_rows))
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + added)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return added
+
+
+def train_incremental(df, artifacts, drift_threshold=DRIFT_THRESHOLD):
+    """Extend the saved ensembles with rows added since their high-water mark.
+
+    Raises FullRetrainRequired when the new rows carry unseen categories, the
+    saved models drifted beyond ``drift_threshold`` on them, or the price
+    model is not an ensemble. Returns the updated artifacts.
+    """
+    print("\n" + "="*50)
+    print("Incremental Training")
+    print("="*50)
+
+    try:
+        # The saved encoders raise on labels they were not fit on
+        data, _, _, _ = preprocess_features(df, artifacts['encoders'])
+    except ValueError as e:
+        raise FullRetrainRequired(f"new rows do not fit the saved encoders ({e})")
+
+    # Every new row is unseen by the saved models, so all of them are holdout
+    drift = measure_drift(artifacts, data)
+    print(f"  Drift on {len(data)} new rows: price MAE {drift['price']:+.1%}, "
+          f"risk accuracy {-drift['risk']:+.1%}")
+    if max(drift.values()) > drift_threshold:
+        raise FullRetrainRequired(f"drift exceeds {drift_threshold:.0%}")
+
+    seen_rows = artifacts.get('training_rows') or artifacts['high_water_mark']['rows']
+    X_price = data[artifacts['price_features']]
+    added = extend_ensemble(artifacts['price_model'], X_price, data['final_price'], seen_rows)
+    print(f"  ✓ {artifacts['price_model_name']}: +{added} estimators "
+          f"({artifacts['price_model'].n_estimators} total)")
+
+    risk_model = artifacts['risk_model']
+    if set(np.unique(data['risk_level'])) == set(risk_model.classes_):
+        added = extend_ensemble(risk_model, data[artifacts['risk_features']],
+                                data['risk_level'], seen_rows)
+        print(f"  ✓ Risk Random Forest: +{added} trees ({risk_model.n_estimators} total)")
+    else:
+        # New trees must see every risk level, or their votes will not line up
+        print("  Risk model unchanged: new rows do not cover every risk level")
+
+    return dict(
+        artifacts,
+        training_rows=seen_rows + len(data),
+        incremental_updates=artifacts.get('incremental_updates', 0) + 1,
+        last_drift=drift,
+    )
 
 
 def save_models(price_model, price_scaler, price_name,
                 risk_model, risk_scaler,
                 accept_model, accept_scaler, accept_features,
-                encoders, price_features, risk_features):
-    """Save trained models to disk."""
+                encoders, price_features, risk_features, **tracking):
+    """Save trained models to disk.
+
+    ``tracking`` (high_water_mark, training_rows, holdout_metrics, ...) is
+    stored alongside for later incremental runs.
+    """
     print("\n" + "="*50)
     print("Saving Models")
     print("="*50)
@@ -305,6 +715,7 @@ def save_models(price_model, price_scaler, price_name,
         'accept_features': accept_features,
         'encoders': encoders,
         'trained_at': datetime.now().isoformat(),
+        **tracking,
     }
 
     model_path = os.path.join(MODEL_DIR, 'guardquote_models.pkl')
@@ -330,32 +741,108 @@ def save_models(price_model, price_scaler, price_name,
     print(f"  ✓ Metadata saved to: {meta_path}")
 
 
-def main():
-    """Run the training pipeline."""
-    print("="*50)
-    print("GuardQuote ML Training Pipeline")
-    print("="*50)
-    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+def _save_artifacts(artifacts):
+    """save_models() for an artifacts dict, as loaded or as updated incrementally."""
+    save_models(
+        artifacts['price_model'], artifacts['price_scaler'], artifacts['price_model_name'],
+        artifacts['risk_model'], artifacts['risk_scaler'],
+        artifacts['accept_model'], artifacts['accept_scaler'], artifacts['accept_features'],
+        artifacts['encoders'], artifacts['price_features'], artifacts['risk_features'],
+        **{key: artifacts[key] for key in TRACKING_KEYS if key in artifacts},
+    )
 
-    # Load data
-    df = load_training_data()
 
-    # Preprocess
-    data, price_features, risk_features, encoders = preprocess_features(df)
+def run_incremental(args):
+    """Warm-start the saved models from new rows; False when a full retrain is needed."""
+    try:
+        artifacts = load_previous_models()
+        mark = artifacts['high_water_mark']
+        df = load_training_data(args.source, args.chunksize, args.table, since=mark)
+        if len(df) < args.min_new_rows:
+            print(f"\n✓ Only {len(df)} new rows (minimum {args.min_new_rows}); models are current")
+            return True
+        artifacts = train_incremental(df, artifacts, args.drift_threshold)
+    except FullRetrainRequired as e:
+        print(f"\n✗ Incremental update not possible: {e}; retraining on the full history")
+        return False
+
+    artifacts['high_water_mark'] = high_water_mark(df, mark)
+    _save_artifacts(artifacts)
+    return True
+
+
+def run_full_training(args):
+    # Load and preprocess data, or reuse features cached for the same data
+    cached = load_features(args.source, args.chunksize, args.table,
+                           None if args.no_feature_cache else args.feature_cache)
+    data, encoders = cached.data, cached.encoders
+    price_features, risk_features = cached.features['price'], cached.features['risk']
 
     # Train models
-    price_model, price_scaler, price_name = train_price_model(data, price_features)
-    risk_model, risk_scaler = train_risk_model(data, risk_features)
-    accept_model, accept_scaler, accept_features = train_acceptance_model(data, risk_features)
-
-    # Save models
+    params = None
+    if args.search_budget > 0:
+        params = search_hyperparameters(data, price_features, risk_features, args.search_budget,
+                                        args.search_clock, args.jobs, args.latency_weight,
+                                        cached.matrices)
+    (
+        (price_model, price_scaler, price_name),
+        (risk_model, risk_scaler),
+        (accept_model, accept_scaler, accept_features),
+    ) = train_all(data, price_features, risk_features, args.jobs, params)
+
+    # Save models, with what later incremental runs need
     save_models(
         price_model, price_scaler, price_name,
         risk_model, risk_scaler,
         accept_model, accept_scaler, accept_features,
-        encoders, price_features, risk_features
+        encoders, price_features, risk_features,
+        high_water_mark=cached.high_water_mark,
+        training_rows=len(data),
+        holdout_metrics=holdout_metrics(data, price_model, price_scaler, price_name,
+                                        price_features, risk_model, risk_features),
     )
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Train GuardQuote pricing, risk and acceptance models")
+    parser.add_argument("--source", default="postgres",
+                        help='"postgres", a postgresql:// URL, or a .csv/.parquet file')
+    parser.add_argument("--table", default="ml_training_data", help="Table for PostgreSQL sources")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                        help="Rows read per chunk")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Core budget: processes fitting models concurrently")
+    parser.add_argument("--search-budget", type=float, default=0,
+                        help="Seconds for a hyperparameter search before training (0: off)")
+    parser.add_argument("--search-clock", choices=("wall", "cpu"), default="wall",
+                        help="Count the search budget in wall-clock or CPU seconds")
+    parser.add_argument("--latency-weight", type=float,
+                        help="Score given up per doubling of serving latency")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Extend the saved models with rows added since they were trained")
+    parser.add_argument("--drift-threshold", type=float, default=DRIFT_THRESHOLD,
+                        help="Relative holdout degradation that forces a full retrain")
+    parser.add_argument("--min-new-rows", type=int, default=MIN_INCREMENTAL_ROWS,
+                        help="New rows needed before an incremental update runs")
+    parser.add_argument("--feature-cache", default=FEATURE_CACHE_DIR,
+                        help="Directory of cached preprocessed features")
+    parser.add_argument("--no-feature-cache", action="store_true",
+                        help="Preprocess from scratch without reading or writing the cache")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the training pipeline."""
+    args = parse_args(argv)
+
+    print("="*50)
+    print("GuardQuote ML Training Pipeline")
+    print("="*50)
+    print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    if not (args.incremental and run_incremental(args)):
+        run_full_training(args)
+
     print("\n" + "="*50)
     print("Training Complete!")
     print("="*50)
@@ -1,2 +1,7 @@
 """GuardQuote ML Engine - Security Guard Pricing and Risk Assessment"""
+import time
+
 __version__ = "0.1.0"
+
+# When the package started importing; the startup log reports time since then
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,119 @@
+"""
+Dynamic micro-batching for single-quote requests.
+Concurrent /quote calls are collected for a short window and scored together.
+"""
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+
+from ..config import get_settings
+from ..metrics import add_stages, collect_stages
+from .executor import get_inference_executor
+
+BatchRunner = Callable[[list[dict]], Awaitable[list[dict]]]
+
+
+class MicroBatcher:
+    """Collects concurrent predictions into one vectorized batch call.
+
+    The first request of a batch starts a ``window_ms`` timer. The batch is
+    flushed when the timer fires or ``max_size`` requests are waiting,
+    whichever comes first. Results are fanned back out to each caller, and
+    the batch's stage timings are added to every caller's spans.
+    """
+
+    def __init__(self, run_batch: BatchRunner, window_ms: float, max_size: int):
+        self._run_batch = run_batch
+        self.window_ms = window_ms
+        self.max_size = max_size
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batch_sizes: Counter = Counter()
+
+    async def submit(self, item: dict) -> dict:
+        """Queue one predict_batch item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+
+        result, stages = await future
+        add_stages(stages)
+        return result
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batch_sizes[len(batch)] += 1
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[dict, asyncio.Future]]):
+        try:
+            # The flush runs in whichever caller's context started it; collect
+            # the batch's stages separately so all callers report them
+            with collect_stages() as stages:
+                results = await self._run_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue  # caller went away
+            if 'error' in result:
+                future.set_exception(ValueError(result['error']))
+            else:
+                future.set_result((result, stages))
+
+    def stats(self) -> dict:
+        """Achieved batch-size distribution since startup."""
+        batches = sum(self.batch_sizes.values())
+        requests = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "window_ms": self.window_ms,
+            "max_size": self.max_size,
+            "batches": batches,
+            "requests": requests,
+            "mean_batch_size": round(requests / batches, 2) if batches else 0.0,
+            "batch_sizes": {
+                str(size): count for size, count in sorted(self.batch_sizes.items())
+            },
+        }
+
+
+async def _predict_on_executor(items: list[dict]) -> list[dict]:
+    return await get_inference_executor().predict('predict_batch', items)
+
+
+# Singleton instance
+_batcher: Optional[MicroBatcher] = None
+
+
+def get_micro_batcher() -> Optional[MicroBatcher]:
+    """Get the singleton micro-batcher, or None when batching is disabled."""
+    global _batcher
+    settings = get_settings()
+    if not settings.microbatch_enabled:
+        return None
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            _predict_on_executor,
+            window_ms=settings.microbatch_window_ms,
+            max_size=settings.microbatch_max_size,
+        )
+    return _batcher
@@ -0,0 +1,160 @@
+"""
+Bounded inference executor.
+Runs CPU-bound model calls off the asyncio event loop and sheds load when full.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from fastapi import HTTPException
+
+from ..config import get_settings
+from ..metrics import collect_stages, record_stages
+from ..models.trained_predictor import get_predictor
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+def run_predictor(method: str, *args, **kwargs):
+    """Call a TrainedPredictor method in the current worker (thread or process).
+
+    Returns ``(result, stages)``; stage timings travel back with the result
+    so they can be recorded in the serving process.
+    """
+    with collect_stages() as stages:
+        result = getattr(get_predictor(), method)(*args, **kwargs)
+    return result, stages
+
+
+class InferenceExecutor:
+    """Thread or process pool with a bounded number of pending jobs.
+
+    ``queue_size`` caps running plus queued jobs for this event loop. Once it
+    is reached, new jobs fail fast with a 503 and ``Retry-After`` instead of
+    queueing behind the backlog.
+    """
+
+    def __init__(self, kind: str, workers: int, queue_size: int, retry_after: int):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"inference_executor must be one of {EXECUTOR_KINDS}, got {kind!r}")
+
+        self.kind = kind
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+        self._pool: Executor = self._create_pool()
+
+    def _create_pool(self) -> Executor:
+        if self.kind == "process":
+            # Spawned workers import the app and load their own predictor up front
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=get_predictor,
+            )
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+
+    async def run(self, fn, *args, **kwargs):
+        """Run ``fn`` on the pool, or raise a 503 if the queue is saturated."""
+        if self.pending >= self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Inference queue is full, retry shortly",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self._pool.submit(fn, *args, **kwargs)
+        self.pending += 1
+        # The slot is freed when the worker finishes, not when the caller
+        # stops waiting: a cancelled request's job may still be running
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def _release(self):
+        self.pending -= 1
+
+    async def predict(self, method: str, *args, **kwargs):
+        """Run a TrainedPredictor method on the pool, recording its stage timings."""
+        result, stages = await self.run(run_predictor, method, *args, **kwargs)
+        record_stages(stages)
+        return result
+
+    async def warm(self, count: int):
+        """Load and warm the model in every process worker before traffic arrives.
+
+        Thread workers share the predictor already warmed in this process.
+        """
+        if self.kind != "process":
+            return
+        await self._warm_pool(self._pool, count)
+
+    async def _warm_pool(self, pool: Executor, count: int):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, partial(run_predictor, 'warmup', count))
+            for _ in range(self.workers)
+        ))
+
+    async def reload_workers(self, warmup_count: int = 0):
+        """Point future jobs at workers holding the current model.
+
+        Thread workers share the process-wide predictor, so there is nothing
+        to do. Process workers each hold their own copy, so a fresh pool is
+        started and warmed while the old one keeps serving; only then is it
+        swapped in, and jobs already on the old pool finish there before it
+        exits. If the new pool fails to warm, the old one stays in place.
+        """
+        if self.kind != "process":
+            return
+        pool = self._create_pool()
+        try:
+            await self._warm_pool(pool, warmup_count)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        old, self._pool = self._pool, pool
+        old.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get singleton inference executor configured from settings."""
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = InferenceExecutor(
+            kind=settings.inference_executor,
+            workers=settings.inference_workers,
+            queue_size=settings.inference_queue_size,
+            retry_after=settings.inference_retry_after,
+        )
+    return _executor
+
+
+def shutdown_inference_executor():
+    """Stop the executor; the next get_inference_executor() builds a new one."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,30 @@
+"""
+Fast JSON encoding for API responses.
+Routes build plain dicts and encode them once with orjson, falling back to
+the standard library encoder when orjson is not installed, instead of
+constructing pydantic models and having FastAPI validate them again.
+"""
+import json
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    """JSONResponse encoded with ``dumps``; the app's default response class."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -1,7 +1,38 @@
-from fastapi import APIRouter, HTTPException
-from ..models.schemas import QuoteRequest, QuoteResponse, RiskAssessment, HealthResponse
+import asyncio
+import hmac
+import math
+import time
+from typing import Any
+import numpy as np
+from fastapi import APIRouter, Body, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from ..config import get_settings
+from ..metrics import get_metrics, record_stages
+from ..models.schemas import (
+    QuoteRequest,
+    QuoteResponse,
+    QuoteBatchResponse,
+    QuoteSweepRequest,
+    QuoteSweepResponse,
+    SweepRange,
+    RiskAssessment,
+    HealthResponse,
+)
+from ..models.location_index import get_location_index, reload_location_index
 from ..models.pricing_engine import get_pricing_engine
-from ..models.trained_predictor import get_predictor
+from ..models.trained_predictor import (
+    ModelReloadError,
+    FALLBACK_VERSION,
+    ReloadInProgressError,
+    current_predictor,
+    reload_predictor,
+)
+from .batcher import get_micro_batcher
+from .responses import dumps
+from .executor import get_inference_executor
+from .startup import get_startup_status
+from ..tracing import mark_validated
 from .. import __version__
 
 router = APIRouter()
@@ -9,64 +40,394 @@ router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
-    predictor = get_predictor()
+    """Liveness check; reports "degraded" while serving rule-based fallbacks."""
+    predictor = current_predictor()
+    model_loaded = predictor is not None and predictor.loaded
+    if model_loaded:
+        status = "healthy"
+    elif get_startup_status().in_progress:
+        status = "starting"
+    else:
+        status = "degraded"
     return HealthResponse(
-        status="healthy",
+        status=status,
         version=__version__,
-        model_loaded=predictor.loaded,
+        model_loaded=model_loaded,
     )
 
 
+@router.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness check; 503 until models are loaded and warmed up."""
+    startup = get_startup_status()
+    predictor = current_predictor()
+    if not (startup.ready and predictor is not None and predictor.loaded):
+        response.status_code = 503
+    return startup.snapshot()
+
+
+def _predictor_inputs(request: QuoteRequest) -> dict:
+    """Map a quote request onto TrainedPredictor keyword arguments."""
+    location = get_location_index().resolve(request.location_zip)
+    return {
+        'event_type': request.event_type.value,
+        'state': location.state,
+        'zip_code': request.location_zip,
+        'risk_zone': location.risk_zone,
+        'num_guards': request.num_guards,
+        'hours': request.hours,
+        'crowd_size': request.crowd_size,
+        'event_date': request.date,
+        'is_armed': request.is_armed,
+        'has_vehicle': request.requires_vehicle,
+    }
+
+
+def _count_fallbacks(price_result: dict | None = None, risk_result: dict | None = None):
+    """Count predictions that came from the rule-based fallback."""
+    metrics = get_metrics()
+    if price_result is not None and price_result['model_version'] == FALLBACK_VERSION:
+        metrics.count_fallback('price')
+    if risk_result is not None and risk_result['model_version'] == FALLBACK_VERSION:
+        metrics.count_fallback('risk')
+
+
+def _json_response(body: dict) -> Response:
+    """Encode an internally built response body, timing it as the "serialize" stage.
+
+    Bodies are plain dicts shaped like the route's ``response_model``;
+    returning a Response skips building and re-validating the model, which
+    then only drives the OpenAPI docs.
+    """
+    start = time.perf_counter()
+    content = dumps(body)
+    record_stages({'serialize': time.perf_counter() - start})
+    return Response(content, media_type="application/json")
+
+
+def _validation_error_message(error: ValidationError) -> str:
+    """Flatten a pydantic error into one inline message per failed field."""
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" if err['loc'] else err['msg']
+        for err in error.errors()
+    )
+
+
+def _build_quote_response(
+    request: QuoteRequest, price_result: dict, risk_result: dict
+) -> dict:
+    """Assemble a QuoteResponse body from price and risk predictions."""
+    location = get_location_index().resolve(request.location_zip)
+    return {
+        'base_price': price_result['predicted_price'] / 1.0875,  # pre-tax
+        'risk_multiplier': 1.0 + (risk_result['risk_score'] * 0.5),
+        'final_price': price_result['predicted_price'],
+        'risk_level': risk_result['risk_level'],
+        'confidence_score': price_result['confidence'],
+        'breakdown': {
+            'model_used': price_result['model_used'],
+            'risk_factors': risk_result['factors'],
+            'num_guards': request.num_guards,
+            'hours': request.hours,
+            'is_armed': request.is_armed,
+            'has_vehicle': request.requires_vehicle,
+            'location': f"{location.city}, {location.state}",
+            'risk_zone': location.risk_zone,
+            'location_multiplier': location.rate_modifier,
+        },
+        'model_version': price_result['model_version'],
+    }
+
+
 @router.post("/quote", response_model=QuoteResponse)
 async def generate_quote(request: QuoteRequest):
     """Generate a price quote using trained ML model."""
+    mark_validated()
     try:
-        predictor = get_predictor()
+        # Get ML predictions (price and risk share one encoding)
+        inputs = _predictor_inputs(request)
+        batcher = get_micro_batcher()
+        if batcher is not None:
+            result = await batcher.submit(inputs)
+        else:
+            result = await get_inference_executor().predict('predict_quote', **inputs)
 
-        # Get ML predictions
-        price_result = predictor.predict_price(
-            event_type=request.event_type.value,
-            state="CA",  # TODO: extract from zip
-            zip_code=request.location_zip,
-            risk_zone="medium",  # TODO: lookup from DB
-            num_guards=request.num_guards,
-            hours=request.hours,
-            crowd_size=request.crowd_size,
-            event_date=request.date,
-            is_armed=request.is_armed,
-            has_vehicle=request.requires_vehicle,
+        _count_fallbacks(result['price'], result['risk'])
+        return _json_response(_build_quote_response(request, result['price'], result['risk']))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/quote/batch", response_model=QuoteBatchResponse)
+async def generate_quote_batch(quotes: list[Any] = Body(...)):
+    """Generate quotes for many requests with one vectorized model pass.
+
+    Invalid items, including ones that are not JSON objects, are reported
+    inline and do not fail the rest of the batch.
+    """
+    mark_validated()
+    settings = get_settings()
+    if len(quotes) > settings.quote_batch_max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.quote_batch_max_size} quotes",
         )
 
-        risk_result = predictor.predict_risk(
-            event_type=request.event_type.value,
-            state="CA",
-            zip_code=request.location_zip,
-            num_guards=request.num_guards,
-            hours=request.hours,
-            crowd_size=request.crowd_size,
-            event_date=request.date,
-            is_armed=request.is_armed,
+    try:
+        start = time.perf_counter()
+        results = [{'index': i, 'quote': None, 'error': None} for i in range(len(quotes))]
+        requests = []
+        positions = []
+        for i, raw in enumerate(quotes):
+            try:
+                requests.append(QuoteRequest.model_validate(raw))
+                positions.append(i)
+            except ValidationError as e:
+                results[i]['error'] = _validation_error_message(e)
+        record_stages({'validation': time.perf_counter() - start})
+
+        predictions = await get_inference_executor().predict(
+            'predict_batch', [_predictor_inputs(request) for request in requests]
         )
 
-        # Build response
-        from ..models.schemas import RiskLevel
-
-        return QuoteResponse(
-            base_price=price_result['predicted_price'] / 1.0875,  # pre-tax
-            risk_multiplier=1.0 + (risk_result['risk_score'] * 0.5),
-            final_price=price_result['predicted_price'],
-            risk_level=RiskLevel(risk_result['risk_level']),
-            confidence_score=price_result['confidence'],
-            breakdown={
-                'model_used': price_result['model_used'],
-                'risk_factors': risk_result['factors'],
-                'num_guards': request.num_guards,
-                'hours': request.hours,
-                'is_armed': request.is_armed,
-                'has_vehicle': request.requires_vehicle,
-            }
+        for i, request, prediction in zip(positions, requests, predictions):
+            if 'error' in prediction:
+                results[i]['error'] = prediction['error']
+                continue
+            _count_fallbacks(prediction['price'], prediction['risk'])
+            results[i]['quote'] = _build_quote_response(
+                request, prediction['price'], prediction['risk']
+            )
+
+        failed = sum(1 for item in results if item['error'] is not None)
+        return _json_response({
+            'results': results,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class _BodyStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves ``receive`` to the body iterator.
+
+    The stock class listens for disconnects on ``receive`` while streaming,
+    which would swallow request body chunks the iterator has not read yet;
+    here the iterator sees disconnects itself through ``Request.stream()``.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def _ndjson_lines(stream, max_line: int):
+    """Yield non-blank lines of an NDJSON byte stream.
+
+    An over-long line yields ``None`` once and is skipped up to its newline,
+    so a missing newline cannot make the buffer grow without bound.
+    """
+    buffer = b""
+    skipping = False
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif line.strip():
+                yield line
+        if len(buffer) > max_line and not skipping:
+            skipping = True
+            yield None
+        if skipping:
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield buffer
+
+
+async def _predict_retrying(executor, method: str, *args, timeout: float):
+    """``executor.predict`` that waits out a full inference queue for up to ``timeout`` seconds.
+
+    The queue's 503 is re-raised once the deadline passes.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await executor.predict(method, *args)
+        except HTTPException as e:
+            remaining = deadline - time.monotonic()
+            if e.status_code != 503 or remaining <= 0:
+                raise
+            await asyncio.sleep(min(executor.retry_after, remaining))
+
+
+async def _quote_chunk(executor, chunk: list, retry_seconds: float) -> bytes:
+    """Predict one chunk of ``(index, QuoteRequest | error)`` pairs as NDJSON.
+
+    If the inference queue stays full for ``retry_seconds``, the chunk's
+    lines are returned with the 503 detail as their error.
+    """
+    results = [{'index': index, 'quote': None, 'error': None} for index, _ in chunk]
+    positions = []
+    requests = []
+    for i, (_, parsed) in enumerate(chunk):
+        if isinstance(parsed, str):
+            results[i]['error'] = parsed
+        else:
+            positions.append(i)
+            requests.append(parsed)
+
+    if requests:
+        try:
+            predictions = await _predict_retrying(
+                executor, 'predict_batch', [_predictor_inputs(r) for r in requests],
+                timeout=retry_seconds,
+            )
+        except Exception as e:
+            message = e.detail if isinstance(e, HTTPException) else str(e)
+            predictions = [{'error': message}] * len(requests)
+        for i, request, prediction in zip(positions, requests, predictions):
+            if 'error' in prediction:
+                results[i]['error'] = prediction['error']
+                continue
+            _count_fallbacks(prediction['price'], prediction['risk'])
+            results[i]['quote'] = _build_quote_response(
+                request, prediction['price'], prediction['risk']
+            )
+
+    start = time.perf_counter()
+    content = b"".join(dumps(item) + b"\n" for item in results)
+    record_stages({'serialize': time.perf_counter() - start})
+    return content
+
+
+async def _stream_quotes(request: Request, chunk_size: int, max_line: int,
+                         retry_seconds: float):
+    executor = get_inference_executor()
+    chunk = []
+    index = 0
+    async for line in _ndjson_lines(request.stream(), max_line):
+        if line is None:
+            parsed = f"Line exceeds {max_line} bytes"
+        else:
+            try:
+                parsed = QuoteRequest.model_validate_json(line)
+            except ValidationError as e:
+                parsed = _validation_error_message(e)
+        chunk.append((index, parsed))
+        index += 1
+        if len(chunk) == chunk_size:
+            yield await _quote_chunk(executor, chunk, retry_seconds)
+            chunk = []
+    if chunk:
+        yield await _quote_chunk(executor, chunk, retry_seconds)
+
+
+@router.post("/quote/stream", response_class=StreamingResponse)
+async def generate_quote_stream(request: Request):
+    """Quote an NDJSON stream of QuoteRequests of any length.
+
+    Lines are validated and predicted in fixed-size chunks (one vectorized
+    model pass each) and streamed back as NDJSON QuoteBatchItems in input
+    order while the body is still arriving, so memory stays flat however
+    long the upload is. Invalid lines, and lines that could not be scored
+    before ``quote_stream_retry_seconds`` of a saturated inference queue
+    ran out, are reported inline by ``index``.
+    """
+    settings = get_settings()
+    return _BodyStreamingResponse(
+        _stream_quotes(request, settings.quote_stream_chunk_size,
+                       settings.quote_stream_max_line_bytes,
+                       settings.quote_stream_retry_seconds),
+        media_type="application/x-ndjson",
+    )
+
+
+# Sweepable QuoteRequest fields -> TrainedPredictor.predict_grid axes
+SWEEP_AXES = {
+    'num_guards': 'num_guards',
+    'hours': 'hours',
+    'is_armed': 'is_armed',
+    'requires_vehicle': 'has_vehicle',
+}
+
+
+def _axis_length(spec) -> int:
+    if spec is None:
+        return 1
+    if isinstance(spec, SweepRange):
+        return max(math.floor((spec.stop - spec.start) / spec.step + 1e-9) + 1, 0)
+    return len(spec)
+
+
+def _axis_values(request: QuoteSweepRequest, name: str, base: dict) -> list:
+    """Expand one sweep axis and check every value against QuoteRequest's rules."""
+    spec = getattr(request, name)
+    if spec is None:
+        return [getattr(request.base, name)]
+    if isinstance(spec, SweepRange):
+        steps = np.arange(_axis_length(spec))
+        spec = np.round(spec.start + spec.step * steps, 9).tolist()
+
+    values = []
+    for value in spec:
+        try:
+            checked = QuoteRequest.model_validate({**base, name: value})
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{name}={value!r}: {e.errors()[0]['msg']}",
+            )
+        values.append(getattr(checked, name))
+    return values
+
+
+@router.post("/quote/sweep", response_model=QuoteSweepResponse)
+async def generate_quote_sweep(request: QuoteSweepRequest):
+    """Price and risk over every combination of the swept inputs.
+
+    Feeds price curves in the quote form: the grid is the cartesian product
+    of the ``num_guards``, ``hours``, ``is_armed`` and ``requires_vehicle``
+    values around ``base``, scored with one vectorized model pass.
+    """
+    mark_validated()
+    settings = get_settings()
+    lengths = {name: _axis_length(getattr(request, name)) for name in SWEEP_AXES}
+    empty = [name for name, length in lengths.items() if length == 0]
+    if empty:
+        raise HTTPException(status_code=422, detail=f"Empty sweep axis: {', '.join(empty)}")
+    if math.prod(lengths.values()) > settings.quote_sweep_max_points:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Sweep exceeds {settings.quote_sweep_max_points} grid points",
+        )
+
+    try:
+        base = request.base.model_dump()
+        axes = {name: _axis_values(request, name, base) for name in SWEEP_AXES}
+
+        result = await get_inference_executor().predict(
+            'predict_grid',
+            _predictor_inputs(request.base),
+            {SWEEP_AXES[name]: values for name, values in axes.items()},
         )
+
+        _count_fallbacks(result, result)
+        return _json_response({
+            'axes': axes,
+            'shape': [len(values) for values in axes.values()],
+            'final_price': result['final_price'].tolist(),
+            'risk_level': result['risk_level'].tolist(),
+            'risk_score': result['risk_score'].tolist(),
+            'model_version': result['model_version'],
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,9 +435,10 @@ async def generate_quote(request: QuoteRequest):
 @router.post("/quote/rule-based", response_model=QuoteResponse)
 async def generate_quote_rule_based(request: QuoteRequest):
     """Generate a price quote using rule-based engine (fallback)."""
+    mark_validated()
     try:
         engine = get_pricing_engine()
-        return engine.calculate_quote(request)
+        return _json_response(engine.calculate_quote_payload(request))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -84,12 +446,13 @@ async def generate_quote_rule_based(request: QuoteRequest):
 @router.post("/risk-assessment", response_model=RiskAssessment)
 async def assess_risk(request: QuoteRequest):
     """Get detailed risk assessment using trained ML model."""
+    mark_validated()
     try:
-        predictor = get_predictor()
-
-        result = predictor.predict_risk(
+        location = get_location_index().resolve(request.location_zip)
+        result = await get_inference_executor().predict(
+            'predict_risk',
             event_type=request.event_type.value,
-            state="CA",
+            state=location.state,
             zip_code=request.location_zip,
             num_guards=request.num_guards,
             hours=request.hours,
@@ -98,8 +461,6 @@ async def assess_risk(request: QuoteRequest):
             is_armed=request.is_armed,
         )
 
-        from ..models.schemas import RiskLevel
-
         # Generate recommendations based on risk level
         recommendations = []
         if result['risk_level'] in ['high', 'critical']:
@@ -113,12 +474,16 @@ async def assess_risk(request: QuoteRequest):
         if not recommendations:
             recommendations.append("Standard protocols apply")
 
-        return RiskAssessment(
-            risk_level=RiskLevel(result['risk_level']),
-            risk_score=result['risk_score'],
-            factors=result['factors'],
-            recommendations=recommendations,
-        )
+        _count_fallbacks(risk_result=result)
+        return _json_response({
+            'risk_level': result['risk_level'],
+            'risk_score': result['risk_score'],
+            'factors': result['factors'],
+            'recommendations': recommendations,
+            'model_version': result['model_version'],
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -141,19 +506,68 @@ async def get_event_types():
 
 @router.get("/model-info")
 async def get_model_info():
-    """Get information about loaded ML models."""
-    predictor = get_predictor()
+    """Get information about loaded ML models; never waits on a load in progress."""
+    predictor = current_predictor()
 
-    if not predictor.loaded:
+    if predictor is None or not predictor.loaded:
+        if get_startup_status().in_progress:
+            return {
+                "status": "starting",
+                "message": "Models loading in the background - using rule-based fallback"
+            }
         return {
             "status": "not_loaded",
             "message": "Models not loaded - using rule-based fallback"
         }
 
+    batcher = get_micro_batcher()
+
     return {
         "status": "loaded",
+        "model_version": predictor.version,
         "price_model": predictor.models.get('price_model_name', 'Unknown'),
         "trained_at": predictor.models.get('trained_at', 'Unknown'),
         "price_features": len(predictor.models.get('price_features', [])),
         "risk_features": len(predictor.models.get('risk_features', [])),
+        "inference_engines": predictor.engines,
+        "micro_batching": batcher.stats() if batcher is not None else None,
+        "prediction_cache": predictor.cache.stats(),
+    }
+
+
+@router.post("/model/reload")
+async def reload_model(x_internal_secret: str | None = Header(default=None)):
+    """Load the model artifact and location data again and swap them in without downtime.
+
+    Requires the ``X-Internal-Secret`` header to match ``ML_ENGINE_SECRET``.
+    Requests already running finish on the previous model.
+    """
+    settings = get_settings()
+    if not settings.ml_engine_secret or not hmac.compare_digest(
+        (x_internal_secret or "").encode(), settings.ml_engine_secret.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    current = current_predictor()
+    previous = current.version if current is not None else None
+    try:
+        predictor = await asyncio.to_thread(
+            reload_predictor, settings.model_warmup_requests
+        )
+    except ReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ModelReloadError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    try:
+        # Process workers are warmed on the new model before they take traffic
+        await get_inference_executor().reload_workers(settings.model_warmup_requests)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Inference workers failed to reload: {e}")
+    locations = await asyncio.to_thread(reload_location_index)
+    return {
+        "status": "reloaded",
+        "previous_version": previous,
+        "model_version": predictor.version,
+        "locations": len(locations),
     }
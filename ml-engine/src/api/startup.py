@@ -0,0 +1,91 @@
+"""
+Background model loading at startup.
+The server accepts connections immediately; /ready passes once the models
+are loaded and warmed up.
+"""
+import asyncio
+import time
+from typing import Optional
+
+from ..config import get_settings
+from ..models.location_index import get_location_index
+from ..models.trained_predictor import get_predictor
+from .executor import get_inference_executor
+
+STARTUP_STATES = ("starting", "loading", "warming", "ready", "failed")
+
+
+class StartupStatus:
+    """Where background startup has got to, plus a per-phase timing breakdown."""
+
+    def __init__(self):
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self.timings: dict = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def in_progress(self) -> bool:
+        return self.state in ("starting", "loading", "warming")
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.state,
+            "error": self.error,
+            "timings_ms": {name: round(ms, 1) for name, ms in self.timings.items()},
+        }
+
+
+async def load_models(status: StartupStatus, app_imports_ms: float = 0.0):
+    """Load the predictor off the event loop, warm it up and mark the app ready."""
+    settings = get_settings()
+    status.timings['app_imports_ms'] = app_imports_ms
+    try:
+        status.state = "loading"
+        start = time.perf_counter()
+        locations = await asyncio.to_thread(get_location_index)
+        status.timings['locations_ms'] = (time.perf_counter() - start) * 1000
+        print(f"✓ Indexed {len(locations)} locations")
+
+        predictor = await asyncio.to_thread(get_predictor)
+        status.timings.update(predictor.load_timings)
+        if not predictor.loaded:
+            status.state = "failed"
+            status.error = "Models not loaded - using rule-based fallback"
+            print(f"✗ Startup: {status.error}")
+            return
+
+        status.state = "warming"
+        start = time.perf_counter()
+        await asyncio.to_thread(predictor.warmup, settings.model_warmup_requests)
+        await get_inference_executor().warm(settings.model_warmup_requests)
+        status.timings['warmup_ms'] = (time.perf_counter() - start) * 1000
+        status.state = "ready"
+    except Exception as e:
+        status.state = "failed"
+        status.error = str(e)
+        print(f"✗ Startup failed: {e}")
+        return
+
+    breakdown = ", ".join(
+        f"{name.removesuffix('_ms')} {ms:.0f} ms" for name, ms in status.timings.items()
+    )
+    print(f"✓ Ready in {sum(status.timings.values()):.0f} ms ({breakdown})")
+
+
+# Singleton instance
+_status = StartupStatus()
+
+
+def get_startup_status() -> StartupStatus:
+    return _status
+
+
+def start_model_loading(app_imports_ms: float = 0.0) -> asyncio.Task:
+    """Reset the startup status and begin loading models in the background."""
+    global _status
+    _status = StartupStatus()
+    return asyncio.create_task(load_models(_status, app_imports_ms))
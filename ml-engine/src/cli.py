@@ -0,0 +1,339 @@
+"""
+Command-line tools for the GuardQuote ML Engine.
+
+reprice  Re-price historical quotes offline with the trained models and the
+         rule-based PricingEngine side by side, reporting predicted vs.
+         actual price and risk for drift audits. The input CSV is read in
+         chunks that are scored on a process pool and streamed to CSV or
+         Parquet, so memory stays flat for millions of rows.
+
+Usage:
+    python -m src.cli reprice data/processed/training_data_2026.csv --output reprice.parquet
+    python -m src.cli reprice quotes_export.csv --output reprice.csv --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data.sources import representative_zips
+from .models.feature_encoder import DEFAULT_LABELS, DEFAULT_ZIP_REGION
+from .models.pricing_engine import PricingEngine, TRAINING_EVENT_TYPES, get_pricing_engine
+from .models.schemas import EventType
+
+# Training CSV and ml_training_data export names -> reprice input names
+REPRICE_ALIASES = {
+    'event_type_code': 'event_type',
+    'guards': 'num_guards',
+    'duration': 'hours',
+    'hours_per_guard': 'hours',
+    'price': 'actual_price',
+    'final_price': 'actual_price',
+    'risk_score': 'actual_risk_score',
+}
+
+REQUIRED_COLUMNS = ('event_type', 'num_guards', 'hours', 'day_of_week', 'hour_of_day', 'month')
+
+# Input columns copied to the output to identify each row
+PASSTHROUGH_COLUMNS = ('id', 'quote_id', 'event_type', 'state', 'num_guards', 'hours')
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def normalize_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rename known aliases and check the columns reprice needs."""
+    frame = frame.rename(columns={
+        alias: name for alias, name in REPRICE_ALIASES.items()
+        if alias in frame.columns and name not in frame.columns
+    })
+    missing = [name for name in REQUIRED_COLUMNS if name not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing columns: {', '.join(missing)}")
+    return frame
+
+
+def event_dates(month, day_of_week, hour, year: int = 2026) -> np.ndarray:
+    """First ``year`` date in each month on ``day_of_week`` (Monday=0) at ``hour``."""
+    month = np.asarray(month, dtype=np.int64)
+    first = (np.datetime64(f'{year}-01', 'M') + (month - 1)).astype('datetime64[D]')
+    # 1970-01-01 was a Thursday (weekday 3)
+    offset = (np.asarray(day_of_week, dtype=np.int64) - (first.astype(np.int64) + 3)) % 7
+    return (first + offset.astype('timedelta64[D]')
+            + np.asarray(hour, dtype=np.int64).astype('timedelta64[h]'))
+
+
+def _column(frame: pd.DataFrame, name: str, default, dtype=None) -> np.ndarray:
+    if name not in frame.columns:
+        return np.full(len(frame), default, dtype=dtype)
+    column = frame[name].fillna(default) if default is not None else frame[name]
+    return column.to_numpy(dtype=dtype)
+
+
+def _risk_levels(scores: np.ndarray) -> np.ndarray:
+    levels = np.searchsorted(PricingEngine.RISK_LEVEL_BOUNDS, scores, side='right')
+    return PricingEngine.RISK_LEVEL_NAMES[levels]
+
+
+def reprice_chunk(frame: pd.DataFrame) -> pd.DataFrame:
+    """Score one chunk with the trained models and the rule-based engine."""
+    from .models.trained_predictor import get_predictor
+
+    frame = normalize_columns(frame)
+    event_type = _column(frame, 'event_type', DEFAULT_LABELS['event_type'], object)
+    num_guards = _column(frame, 'num_guards', None, np.float64)
+    hours = _column(frame, 'hours', None, np.float64)
+    crowd_size = _column(frame, 'crowd_size', 0, np.float64)
+    day_of_week = _column(frame, 'day_of_week', None, np.float64)
+    hour_of_day = _column(frame, 'hour_of_day', None, np.float64)
+    month = _column(frame, 'month', None, np.float64)
+    is_armed = _column(frame, 'is_armed', False, bool)
+    has_vehicle = _column(frame, 'has_vehicle', False, bool)
+    # Rows without ZIPs get the same representative ZIP training gave them
+    zip_codes = frame['zip_code'] if 'zip_code' in frame.columns else representative_zips(frame)
+    zip_region = pd.to_numeric(
+        zip_codes.astype(str).str[:3], errors='coerce'
+    ).fillna(DEFAULT_ZIP_REGION).to_numpy(dtype=np.float64)
+
+    model = get_predictor().predict_columns({
+        'event_type': event_type,
+        'state': _column(frame, 'state', DEFAULT_LABELS['state'], object),
+        'risk_zone': _column(frame, 'risk_zone', DEFAULT_LABELS['risk_zone'], object),
+        'zip_region': zip_region,
+        'num_guards': num_guards,
+        'hours': hours,
+        'crowd_size': crowd_size,
+        'day_of_week': day_of_week,
+        'hour_of_day': hour_of_day,
+        'month': month,
+        'is_armed': is_armed,
+        'has_vehicle': has_vehicle,
+    })
+
+    api_types = {kind.value for kind in EventType}
+    rules = get_pricing_engine().calculate_quotes_batch({
+        'event_type': [
+            value if value in api_types
+            else TRAINING_EVENT_TYPES.get(value, DEFAULT_LABELS['event_type'])
+            for value in event_type
+        ],
+        'date': event_dates(month, day_of_week, hour_of_day),
+        'num_guards': num_guards,
+        'hours': hours,
+        'crowd_size': crowd_size,
+        'is_armed': is_armed,
+        'requires_vehicle': has_vehicle,
+    })
+
+    out = frame[[name for name in PASSTHROUGH_COLUMNS if name in frame.columns]].copy()
+    out['model_price'] = model['final_price']
+    out['rule_price'] = rules['final_price']
+    if 'actual_price' in frame.columns:
+        actual = frame['actual_price'].to_numpy(dtype=np.float64)
+        out['actual_price'] = actual
+        out['model_price_error'] = model['final_price'] - actual
+        out['rule_price_error'] = rules['final_price'] - actual
+    out['model_risk_level'] = model['risk_level']
+    out['model_risk_confidence'] = model['risk_score']
+    out['rule_risk_score'] = rules['risk_score']
+    out['rule_risk_level'] = rules['risk_level']
+    if 'actual_risk_score' in frame.columns:
+        actual_risk = frame['actual_risk_score'].to_numpy(dtype=np.float64)
+        out['actual_risk_score'] = actual_risk
+        out['actual_risk_level'] = _risk_levels(actual_risk)
+    return out
+
+
+class CsvSink:
+    """Appends chunks to one CSV file, writing the header once."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", newline="")
+        self._header = True
+
+    def write(self, frame: pd.DataFrame):
+        frame.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """Appends chunks as row groups of one Parquet file (requires pyarrow)."""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install guardquote-ml[parquet]")
+        self.path = path
+        self._writer = None
+
+    def write(self, frame: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(path: str):
+    if path.lower().endswith(PARQUET_EXTENSIONS):
+        return ParquetSink(path)
+    return CsvSink(path)
+
+
+class DriftSummary:
+    """Running error totals across chunks."""
+
+    def __init__(self):
+        self.rows = 0
+        self.priced = 0
+        self.model_abs_error = 0.0
+        self.rule_abs_error = 0.0
+        self.risk_rows = 0
+        self.model_risk_matches = 0
+        self.rule_risk_matches = 0
+
+    def add(self, frame: pd.DataFrame):
+        self.rows += len(frame)
+        if 'actual_price' in frame.columns:
+            priced = frame['actual_price'].notna()
+            self.priced += int(priced.sum())
+            self.model_abs_error += float(frame['model_price_error'][priced].abs().sum())
+            self.rule_abs_error += float(frame['rule_price_error'][priced].abs().sum())
+        if 'actual_risk_level' in frame.columns:
+            scored = frame['actual_risk_score'].notna()
+            actual = frame['actual_risk_level'][scored]
+            self.risk_rows += int(scored.sum())
+            self.model_risk_matches += int((frame['model_risk_level'][scored] == actual).sum())
+            self.rule_risk_matches += int((frame['rule_risk_level'][scored] == actual).sum())
+
+    def report(self) -> dict:
+        report = {'rows': self.rows}
+        if self.priced:
+            report['model_price_mae'] = self.model_abs_error / self.priced
+            report['rule_price_mae'] = self.rule_abs_error / self.priced
+        if self.risk_rows:
+            report['model_risk_accuracy'] = self.model_risk_matches / self.risk_rows
+            report['rule_risk_accuracy'] = self.rule_risk_matches / self.risk_rows
+        return report
+
+
+def _init_worker(model_path: str | None):
+    """Load the models once per process.
+
+    ``model_path`` is a pickle, or an exported directory when MODEL_FORMAT=mmap.
+    """
+    from .config import get_settings
+    from .models import trained_predictor
+    from .models.artifact_store import is_exported
+
+    if model_path:
+        if get_settings().model_format == "mmap":
+            if not is_exported(model_path):
+                raise ValueError(
+                    f"MODEL_FORMAT=mmap loads exported artifacts; {model_path} is not one"
+                )
+            trained_predictor.EXPORT_PATH = model_path
+        else:
+            trained_predictor.MODEL_PATH = model_path
+    return trained_predictor.get_predictor()
+
+
+def reprice(input_path: str, output_path: str, chunk_size: int = 50000,
+            workers: int = 0, model_path: str | None = None, log=print) -> dict:
+    """Re-price ``input_path`` into ``output_path``; returns the drift summary.
+
+    ``workers=0`` scores chunks in this process. Otherwise at most
+    ``2 * workers`` chunks are in flight, and results are written in input
+    order.
+    """
+    predictor = _init_worker(model_path)
+    if not predictor.loaded:
+        raise RuntimeError("Models not loaded - nothing to compare the rules against")
+
+    summary = DriftSummary()
+    start = time.perf_counter()
+    sink = open_sink(output_path)
+
+    def write(frame):
+        sink.write(frame)
+        summary.add(frame)
+        log(f"  {summary.rows:,} rows ({time.perf_counter() - start:.1f}s)")
+
+    try:
+        # ZIPs stay strings, as CsvSource reads them for training (02101 -> 021)
+        chunks = pd.read_csv(input_path, chunksize=chunk_size, dtype={'zip_code': str})
+        if workers <= 0:
+            for chunk in chunks:
+                write(reprice_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(model_path,)
+            ) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(reprice_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+    finally:
+        sink.close()
+
+    report = summary.report()
+    report['model_version'] = predictor.version
+    report['seconds'] = time.perf_counter() - start
+    return report
+
+
+def _reprice_command(args):
+    report = reprice(args.input, args.output, args.chunk_size, args.workers, args.model)
+    print(f"✓ Re-priced {report['rows']:,} rows in {report['seconds']:.1f}s -> {args.output}")
+    if 'model_price_mae' in report:
+        print(f"  Price MAE: model ${report['model_price_mae']:,.2f}, "
+              f"rules ${report['rule_price_mae']:,.2f}")
+    if 'model_risk_accuracy' in report:
+        print(f"  Risk level agreement: model {report['model_risk_accuracy']:.1%}, "
+              f"rules {report['rule_risk_accuracy']:.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reprice_parser = commands.add_parser(
+        "reprice", help="Re-price historical quotes with the models and the rules")
+    reprice_parser.add_argument("input", help="CSV of historical quotes or training rows")
+    reprice_parser.add_argument("--output", required=True,
+                                help="Output file (.csv, or .parquet / .pq for Parquet)")
+    reprice_parser.add_argument("--model", help="Path to guardquote_models.pkl "
+                                                "(an exported directory with MODEL_FORMAT=mmap)")
+    reprice_parser.add_argument("--chunk-size", type=int, default=50000)
+    reprice_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                                help="Worker processes (0 = score in this process)")
+    reprice_parser.set_defaults(handler=_reprice_command)
+
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except (RuntimeError, ValueError) as e:
+        sys.exit(f"✗ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,51 @@ class Settings(BaseSettings):
     model_path: str = "./models/trained"
     log_level: str = "INFO"
 
+    # Maximum number of quotes accepted by /quote/batch
+    quote_batch_max_size: int = 50000
+    # Maximum number of grid points computed by /quote/sweep
+    quote_sweep_max_points: int = 20000
+    # /quote/stream validates and predicts this many NDJSON lines at a time
+    quote_stream_chunk_size: int = 1000
+    quote_stream_max_line_bytes: int = 65536
+    # How long a chunk waits out a full inference queue before its lines fail
+    quote_stream_retry_seconds: float = 30.0
+
+    # Model inference runs off the event loop: "thread" or "process" pool
+    inference_executor: str = "thread"
+    inference_workers: int = 4
+    # Max running + queued inference jobs before returning 503
+    inference_queue_size: int = 64
+    inference_retry_after: int = 1
+
+    # Opt-in micro-batching of concurrent /quote calls
+    microbatch_enabled: bool = False
+    microbatch_window_ms: float = 5.0
+    microbatch_max_size: int = 32
+
+    # Single-quote model output cache (0 entries disables it)
+    prediction_cache_size: int = 10000
+    prediction_cache_ttl: float = 3600.0
+
+    # "compiled" evaluates tree ensembles from flat NumPy arrays;
+    # "sklearn" calls the unpickled estimators directly
+    tree_engine: str = "compiled"
+
+    # "pickle" loads guardquote_models.pkl; "mmap" memory-maps the exported
+    # guardquote_models/ directory so workers share one page-cache copy
+    model_format: str = "pickle"
+
+    # Shared secret (X-Internal-Secret header) for POST /model/reload;
+    # reloading is disabled while it is empty
+    ml_engine_secret: str = ""
+    # Throwaway predictions run on a newly loaded model before it serves
+    model_warmup_requests: int = 16
+
+    # Per-request spans: returned as a Server-Timing header and, when
+    # trace_file is set, appended to it as JSON lines
+    server_timing_enabled: bool = True
+    trace_file: str = ""
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,155 @@
+"""
+Content-addressed cache of preprocessed training features.
+The encoded price, risk and acceptance matrices, their targets and the fitted
+label encoders are saved as .npy files plus a JSON manifest, under a key
+hashed from the source data and the code that builds the features. A hit
+memory-maps them back, so training runs, hyperparameter searches and
+backtests over unchanged data skip loading and preprocessing.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+TARGETS = ('final_price', 'risk_score', 'was_accepted')
+
+_READ_BLOCK = 1 << 20
+
+
+class CachedFeatures(NamedTuple):
+    data: pd.DataFrame  # feature and target columns at their preprocessed dtypes
+    features: dict  # matrix name ('price', 'risk', 'accept') -> feature columns
+    matrices: dict  # matrix name -> read-only float32 (rows, features) array
+    encoders: dict
+    high_water_mark: dict
+
+
+def source_digest(source) -> Optional[str]:
+    """sha256 of a file source's bytes; None for sources only hashable once read."""
+    path = getattr(source, 'path', None)
+    if path is None:
+        return None
+    digest = hashlib.sha256(f"{type(source).__name__}:{getattr(source, 'skip_rows', 0)}:".encode())
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_digest(frame: pd.DataFrame) -> str:
+    """sha256 of a loaded (not yet preprocessed) training frame's columns and values."""
+    digest = hashlib.sha256(",".join(frame.columns).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(data_digest: str, definitions: str) -> str:
+    """Key for features built from ``data_digest`` by the code in ``definitions``."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{data_digest}:".encode())
+    digest.update(definitions.encode())
+    return digest.hexdigest()
+
+
+def _save(out_dir: str, name: str, array: np.ndarray) -> str:
+    filename = f"{name}.npy"
+    np.save(os.path.join(out_dir, filename), np.ascontiguousarray(array), allow_pickle=False)
+    return filename
+
+
+class FeatureCache:
+    """Preprocessed features under ``root/<key>/``, one directory per key."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def save(self, key: str, data: pd.DataFrame, features: dict, encoders: dict,
+             high_water_mark: dict) -> str:
+        """Write the ``features`` matrices of ``data``; concurrent writers of one key are safe."""
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{key[:12]}-", dir=self.root)
+        try:
+            columns = dict.fromkeys(column for names in features.values() for column in names)
+            manifest = {
+                'format_version': FORMAT_VERSION,
+                'created_at': datetime.now().isoformat(),
+                'rows': len(data),
+                'high_water_mark': high_water_mark,
+                'dtypes': {column: str(data[column].dtype) for column in columns},
+                'matrices': {},
+                'targets': {},
+                'encoders': {},
+            }
+            # Preprocessed columns are float32, bool or small integers, all
+            # exact in float32, so the frame is rebuilt bit for bit on load
+            for name, names in features.items():
+                manifest['matrices'][name] = {
+                    'features': list(names),
+                    'file': _save(tmp, f"matrix.{name}", data[names].to_numpy(dtype=np.float32)),
+                }
+            for target in TARGETS:
+                manifest['targets'][target] = _save(tmp, f"target.{target}", data[target].to_numpy())
+            for name, encoder in encoders.items():
+                classes = np.asarray([str(c) for c in encoder.classes_], dtype=str)
+                manifest['encoders'][name] = _save(tmp, f"encoder.{name}", classes)
+
+            with open(os.path.join(tmp, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(tmp, self.path(key))
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # Another run finished the same key first
+            if not os.path.isfile(os.path.join(self.path(key), MANIFEST_NAME)):
+                raise
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return self.path(key)
+
+    def load(self, key: str, mmap: bool = True) -> Optional[CachedFeatures]:
+        """The features saved under ``key``, or None on a miss."""
+        path = self.path(key)
+        try:
+            with open(os.path.join(path, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get('format_version') != FORMAT_VERSION:
+            return None
+
+        mmap_mode = 'r' if mmap else None
+
+        def load(filename: str) -> np.ndarray:
+            return np.load(os.path.join(path, filename), mmap_mode=mmap_mode, allow_pickle=False)
+
+        features = {name: spec['features'] for name, spec in manifest['matrices'].items()}
+        matrices = {name: load(spec['file']) for name, spec in manifest['matrices'].items()}
+
+        columns = {}
+        for name, names in features.items():
+            for i, column in enumerate(names):
+                if column not in columns:
+                    columns[column] = matrices[name][:, i].astype(manifest['dtypes'][column])
+        for target, filename in manifest['targets'].items():
+            columns[target] = np.array(load(filename))
+
+        encoders = {}
+        for name, filename in manifest['encoders'].items():
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(load(filename))
+            encoders[name] = encoder
+
+        return CachedFeatures(pd.DataFrame(columns), features, matrices, encoders,
+                              manifest['high_water_mark'])
@@ -0,0 +1,300 @@
+"""
+Chunked training data sources.
+Reads ml_training_data rows from CSV, Parquet or PostgreSQL (server-side
+cursor) a chunk at a time, maps the 2026 CSV column names onto the database
+schema and downcasts every chunk to compact dtypes as it arrives, so the
+full history never sits in memory at default int64/float64/object widths.
+"""
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# 2026 CSV / ml_training_data_2026 names -> ml_training_data names
+COLUMN_ALIASES = {
+    'event_type': 'event_type_code',
+    'duration': 'hours_per_guard',
+    'guards': 'num_guards',
+    'price': 'final_price',
+    'accepted': 'was_accepted',
+}
+
+CATEGORY_COLUMNS = ('event_type_code', 'zip_code', 'state', 'risk_zone')
+INTEGER_COLUMNS = ('num_guards', 'crowd_size', 'day_of_week', 'hour_of_day', 'month')
+BOOL_COLUMNS = ('is_weekend', 'is_night_shift', 'is_armed', 'has_vehicle', 'was_accepted')
+FLOAT_COLUMNS = ('hours_per_guard', 'total_guard_hours', 'final_price', 'risk_score')
+
+TRAINING_COLUMNS = CATEGORY_COLUMNS + INTEGER_COLUMNS + BOOL_COLUMNS + FLOAT_COLUMNS
+
+# Kept when the source has them; they locate the high-water mark of a training run
+TRACKING_COLUMNS = ('id', 'created_at')
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# Spellings of booleans in CSV exports and database dumps; blanks count as False
+BOOL_VALUES = {
+    'true': True, 't': True, 'yes': True, 'y': True, '1': True,
+    'false': False, 'f': False, 'no': False, 'n': False, '0': False, '': False,
+}
+
+
+def _canonical(name: str) -> str:
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _wanted(name: str) -> bool:
+    name = _canonical(name)
+    return name in TRAINING_COLUMNS or name in TRACKING_COLUMNS
+
+
+def representative_zips(frame: pd.DataFrame) -> pd.Series:
+    """A known ZIP for each row's state and risk zone, for sources without ZIPs.
+
+    The 2026 CSV only records state and risk zone; the first indexed ZIP
+    with both (else with the state) gives the model a real zip_region.
+    """
+    from ..models.feature_encoder import DEFAULT_ZIP_REGION
+    from ..models.location_index import get_location_index
+
+    by_zone: dict = {}
+    by_state: dict = {}
+    for location in get_location_index().by_zip5.values():
+        by_zone.setdefault((location.state, location.risk_zone), location.zip_code)
+        by_state.setdefault(location.state, location.zip_code)
+
+    default = f"{DEFAULT_ZIP_REGION}00"
+    states = frame['state'].astype(str) if 'state' in frame.columns else None
+    if states is None:
+        return pd.Series(default, index=frame.index)
+    zones = (frame['risk_zone'].astype(str) if 'risk_zone' in frame.columns
+             else pd.Series("", index=frame.index))
+    return pd.Series(
+        [by_zone.get((state, zone)) or by_state.get(state, default)
+         for state, zone in zip(states, zones)],
+        index=frame.index,
+    )
+
+
+def _parse_bools(name: str, column: pd.Series) -> pd.Series:
+    """A bool column from real booleans, 0/1 numbers or BOOL_VALUES strings."""
+    column = column.fillna(False)
+    if pd.api.types.is_bool_dtype(column):
+        return column.astype(bool)
+    if pd.api.types.is_numeric_dtype(column):
+        unknown = column[~column.isin((0, 1))]
+    else:
+        column = column.map(lambda value: str(value).strip().lower()).map(BOOL_VALUES)
+        unknown = column[column.isna()]
+    if len(unknown):
+        raise ValueError(f"{name} has values that are not booleans: "
+                         f"{sorted(set(map(str, unknown)))[:5]}")
+    return column.astype(bool)
+
+
+def normalize_chunk(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rename aliases, keep training columns, derive missing ones and downcast."""
+    frame = frame.rename(columns={
+        alias: name for alias, name in COLUMN_ALIASES.items()
+        if alias in frame.columns and name not in frame.columns
+    })
+    frame = frame[[name for name in TRAINING_COLUMNS + TRACKING_COLUMNS if name in frame.columns]]
+
+    derived = {}
+    if 'zip_code' not in frame.columns:
+        derived['zip_code'] = representative_zips(frame)
+    if 'total_guard_hours' not in frame.columns:
+        derived['total_guard_hours'] = frame['num_guards'] * frame['hours_per_guard']
+    if 'is_weekend' not in frame.columns and 'day_of_week' in frame.columns:
+        derived['is_weekend'] = frame['day_of_week'] >= 5
+    if 'is_night_shift' not in frame.columns and 'hour_of_day' in frame.columns:
+        derived['is_night_shift'] = (frame['hour_of_day'] >= 22) | (frame['hour_of_day'] < 6)
+
+    columns = {}
+    for name in TRAINING_COLUMNS + TRACKING_COLUMNS:
+        column = derived[name] if name in derived else frame.get(name)
+        if column is None:
+            continue
+        if name == 'id':
+            column = pd.to_numeric(column).astype(np.int64)
+        elif name == 'created_at':
+            column = pd.to_datetime(column)
+        elif name in CATEGORY_COLUMNS:
+            column = column.astype('category')
+        elif name in INTEGER_COLUMNS:
+            column = pd.to_numeric(column.fillna(0), downcast='integer')
+        elif name in BOOL_COLUMNS:
+            column = _parse_bools(name, column)
+        else:
+            column = pd.to_numeric(column).astype(np.float32)
+        columns[name] = column
+    return pd.DataFrame(columns)
+
+
+def concat_chunks(chunks: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate normalized chunks, merging each chunk's categories."""
+    if not chunks:
+        return pd.DataFrame(columns=list(TRAINING_COLUMNS))
+    columns = {}
+    for name in chunks[0].columns:
+        parts = [chunk[name] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            columns[name] = pd.Series(union_categoricals(parts, ignore_order=True))
+        else:
+            columns[name] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+class CsvSource:
+    """Training rows from a CSV file (2026 export or ml_training_data dump).
+
+    ``skip_rows`` starts after that many data rows, for files only appended to.
+    """
+
+    def __init__(self, path: str, chunksize: int = DEFAULT_CHUNKSIZE, skip_rows: int = 0):
+        self.path = path
+        self.chunksize = chunksize
+        self.skip_rows = skip_rows
+
+    def __str__(self) -> str:
+        return self.path
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        yield from pd.read_csv(
+            self.path,
+            chunksize=self.chunksize,
+            usecols=_wanted,
+            dtype={'zip_code': str},
+            skiprows=range(1, self.skip_rows + 1),
+        )
+
+
+class ParquetSource:
+    """Training rows from a Parquet file, read one record batch at a time."""
+
+    def __init__(self, path: str, chunksize: int = DEFAULT_CHUNKSIZE, skip_rows: int = 0):
+        self.path = path
+        self.chunksize = chunksize
+        self.skip_rows = skip_rows
+
+    def __str__(self) -> str:
+        return self.path
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(self.path)
+        columns = [name for name in parquet.schema_arrow.names if _wanted(name)]
+        skip = self.skip_rows
+        for batch in parquet.iter_batches(batch_size=self.chunksize, columns=columns):
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            yield batch.slice(skip).to_pandas()
+            skip = 0
+
+
+def postgres_dsn() -> str:
+    """libpq connection string from the DB_* environment variables."""
+    return " ".join(
+        f"{key}={os.getenv(env, default)}"
+        for key, env, default in (
+            ('host', 'DB_HOST', 'localhost'),
+            ('port', 'DB_PORT', '5432'),
+            ('user', 'DB_USER', 'guardquote'),
+            ('password', 'DB_PASSWORD', ''),
+            ('dbname', 'DB_NAME', 'guardquote'),
+        )
+        if os.getenv(env, default)
+    )
+
+
+class PostgresSource:
+    """Training rows streamed from PostgreSQL through a server-side (named) cursor."""
+
+    def __init__(self, dsn: Optional[str] = None, table: str = "ml_training_data",
+                 chunksize: int = DEFAULT_CHUNKSIZE, connect=None,
+                 since_id: Optional[int] = None):
+        self.dsn = dsn or postgres_dsn()
+        self.table = table
+        self.chunksize = chunksize
+        self._connect = connect
+        self.since_id = since_id
+
+    def __str__(self) -> str:
+        return f"PostgreSQL {self.table}"
+
+    def _connection(self):
+        if self._connect is not None:
+            return self._connect(self.dsn)
+        try:
+            import psycopg2
+        except ImportError:
+            raise RuntimeError(
+                "PostgreSQL sources require psycopg2: pip install guardquote-ml[postgres]"
+            )
+        return psycopg2.connect(self.dsn)
+
+    def query(self) -> tuple[str, tuple]:
+        if self.since_id is None:
+            return f'SELECT * FROM "{self.table}"', ()
+        return f'SELECT * FROM "{self.table}" WHERE id > %s ORDER BY id', (self.since_id,)
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        connection = self._connection()
+        try:
+            # A named cursor keeps the result set on the server; rows arrive
+            # chunksize at a time instead of all at once
+            cursor = connection.cursor(name="guardquote_training")
+            cursor.itersize = self.chunksize
+            cursor.execute(*self.query())
+            while True:
+                rows = cursor.fetchmany(self.chunksize)
+                if not rows:
+                    break
+                yield pd.DataFrame(rows, columns=[column[0] for column in cursor.description])
+            cursor.close()
+        finally:
+            connection.close()
+
+
+def open_source(spec: str, chunksize: int = DEFAULT_CHUNKSIZE, table: str = "ml_training_data",
+                since: Optional[dict] = None):
+    """Pick a source from ``spec``: "postgres", a postgres:// URL, a .parquet path or a CSV path.
+
+    ``since`` is a high_water_mark() of an earlier run; only rows after it are read.
+    """
+    since = since or {}
+    if spec == "postgres" or spec.startswith(("postgres://", "postgresql://")):
+        dsn = None if spec == "postgres" else spec
+        return PostgresSource(dsn, table=table, chunksize=chunksize, since_id=since.get('id'))
+    if spec.lower().endswith(PARQUET_EXTENSIONS):
+        return ParquetSource(spec, chunksize, since.get('rows', 0))
+    return CsvSource(spec, chunksize, since.get('rows', 0))
+
+
+def high_water_mark(frame: pd.DataFrame, since: Optional[dict] = None) -> dict:
+    """Where a run that read ``frame`` (after ``since``) stopped.
+
+    Database rows are tracked by their serial id (and created_at, for
+    reference); files, which have neither, by the number of rows read.
+    """
+    since = since or {}
+    mark = {'rows': since.get('rows', 0) + len(frame)}
+    if 'id' in frame.columns and len(frame):
+        mark['id'] = int(frame['id'].max())
+        if 'created_at' in frame.columns:
+            mark['created_at'] = frame['created_at'].max().isoformat()
+    elif 'id' in since:
+        mark['id'] = since['id']
+        if 'created_at' in since:
+            mark['created_at'] = since['created_at']
+    return mark
+
+
+def load_training_frame(source) -> pd.DataFrame:
+    """All rows of ``source`` as one compact frame, normalized chunk by chunk."""
+    return concat_chunks([normalize_chunk(chunk) for chunk in source.chunks()])
@@ -1,15 +1,35 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .api import router
+from .api.executor import shutdown_inference_executor
+from .api.responses import FastJSONResponse
+from .api.startup import start_model_loading
 from .config import get_settings
-from . import __version__
+from .metrics import MetricsMiddleware, get_metrics
+from .tracing import TracingMiddleware, close_trace_writer
+from . import IMPORT_STARTED, __version__
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models load in the background so the server binds its port right away
+    loading = start_model_loading((time.perf_counter() - IMPORT_STARTED) * 1000)
+    yield
+    loading.cancel()
+    shutdown_inference_executor()
+    close_trace_writer()
+
+
 app = FastAPI(
     title="GuardQuote ML Engine",
     description="ML-powered pricing and risk assessment for security guard services",
     version=__version__,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -20,6 +40,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(router, prefix="/api/v1", tags=["ML Engine"])
 
 
@@ -32,6 +55,15 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text-format metrics."""
+    return Response(
+        get_metrics().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,260 @@
+"""
+In-process metrics for the GuardQuote ML Engine, exposed in the Prometheus
+text format at /metrics.
+
+Every metric is a handful of plain numbers: counters and gauges are one int,
+histograms a fixed array of bucket counts. Recording happens on the event
+loop thread (model stage timings are carried back from inference workers
+and recorded there), so updates need no locks.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Upper bounds in seconds, from 100 µs (a cached predict) to 10 s
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts[i]`` holds observations in bucket i only."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class MetricFamily:
+    """One metric name with a child per label combination."""
+
+    def __init__(self, name: str, kind: str, help_text: str, labelnames: tuple, factory):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: dict[tuple, object] = {}
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._factory())
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {child.value}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*child.bounds, "+Inf"), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {child.sum}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class EngineMetrics:
+    """Request, model-stage and fallback metrics for the ML engine."""
+
+    def __init__(self):
+        self.families: list[MetricFamily] = []
+        self.requests = self._family(
+            "guardquote_http_requests_total", "counter",
+            "HTTP requests by route, method and status", ("route", "method", "status"), Counter,
+        )
+        self.request_latency = self._family(
+            "guardquote_http_request_duration_seconds", "histogram",
+            "HTTP request latency by route", ("route", "method"), Histogram,
+        )
+        self.in_flight = self._family(
+            "guardquote_http_requests_in_flight", "gauge",
+            "HTTP requests currently being handled", ("route",), Gauge,
+        )
+        self.stage_latency = self._family(
+            "guardquote_stage_duration_seconds", "histogram",
+            "Time spent per request stage (validation, encode, predict_price, "
+            "predict_risk, factors, serialize)", ("stage",), Histogram,
+        )
+        self.fallbacks = self._family(
+            "guardquote_fallback_total", "counter",
+            "Predictions answered by the rule-based fallback", ("model",), Counter,
+        )
+
+    def _family(self, name, kind, help_text, labelnames, factory) -> MetricFamily:
+        family = MetricFamily(name, kind, help_text, labelnames, factory)
+        self.families.append(family)
+        return family
+
+    def observe_stages(self, stages: dict):
+        for stage, seconds in stages.items():
+            self.stage_latency.labels(stage).observe(seconds)
+
+    def count_fallback(self, model: str):
+        self.fallbacks.labels(model).inc()
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+# Stage timings for the request or prediction running in this context (task or thread)
+_stages: ContextVar[Optional[dict]] = ContextVar("guardquote_stages", default=None)
+
+
+@contextmanager
+def collect_stages():
+    """Collect ``timed`` stage durations (seconds) into the yielded dict."""
+    stages: dict = {}
+    token = _stages.set(stages)
+    try:
+        yield stages
+    finally:
+        _stages.reset(token)
+
+
+@contextmanager
+def timed(stage: str):
+    """Time a block into the active ``collect_stages`` dict, if any."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = _stages.get()
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + time.perf_counter() - start
+
+
+def record_stages(stages: dict):
+    """Observe finished stage timings and add them to the active collector.
+
+    Called on the event loop with timings from an inference worker (or timed
+    in the handler); the active collector is the current request's spans.
+    """
+    get_metrics().observe_stages(stages)
+    add_stages(stages)
+
+
+def add_stages(stages: dict):
+    """Add timings to the active collector without observing them again.
+
+    For stages already recorded once for shared work, such as a micro-batch
+    that served several requests.
+    """
+    active = _stages.get()
+    if active is not None:
+        for stage, seconds in stages.items():
+            active[stage] = active.get(stage, 0.0) + seconds
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status and in-flight counts.
+
+    Requests are labelled by path once the router has matched that path to a
+    route, and ``unmatched`` otherwise, so scans of random URLs cannot grow
+    the label set. (All routes are static paths, so path == route.)
+    """
+
+    def __init__(self, app, metrics: Optional[EngineMetrics] = None):
+        self.app = app
+        self.metrics = metrics
+        self._route_paths: set[str] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics or get_metrics()
+        path = scope["path"]
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # The route is only known after routing; until a path has matched
+        # once, its in-flight requests are counted under "unmatched"
+        in_flight = metrics.in_flight.labels(path if path in self._route_paths else "unmatched")
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            if scope.get("route") is not None:
+                self._route_paths.add(path)
+                route = path
+            else:
+                route = "unmatched"
+            metrics.request_latency.labels(route, method).observe(elapsed)
+            metrics.requests.labels(route, method, str(status)).inc()
+
+
+# Singleton instance
+_metrics: Optional[EngineMetrics] = None
+
+
+def get_metrics() -> EngineMetrics:
+    """Get singleton metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = EngineMetrics()
+    return _metrics
@@ -3,6 +3,11 @@ from .schemas import (
     RiskLevel,
     QuoteRequest,
     QuoteResponse,
+    QuoteBatchItem,
+    QuoteBatchResponse,
+    SweepRange,
+    QuoteSweepRequest,
+    QuoteSweepResponse,
     RiskAssessment,
     HealthResponse,
 )
@@ -12,6 +17,11 @@ __all__ = [
     "RiskLevel",
     "QuoteRequest",
     "QuoteResponse",
+    "QuoteBatchItem",
+    "QuoteBatchResponse",
+    "SweepRange",
+    "QuoteSweepRequest",
+    "QuoteSweepResponse",
     "RiskAssessment",
     "HealthResponse",
 ]
@@ -0,0 +1,150 @@
+"""
+Memory-mappable model artifacts for GuardQuote.
+Exports compiled tree arrays, scalers and encoders as .npy files plus a JSON
+manifest. Loading memory-maps them read-only, so every worker process on a
+host shares one page-cache copy instead of unpickling its own.
+
+Usage:
+    python -m src.models.artifact_store models/trained/guardquote_models.pkl \\
+        models/trained/guardquote_models
+"""
+import json
+import os
+import pickle
+import sys
+from datetime import datetime
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from .tree_engine import COMPILED_KINDS, FlatForest, compile_model
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 1
+
+SERVED_MODELS = ('price_model', 'risk_model')
+SCALERS = ('price_scaler', 'risk_scaler', 'accept_scaler')
+SCALER_FIELDS = ('mean_', 'scale_', 'var_')
+METADATA_KEYS = ('price_model_name', 'price_features', 'risk_features', 'accept_features')
+
+
+def _save(out_dir: str, name: str, array: np.ndarray) -> str:
+    filename = f"{name}.npy"
+    np.save(os.path.join(out_dir, filename), np.ascontiguousarray(array), allow_pickle=False)
+    return filename
+
+
+def export_artifacts(artifacts: dict, out_dir: str) -> str:
+    """Write artifacts from train_models.save_models as .npy files + manifest.
+
+    Only the served tree ensembles, the scalers and the encoders are exported;
+    the acceptance model is not used at inference time.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'exported_at': datetime.now().isoformat(),
+        'trained_at': str(artifacts.get('trained_at', 'Unknown')),
+        'models': {},
+        'scalers': {},
+        'encoders': {},
+    }
+    for key in METADATA_KEYS:
+        if key in artifacts:
+            manifest[key] = artifacts[key]
+
+    for key in SERVED_MODELS:
+        compiled = compile_model(artifacts[key])
+        if compiled is None:
+            raise ValueError(
+                f"{key} ({type(artifacts[key]).__name__}) is not a supported tree ensemble"
+            )
+        arrays = {**compiled.forest.arrays(), **compiled.extra_arrays()}
+        manifest['models'][key] = {
+            'kind': compiled.kind,
+            'max_depth': compiled.forest.max_depth,
+            'params': compiled.params(),
+            'arrays': {name: _save(out_dir, f"{key}.{name}", array)
+                       for name, array in arrays.items()},
+        }
+
+    for key in SCALERS:
+        scaler = artifacts.get(key)
+        if scaler is None:
+            continue
+        manifest['scalers'][key] = {
+            field: _save(out_dir, f"{key}.{field}", getattr(scaler, field))
+            for field in SCALER_FIELDS
+            if getattr(scaler, field, None) is not None
+        }
+
+    for name, encoder in (artifacts.get('encoders') or {}).items():
+        classes = np.asarray([str(c) for c in encoder.classes_], dtype=str)
+        manifest['encoders'][name] = _save(out_dir, f"encoder.{name}", classes)
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+def is_exported(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def load_exported(path: str, mmap: bool = True) -> dict:
+    """Load an exported directory into the same dict layout as the pickle.
+
+    Models come back as compiled tree_engine objects backed by read-only
+    memory maps (or in-memory arrays with ``mmap=False``).
+    """
+    with open(os.path.join(path, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format: {manifest.get('format_version')}")
+
+    mmap_mode = 'r' if mmap else None
+
+    def load(filename: str) -> np.ndarray:
+        return np.load(os.path.join(path, filename), mmap_mode=mmap_mode, allow_pickle=False)
+
+    artifacts = {key: manifest[key] for key in METADATA_KEYS if key in manifest}
+    artifacts['trained_at'] = manifest['trained_at']
+
+    for key, spec in manifest['models'].items():
+        arrays = {name: load(filename) for name, filename in spec['arrays'].items()}
+        forest = FlatForest(
+            max_depth=spec['max_depth'],
+            **{name: arrays.pop(name) for name in FlatForest.ARRAY_FIELDS},
+        )
+        compiled_cls = COMPILED_KINDS[spec['kind']]
+        artifacts[key] = compiled_cls(forest, **arrays, **spec['params'])
+
+    for key, fields in manifest['scalers'].items():
+        scaler = StandardScaler()
+        for field, filename in fields.items():
+            setattr(scaler, field, load(filename))
+        scaler.n_features_in_ = len(scaler.mean_)
+        artifacts[key] = scaler
+
+    artifacts['encoders'] = {}
+    for name, filename in manifest['encoders'].items():
+        encoder = LabelEncoder()
+        encoder.classes_ = load(filename)
+        artifacts['encoders'][name] = encoder
+
+    return artifacts
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m src.models.artifact_store <models.pkl> <out_dir>")
+    source, out_dir = sys.argv[1:]
+    with open(source, 'rb') as f:
+        artifacts = pickle.load(f)
+    export_artifacts(artifacts, out_dir)
+    size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in os.listdir(out_dir))
+    print(f"✓ Exported {source} -> {out_dir} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
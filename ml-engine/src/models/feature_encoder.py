@@ -0,0 +1,269 @@
+"""
+Feature encoder for GuardQuote model inference.
+Built once from the training artifacts so serving encodes exactly like training.
+"""
+from datetime import datetime
+from operator import itemgetter
+from typing import Mapping, Optional, Sequence
+import numpy as np
+
+from .pricing_engine import TRAINING_EVENT_TYPES
+
+# Vocabularies used before encoders were persisted with the models
+DEFAULT_VOCABULARIES = {
+    'event_type': ['concert', 'construction', 'corporate', 'private', 'residential', 'retail', 'sports'],
+    'state': ['AZ', 'CA', 'CO', 'FL', 'GA', 'IL', 'MA', 'NV', 'NY', 'TX', 'WA'],
+    'risk_zone': ['critical', 'high', 'low', 'medium'],
+}
+
+# API event type -> the 2026 training class serving encodes it as, when the
+# model's vocabulary lacks the API name: the inverse of TRAINING_EVENT_TYPES,
+# first listed class winning (private -> social_wedding). "residential" has
+# no 2026 counterpart and gets the default label.
+EVENT_TYPE_ALIASES = {api: training for training, api in reversed(TRAINING_EVENT_TYPES.items())}
+
+# Label used when a request value was never seen in training; it must be in
+# the vocabulary (directly or through an alias)
+DEFAULT_LABELS = {
+    'event_type': 'private',
+    'state': 'CA',
+    'risk_zone': 'medium',
+}
+
+DEFAULT_PRICE_FEATURES = [
+    'event_type_encoded', 'state_encoded', 'risk_zone_encoded', 'zip_region',
+    'num_guards', 'hours_per_guard', 'total_guard_hours', 'crowd_size',
+    'day_of_week', 'hour_of_day', 'month',
+    'is_weekend', 'is_night_shift', 'is_armed', 'has_vehicle'
+]
+
+DEFAULT_RISK_FEATURES = [
+    'event_type_encoded', 'state_encoded', 'zip_region',
+    'num_guards', 'hours_per_guard', 'crowd_size',
+    'day_of_week', 'hour_of_day', 'month',
+    'is_weekend', 'is_night_shift', 'is_armed'
+]
+
+# Every feature name the encoder can produce, in _raw_row order
+SUPPORTED_FEATURES = (
+    'event_type_encoded', 'state_encoded', 'risk_zone_encoded', 'zip_region',
+    'num_guards', 'hours_per_guard', 'total_guard_hours', 'crowd_size',
+    'day_of_week', 'hour_of_day', 'month',
+    'is_weekend', 'is_night_shift', 'is_armed', 'has_vehicle',
+)
+
+DEFAULT_ZIP_REGION = 900
+
+
+def zip_region(zip_code: str) -> int:
+    """First three ZIP digits, as computed by train_models.preprocess_features."""
+    return int(zip_code[:3]) if zip_code else DEFAULT_ZIP_REGION
+
+
+class CategoryTable:
+    """Label -> code lookup table matching a fitted LabelEncoder.
+
+    ``aliases`` map labels missing from ``classes`` onto ones that are there.
+    Raises ValueError if ``default_label`` resolves to neither.
+    """
+
+    def __init__(self, classes: Sequence[str], default_label: str, normalize,
+                 aliases: Optional[Mapping[str, str]] = None):
+        self.classes = [str(c) for c in classes]
+        self.codes = {normalize(label): code for code, label in enumerate(self.classes)}
+        for label, target in (aliases or {}).items():
+            if normalize(label) not in self.codes and normalize(target) in self.codes:
+                self.codes[normalize(label)] = self.codes[normalize(target)]
+        if normalize(default_label) not in self.codes:
+            raise ValueError(
+                f"Default label {default_label!r} is not in the model vocabulary {self.classes}"
+            )
+        self.default = self.codes[normalize(default_label)]
+        self.normalize = normalize
+
+    def code(self, label: str) -> int:
+        return self.codes.get(self.normalize(label), self.default)
+
+    def codes_for(self, labels: Sequence[str]) -> np.ndarray:
+        codes, default, normalize = self.codes, self.default, self.normalize
+        return np.fromiter(
+            (codes.get(normalize(label), default) for label in labels),
+            dtype=np.float64, count=len(labels),
+        )
+
+
+class FeatureEncoder:
+    """Encodes quote inputs into float64 matrices in training column order."""
+
+    def __init__(
+        self,
+        vocabularies: Mapping[str, Sequence[str]],
+        price_features: Sequence[str],
+        risk_features: Sequence[str],
+    ):
+        self.tables = {
+            'event_type': CategoryTable(
+                vocabularies['event_type'], DEFAULT_LABELS['event_type'], str.lower,
+                EVENT_TYPE_ALIASES),
+            'state': CategoryTable(
+                vocabularies['state'], DEFAULT_LABELS['state'], str.upper),
+            'risk_zone': CategoryTable(
+                vocabularies['risk_zone'], DEFAULT_LABELS['risk_zone'], str.lower),
+        }
+        self.price_features = list(price_features)
+        self.risk_features = list(risk_features)
+
+        unknown = [
+            f for f in self.price_features + self.risk_features if f not in SUPPORTED_FEATURES
+        ]
+        if unknown:
+            raise ValueError(f"Unsupported model features: {unknown}")
+
+        # Single-row fast path: pick training columns straight out of _raw_row
+        self._price_getter = self._row_getter(self.price_features)
+        self._risk_getter = self._row_getter(self.risk_features)
+
+    @staticmethod
+    def _row_getter(features: Sequence[str]):
+        indices = [SUPPORTED_FEATURES.index(f) for f in features]
+        getter = itemgetter(*indices)
+        if len(indices) == 1:
+            return lambda row: (getter(row),)
+        return getter
+
+    @classmethod
+    def from_artifacts(cls, artifacts: Mapping) -> "FeatureEncoder":
+        """Build from the dict saved by train_models.save_models."""
+        encoders = artifacts.get('encoders') or {}
+        vocabularies = {
+            name: list(encoders[name].classes_) if name in encoders else default
+            for name, default in DEFAULT_VOCABULARIES.items()
+        }
+        return cls(
+            vocabularies,
+            artifacts.get('price_features') or DEFAULT_PRICE_FEATURES,
+            artifacts.get('risk_features') or DEFAULT_RISK_FEATURES,
+        )
+
+    @staticmethod
+    def _feature_values(cols: Mapping) -> dict:
+        """Every training feature, derived from raw column arrays."""
+        hour = cols['hour_of_day']
+        return {
+            'event_type_encoded': cols['event_type_encoded'],
+            'state_encoded': cols['state_encoded'],
+            'risk_zone_encoded': cols['risk_zone_encoded'],
+            'zip_region': cols['zip_region'],
+            'num_guards': cols['num_guards'],
+            'hours_per_guard': cols['hours'],
+            'total_guard_hours': cols['num_guards'] * cols['hours'],
+            'crowd_size': cols['crowd_size'],
+            'day_of_week': cols['day_of_week'],
+            'hour_of_day': hour,
+            'month': cols['month'],
+            'is_weekend': cols['day_of_week'] >= 5,
+            'is_night_shift': (hour >= 22) | (hour < 6),
+            'is_armed': cols['is_armed'],
+            'has_vehicle': cols['has_vehicle'],
+        }
+
+    def encode_one(
+        self,
+        event_type: str,
+        state: str,
+        zip_code: str,
+        risk_zone: str,
+        num_guards: int,
+        hours: float,
+        crowd_size: int,
+        event_date: datetime,
+        is_armed: bool = False,
+        has_vehicle: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Encode a single quote into 1-row price and risk matrices."""
+        day_of_week = event_date.weekday()
+        hour = event_date.hour
+        row = (
+            self.tables['event_type'].code(event_type),
+            self.tables['state'].code(state),
+            self.tables['risk_zone'].code(risk_zone),
+            zip_region(zip_code),
+            num_guards,
+            hours,
+            num_guards * hours,
+            crowd_size,
+            day_of_week,
+            hour,
+            event_date.month,
+            day_of_week >= 5,
+            hour >= 22 or hour < 6,
+            is_armed,
+            has_vehicle,
+        )
+        return (
+            np.array([self._price_getter(row)], dtype=np.float64),
+            np.array([self._risk_getter(row)], dtype=np.float64),
+        )
+
+    def columns_for(self, items: Sequence[Mapping]) -> dict:
+        """Turn predictor keyword-argument dicts into raw column arrays."""
+        n = len(items)
+        dates = [item['event_date'] for item in items]
+        return {
+            'event_type': [item['event_type'] for item in items],
+            'state': [item['state'] for item in items],
+            'risk_zone': [item['risk_zone'] for item in items],
+            'zip_region': np.fromiter(
+                (zip_region(item['zip_code']) for item in items), dtype=np.float64, count=n),
+            'num_guards': np.fromiter(
+                (item['num_guards'] for item in items), dtype=np.float64, count=n),
+            'hours': np.fromiter((item['hours'] for item in items), dtype=np.float64, count=n),
+            'crowd_size': np.fromiter(
+                (item['crowd_size'] for item in items), dtype=np.float64, count=n),
+            'day_of_week': np.fromiter((d.weekday() for d in dates), dtype=np.float64, count=n),
+            'hour_of_day': np.fromiter((d.hour for d in dates), dtype=np.float64, count=n),
+            'month': np.fromiter((d.month for d in dates), dtype=np.float64, count=n),
+            'is_armed': np.fromiter(
+                (bool(item.get('is_armed', False)) for item in items), dtype=np.float64, count=n),
+            'has_vehicle': np.fromiter(
+                (bool(item.get('has_vehicle', False)) for item in items), dtype=np.float64, count=n),
+        }
+
+    def encode(self, columns: Mapping) -> tuple[np.ndarray, np.ndarray]:
+        """Encode a column batch into contiguous price and risk matrices.
+
+        ``columns`` holds equal-length sequences keyed by ``event_type``,
+        ``state``, ``risk_zone``, ``zip_region``, ``num_guards``, ``hours``,
+        ``crowd_size``, ``day_of_week``, ``hour_of_day``, ``month``,
+        ``is_armed`` and ``has_vehicle``.
+        """
+        cols = {
+            name: np.asarray(columns[name], dtype=np.float64)
+            for name in (
+                'zip_region', 'num_guards', 'hours', 'crowd_size', 'day_of_week',
+                'hour_of_day', 'month', 'is_armed', 'has_vehicle',
+            )
+        }
+        cols['event_type_encoded'] = self.tables['event_type'].codes_for(columns['event_type'])
+        cols['state_encoded'] = self.tables['state'].codes_for(columns['state'])
+        cols['risk_zone_encoded'] = self.tables['risk_zone'].codes_for(columns['risk_zone'])
+        values = self._feature_values(cols)
+        return self._matrix(values, self.price_features), self._matrix(values, self.risk_features)
+
+    @staticmethod
+    def _matrix(values: Mapping, features: Sequence[str]) -> np.ndarray:
+        first = values[features[0]]
+        matrix = np.empty((len(first), len(features)), dtype=np.float64)
+        for j, name in enumerate(features):
+            matrix[:, j] = values[name]
+        return matrix
+
+    def encode_items(self, items: Sequence[Mapping]) -> tuple[np.ndarray, np.ndarray]:
+        """Encode a list of predictor keyword-argument dicts."""
+        return self.encode(self.columns_for(items))
+
+    @staticmethod
+    def check_item(item: Mapping) -> None:
+        """Raise if a single item cannot be encoded."""
+        zip_region(item['zip_code'])
+        item['event_date'].weekday()
@@ -0,0 +1,310 @@
+"""
+Budgeted hyperparameter search for the GuardQuote training pipeline.
+Successive halving over sampled configurations: each rung fits the
+surviving configurations on cached CV folds with a growing share of the
+training rows and keeps the best 1/ETA, until a wall-clock or CPU-seconds
+budget runs out. Configurations are ranked on accuracy and single-row
+serving latency together.
+
+Run through train_models.py:
+    python scripts/train_models.py --source data.csv --search-budget 600
+    python scripts/train_models.py --search-budget 3600 --search-clock cpu --jobs 8
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.model_selection import KFold
+
+from .tree_engine import compile_model
+
+ETA = 3
+SEARCH_FOLDS = 3
+MIN_ROWS = 200
+DEFAULT_TRIALS = 27
+
+# R² (or accuracy) given up per doubling of single-row latency
+DEFAULT_LATENCY_WEIGHT = 0.01
+
+LATENCY_ROWS = 100
+
+
+class SearchFamily(NamedTuple):
+    key: tuple  # ('price', 'Random Forest')
+    estimator: object  # baseline configuration, always trial 0
+    space: dict  # parameter -> candidate values
+    features: list
+    target: str
+
+
+class SearchData(NamedTuple):
+    """Feature matrix, target and CV folds, built once and shared by every trial."""
+    X: np.ndarray
+    y: np.ndarray
+    folds: list  # (shuffled train rows, test rows) per fold
+
+
+class Trial(NamedTuple):
+    family: tuple
+    trial: int
+    params: dict
+    fold: int
+    rows: int
+
+
+class TrialResult(NamedTuple):
+    family: tuple
+    trial: int
+    fold: int
+    score: float
+    latency_us: float | None
+    cpu_seconds: float
+
+
+class Budget:
+    """Wall-clock or CPU-seconds budget; CPU time of worker fits is charged in."""
+
+    def __init__(self, seconds: float, clock: str = "wall"):
+        if clock not in ("wall", "cpu"):
+            raise ValueError(f"clock must be 'wall' or 'cpu', got {clock!r}")
+        self.seconds = seconds
+        self.clock = clock
+        self._wall = time.perf_counter()
+        self._charged = 0.0
+
+    def charge(self, cpu_seconds: float):
+        self._charged += cpu_seconds
+
+    def used(self) -> float:
+        if self.clock == "wall":
+            return time.perf_counter() - self._wall
+        return self._charged
+
+    def exhausted(self) -> bool:
+        return self.used() >= self.seconds
+
+
+def build_search_data(data, features, target, rows, X=None) -> SearchData:
+    """Cache the float32 matrix and fold splits of ``rows`` for all trials.
+
+    ``X``, a prebuilt (e.g. memory-mapped) matrix of ``features``, is used as is.
+    """
+    if X is None:
+        X = np.ascontiguousarray(data[features].to_numpy(dtype=np.float32))
+    y = data[target].to_numpy()
+    if y.dtype == bool:
+        y = y.astype(int)
+    rng = np.random.default_rng(42)
+    folds = []
+    for train, test in KFold(SEARCH_FOLDS, shuffle=True, random_state=42).split(rows):
+        # Shuffled once, so every rung's subsample is a prefix of the next
+        folds.append((rows[rng.permutation(train)], rows[test]))
+    return SearchData(X, y, folds)
+
+
+def sample_configurations(family: SearchFamily, count: int, seed: int = 42) -> list[dict]:
+    """The baseline ({}) plus up to ``count - 1`` distinct grid points."""
+    names = sorted(family.space)
+    grid = math.prod(len(family.space[name]) for name in names)
+    rng = random.Random(seed)
+    chosen = [{}]
+    seen = set()
+    while len(chosen) < min(count, grid + 1):
+        point = tuple(rng.choice(family.space[name]) for name in names)
+        if point in seen:
+            continue
+        seen.add(point)
+        chosen.append(dict(zip(names, point)))
+    return chosen
+
+
+def measure_latency_us(model, X: np.ndarray) -> float:
+    """Median single-row predict time of the model as served (compiled if possible)."""
+    served = compile_model(model) or model
+    predict = getattr(served, 'predict_proba', None) or served.predict
+    timings = []
+    for row in X[:LATENCY_ROWS]:
+        start = time.perf_counter()
+        predict(row[np.newaxis, :])
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+
+_families: dict = {}
+_search_data: dict = {}
+
+
+def _init_worker(families, search_data):
+    """Hold the cached matrices once per process; trials carry only indices."""
+    global _families, _search_data
+    _families = families
+    _search_data = search_data
+
+
+def _run_trial(trial: Trial) -> TrialResult:
+    start = time.process_time()
+    family = _families[trial.family]
+    data = _search_data[(tuple(family.features), family.target)]
+    train, test = data.folds[trial.fold]
+    train = train[:trial.rows]
+
+    model = clone(family.estimator).set_params(**trial.params)
+    model.fit(data.X[train], data.y[train])
+    predicted = model.predict(data.X[test])
+    if np.issubdtype(data.y.dtype, np.floating):
+        score = r2_score(data.y[test], predicted)
+    else:
+        score = accuracy_score(data.y[test], predicted)
+
+    latency = measure_latency_us(model, data.X[test]) if trial.fold == 0 else None
+    return TrialResult(trial.family, trial.trial, trial.fold, float(score), latency,
+                       time.process_time() - start)
+
+
+def objective(score: float, latency_us: float, baseline_latency_us: float,
+              latency_weight: float = DEFAULT_LATENCY_WEIGHT) -> float:
+    """Score minus ``latency_weight`` per doubling of latency over the baseline."""
+    return score - latency_weight * math.log2(latency_us / baseline_latency_us)
+
+
+def rung_sizes(n_rows: int, n_trials: int) -> list[int]:
+    """Training rows per rung: grows by ETA up to all rows, floored at MIN_ROWS."""
+    rungs = max(1, math.ceil(math.log(max(n_trials, 1), ETA)) + 1)
+    sizes = []
+    for rung in range(rungs):
+        rows = min(n_rows, max(MIN_ROWS, int(n_rows / ETA ** (rungs - 1 - rung))))
+        if not sizes or rows > sizes[-1]:
+            sizes.append(rows)
+    return sizes
+
+
+def _run_rung(trials, pool, budget):
+    """Results of ``trials``; stops early (dropping the rest) once the budget is spent."""
+    results = []
+    if pool is None:
+        for trial in trials:
+            if budget.exhausted():
+                break
+            result = _run_trial(trial)
+            budget.charge(result.cpu_seconds)
+            results.append(result)
+        return results
+
+    futures = [pool.submit(_run_trial, trial) for trial in trials]
+    for future in as_completed(futures):
+        result = future.result()
+        budget.charge(result.cpu_seconds)
+        results.append(result)
+        if budget.exhausted():
+            for pending in futures:
+                pending.cancel()
+            break
+    return results
+
+
+def successive_halving(families: list[SearchFamily], data, rows, budget: Budget,
+                       n_trials: int = DEFAULT_TRIALS, jobs: int = 1,
+                       latency_weight: float = DEFAULT_LATENCY_WEIGHT, log=print,
+                       matrices=None) -> dict:
+    """Best parameters per family (``{}`` keeps the baseline); searches families together.
+
+    ``matrices`` maps a tuple of feature columns to a prebuilt float32 matrix.
+    """
+    matrices = matrices or {}
+    search_data = {}
+    for family in families:
+        key = (tuple(family.features), family.target)
+        if key not in search_data:
+            search_data[key] = build_search_data(data, family.features, family.target, rows,
+                                                 matrices.get(key[0]))
+    by_key = {family.key: family for family in families}
+
+    survivors = {family.key: dict(enumerate(sample_configurations(family, n_trials)))
+                 for family in families}
+    best = {family.key: ({}, None) for family in families}
+    n_fold_rows = min(len(train) for cached in search_data.values() for train, _ in cached.folds)
+
+    pool = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                   initargs=(by_key, search_data))
+    else:
+        _init_worker(by_key, search_data)
+
+    try:
+        for rung, rows_per_fold in enumerate(rung_sizes(n_fold_rows, n_trials)):
+            # Best-ranked first and interleaved across families, so a spent
+            # budget cuts off the least promising configurations evenly
+            position = {key: {trial: i for i, trial in enumerate(configurations)}
+                        for key, configurations in survivors.items()}
+            trials = sorted(
+                (Trial(key, trial, params, fold, rows_per_fold)
+                 for key, configurations in survivors.items()
+                 for trial, params in configurations.items()
+                 for fold in range(SEARCH_FOLDS)),
+                key=lambda trial: (position[trial.family][trial.trial], trial.fold),
+            )
+            if not trials or budget.exhausted():
+                break
+            results = _run_rung(trials, pool, budget)
+
+            for key, configurations in list(survivors.items()):
+                ranked = _rank(key, configurations, results, latency_weight)
+                if not ranked:
+                    continue
+                best[key] = (configurations[ranked[0][1]], ranked[0])
+                keep = {trial for _, trial, _, _ in ranked[:max(1, len(ranked) // ETA)]}
+                if len(keep) == 1 and len(ranked) <= ETA:
+                    survivors.pop(key)
+                else:
+                    # Rank order, led by the defaults as the latency reference
+                    order = [0] + [trial for _, trial, _, _ in ranked if trial in keep]
+                    survivors[key] = {trial: configurations[trial]
+                                      for trial in dict.fromkeys(order) if trial in configurations}
+                log(f"  {' '.join(key):<28} rung {rung} ({rows_per_fold} rows): "
+                    f"{len(ranked)} -> {len(survivors.get(key, {}))} configurations, "
+                    f"{budget.used():.1f}s of {budget.seconds:.0f}s {budget.clock} budget")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    chosen = {}
+    for key, (params, ranked) in best.items():
+        chosen[key] = params
+        if ranked is None:
+            log(f"  {' '.join(key)}: budget spent before a full rung, keeping defaults")
+            continue
+        value, _, score, latency = ranked
+        log(f"  ✓ {' '.join(key)}: {params or 'defaults'} "
+            f"(score {score:.4f}, {latency:.0f} µs/row, objective {value:.4f})")
+    return chosen
+
+
+def _rank(key, configurations, results, latency_weight):
+    """(objective, trial, mean score, latency) for trials with every fold, best first."""
+    scores: dict = {}
+    latencies: dict = {}
+    for result in results:
+        if result.family != key:
+            continue
+        scores.setdefault(result.trial, []).append(result.score)
+        if result.latency_us is not None:
+            latencies[result.trial] = result.latency_us
+
+    complete = [trial for trial in configurations
+                if len(scores.get(trial, ())) == SEARCH_FOLDS and trial in latencies]
+    if not complete:
+        return []
+    # Trial 0 (the defaults) sets the latency reference unless the budget cut it off
+    reference = latencies.get(0, min(latencies[trial] for trial in complete))
+    ranked = [
+        (objective(float(np.mean(scores[trial])), latencies[trial], reference, latency_weight),
+         trial, float(np.mean(scores[trial])), latencies[trial])
+        for trial in complete
+    ]
+    return sorted(ranked, key=lambda entry: (-entry[0], entry[1]))
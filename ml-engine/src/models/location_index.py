@@ -0,0 +1,175 @@
+"""
+ZIP lookup index for GuardQuote quotes.
+Resolves a request ZIP to state, risk zone and rate modifier from an
+in-memory table built once from the 2026 location seed data, so the hot
+path never queries the database.
+"""
+import ast
+import hashlib
+import os
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from .feature_encoder import DEFAULT_LABELS
+
+ENGINE_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+
+# Applied in order: the backend's base locations (absent when the engine is
+# deployed on its own), the generator table, then the 2026 seed upserts
+LOCATION_SOURCES = (
+    os.path.join(ENGINE_DIR, "..", "backend", "src", "db", "schema.sql"),
+    os.path.join(ENGINE_DIR, "scripts", "generate_training_data_2026.py"),
+    os.path.join(ENGINE_DIR, "data", "seed_2026.sql"),
+)
+
+_INSERT_BLOCK = re.compile(
+    r"INSERT INTO locations\s*\(([^)]*)\)\s*VALUES(.*?)(?:ON CONFLICT|;)", re.S | re.I
+)
+_ROW = re.compile(r"\(((?:'(?:[^']|'')*'|[^'()])*)\)")
+_VALUE = re.compile(r"'(?:[^']|'')*'|[-\d.]+")
+_COMMENT = re.compile(r"--[^\n]*")
+_UPDATE = re.compile(
+    r"UPDATE locations SET (.*?) WHERE zip_code\s*=\s*'(\d{5})'\s*;", re.I
+)
+_ASSIGNMENT = re.compile(r"(\w+)\s*=\s*('[^']*'|[\d.]+)")
+
+
+class Location(NamedTuple):
+    zip_code: str
+    city: str
+    state: str
+    risk_zone: str
+    rate_modifier: float
+
+
+# Used when neither the ZIP nor its 3-digit prefix is known (as in the backend)
+UNKNOWN_LOCATION = Location(
+    "", "Unknown", DEFAULT_LABELS['state'], DEFAULT_LABELS['risk_zone'], 1.0
+)
+
+
+class LocationIndex:
+    """ZIP5 -> Location, falling back to the first listed ZIP with the same ZIP3."""
+
+    def __init__(self, locations: Iterable[Location]):
+        self.by_zip5: dict[str, Location] = {}
+        for location in locations:
+            self.by_zip5[location.zip_code] = location
+        self.by_zip3: dict[str, Location] = {}
+        for zip_code, location in self.by_zip5.items():
+            self.by_zip3.setdefault(zip_code[:3], location)
+
+    def __len__(self) -> int:
+        return len(self.by_zip5)
+
+    def digest(self) -> str:
+        """sha256 of the indexed locations in index order, which ZIP fallbacks depend on."""
+        digest = hashlib.sha256()
+        for location in self.by_zip5.values():
+            digest.update(repr(tuple(location)).encode())
+        return digest.hexdigest()
+
+    def resolve(self, zip_code: str) -> Location:
+        """Location for a ZIP or ZIP+4; UNKNOWN_LOCATION when not indexed."""
+        return (
+            self.by_zip5.get(zip_code[:5])
+            or self.by_zip3.get(zip_code[:3])
+            or UNKNOWN_LOCATION
+        )
+
+
+def _sql_value(token: str):
+    token = token.strip()
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    return float(token)
+
+
+def parse_seed_sql(text: str) -> list[Location]:
+    """Locations from ``INSERT INTO locations`` rows, then later ``UPDATE``s applied.
+
+    UPDATEs of ZIPs not inserted in this file are returned as partial rows
+    (empty city/state) for the caller to merge onto an earlier source.
+    """
+    text = _COMMENT.sub("", text)
+    rows: dict[str, dict] = {}
+    for columns, values in _INSERT_BLOCK.findall(text):
+        names = [name.strip() for name in columns.split(",")]
+        for row in _ROW.findall(values):
+            record = dict(zip(names, map(_sql_value, _VALUE.findall(row))))
+            if 'base_multiplier' in record:
+                record.setdefault('rate_modifier', record.pop('base_multiplier'))
+            rows[record['zip_code']] = record
+    for assignments, zip_code in _UPDATE.findall(text):
+        record = rows.setdefault(zip_code, {'zip_code': zip_code})
+        record.update(
+            (name, _sql_value(value)) for name, value in _ASSIGNMENT.findall(assignments)
+        )
+    return [
+        Location(
+            record['zip_code'], record.get('city', ""), record.get('state', ""),
+            record.get('risk_zone', ""), float(record.get('rate_modifier', 0.0)),
+        )
+        for record in rows.values()
+    ]
+
+
+def parse_generator_locations(source: str) -> list[Location]:
+    """The LOCATIONS_2026 table of generate_training_data_2026.py, without importing it."""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == 'LOCATIONS_2026'
+            for target in node.targets
+        ):
+            return [
+                Location(zip_code, city, state, risk_zone, float(multiplier))
+                for zip_code, city, state, _, _, risk_zone, multiplier
+                in ast.literal_eval(node.value)
+            ]
+    return []
+
+
+def merge_locations(*sources: Iterable[Location]) -> list[Location]:
+    """Later sources win field by field; empty fields keep the earlier value."""
+    merged: dict[str, Location] = {}
+    for source in sources:
+        for location in source:
+            earlier = merged.get(location.zip_code)
+            if earlier is not None:
+                location = Location(*(new or old for new, old in zip(location, earlier)))
+            merged[location.zip_code] = location
+    return [location for location in merged.values() if location.state]
+
+
+def load_location_index(paths: Iterable[str] = LOCATION_SOURCES) -> LocationIndex:
+    """Build the index from the SQL and generator sources that exist, in order."""
+    sources = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        parse = parse_generator_locations if path.endswith(".py") else parse_seed_sql
+        with open(path) as f:
+            sources.append(parse(f.read()))
+    return LocationIndex(merge_locations(*sources))
+
+
+# Singleton instance
+_index: Optional[LocationIndex] = None
+
+
+def get_location_index() -> LocationIndex:
+    """Get the location index, building it on first use."""
+    global _index
+    if _index is None:
+        _index = load_location_index()
+    return _index
+
+
+def reload_location_index(index: Optional[LocationIndex] = None) -> LocationIndex:
+    """Swap in ``index`` (or a freshly loaded one) with one reference assignment.
+
+    Lookups in flight keep the index they started with; no lock is needed.
+    """
+    global _index
+    _index = index if index is not None else load_location_index()
+    return _index
@@ -0,0 +1,104 @@
+"""
+In-process LRU + TTL cache for model outputs.
+Keyed on encoded feature vectors, so requests that encode identically share an entry.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+
+def _sizeof(value: Any) -> int:
+    """Bytes held by a cached key or value, including numpy data buffers."""
+    if isinstance(value, np.ndarray):
+        # getsizeof() counts an owned buffer but not the one a view points into
+        return sys.getsizeof(value) + (value.nbytes if value.base is not None else 0)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    ``max_entries=0`` disables caching entirely.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.memory_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: bytes) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.memory_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: Any):
+        if not self.enabled:
+            return
+        size = _sizeof(key) + _sizeof(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous[2]
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, size)
+            self.memory_bytes += size
+            while len(self._entries) > self.max_entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def reset_stats(self):
+        """Zero the hit, miss, eviction and expiration counters."""
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "memory_bytes": self.memory_bytes,
+            }
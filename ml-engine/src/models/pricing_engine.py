@@ -2,10 +2,27 @@ import numpy as np
 from datetime import datetime
 from ..models.schemas import EventType, RiskLevel, QuoteRequest, QuoteResponse, RiskAssessment
 
+# 2026 training event types -> closest event type the public API accepts
+TRAINING_EVENT_TYPES = {
+    'concert': 'concert',
+    'music_festival': 'concert',
+    'corporate': 'corporate',
+    'tech_summit': 'corporate',
+    'sports': 'sports',
+    'gov_rally': 'sports',
+    'retail_lp': 'retail',
+    'industrial': 'construction',
+    'social_wedding': 'private',
+    'vip_protection': 'private',
+}
+
 
 class PricingEngine:
     """ML-based pricing engine for security guard quotes."""
 
+    # Reported as the model version on quotes served by the rules
+    MODEL_VERSION = "rule-based"
+
     # Base hourly rates by event type
     BASE_RATES = {
         EventType.CORPORATE: 35.0,
@@ -28,6 +45,13 @@ class PricingEngine:
         EventType.RESIDENTIAL: 0.25,
     }
 
+    # Upper bounds (exclusive) of the low/medium/high risk levels
+    RISK_LEVEL_BOUNDS = (0.25, 0.5, 0.75)
+    RISK_LEVEL_NAMES = np.array(
+        [RiskLevel.LOW.value, RiskLevel.MEDIUM.value, RiskLevel.HIGH.value,
+         RiskLevel.CRITICAL.value]
+    )
+
     def __init__(self):
         self.model_loaded = True
 
@@ -78,6 +102,10 @@ class PricingEngine:
 
     def calculate_quote(self, request: QuoteRequest) -> QuoteResponse:
         """Generate a quote based on the request parameters."""
+        return QuoteResponse(**self.calculate_quote_payload(request))
+
+    def calculate_quote_payload(self, request: QuoteRequest) -> dict:
+        """``calculate_quote`` as a plain JSON-ready dict, without building the model."""
         base_rate = self.BASE_RATES[request.event_type]
         risk_score, factors = self.calculate_risk_score(request)
         risk_level = self.get_risk_level(risk_score)
@@ -110,14 +138,67 @@ class PricingEngine:
             "risk_factors": factors,
         }
 
-        return QuoteResponse(
-            base_price=labor_cost,
-            risk_multiplier=risk_multiplier,
-            final_price=round(final_price, 2),
-            risk_level=risk_level,
-            confidence_score=confidence,
-            breakdown=breakdown,
-        )
+        return {
+            'base_price': labor_cost,
+            'risk_multiplier': risk_multiplier,
+            'final_price': round(final_price, 2),
+            'risk_level': risk_level.value,
+            'confidence_score': confidence,
+            'breakdown': breakdown,
+            'model_version': self.MODEL_VERSION,
+        }
+
+    def calculate_quotes_batch(self, columns) -> dict[str, np.ndarray]:
+        """Price many requests at once with NumPy; same numbers as calculate_quote.
+
+        ``columns`` is a DataFrame or a mapping of QuoteRequest field names
+        (event_type, date, num_guards, hours, crowd_size, is_armed,
+        requires_vehicle) to equal-length arrays. Every term is added in
+        the same order as the scalar path, so results match it exactly.
+        Returns one array per QuoteResponse number plus the risk score.
+        """
+        event_types = np.asarray(columns['event_type'], dtype=object)
+        n = len(event_types)
+        num_guards = np.asarray(columns['num_guards'], dtype=np.int64)
+        hours = np.asarray(columns['hours'], dtype=np.float64)
+        crowd_size = _optional_column(columns, 'crowd_size', n, np.int64, 0)
+        is_armed = _optional_column(columns, 'is_armed', n, bool, False)
+        requires_vehicle = _optional_column(columns, 'requires_vehicle', n, bool, False)
+        hour, weekday = _hour_and_weekday(columns['date'])
+
+        kinds = list(EventType)
+        codes = _event_type_codes(event_types, kinds)
+        base_rate = np.array([self.BASE_RATES[kind] for kind in kinds])[codes]
+        score = np.array([self.EVENT_RISK_WEIGHTS[kind] for kind in kinds])[codes]
+
+        # Same additions, in the same order, as calculate_risk_score
+        score = score + np.where((hour >= 22) | (hour < 6), 0.15, 0.0)
+        score = score + np.where(weekday >= 5, 0.1, 0.0)
+        score = score + np.where(crowd_size > 0, np.minimum(crowd_size / 10000, 0.3), 0.0)
+        score = score + np.where(is_armed, 0.2, 0.0)
+        score = score + np.where(requires_vehicle, 0.05, 0.0)
+        score = np.minimum(score, 1.0)
+
+        risk_multiplier = 1.0 + (score * 0.5)
+        armed_premium = np.where(is_armed, 15.0, 0.0)
+        hourly_cost = (base_rate + armed_premium) * risk_multiplier
+        labor_cost = hourly_cost * hours * num_guards
+        vehicle_cost = np.where(requires_vehicle, 50.0 * num_guards, 0.0)
+
+        levels = np.searchsorted(self.RISK_LEVEL_BOUNDS, score, side='right')
+        return {
+            'risk_score': score,
+            'risk_level': self.RISK_LEVEL_NAMES[levels],
+            'risk_multiplier': risk_multiplier,
+            'base_hourly_rate': base_rate,
+            'armed_premium': armed_premium,
+            'adjusted_hourly_rate': hourly_cost,
+            'labor_cost': labor_cost,
+            'vehicle_cost': vehicle_cost,
+            'base_price': labor_cost,
+            'final_price': round_array(labor_cost + vehicle_cost),
+            'confidence_score': 0.85 + np.where(crowd_size > 0, 0.1, 0.0),
+        }
 
     def assess_risk(self, request: QuoteRequest) -> RiskAssessment:
         """Provide detailed risk assessment."""
@@ -142,6 +223,55 @@ class PricingEngine:
         )
 
 
+def _event_type_codes(values: np.ndarray, kinds: list[EventType]) -> np.ndarray:
+    """Index into ``kinds`` for each EventType or event type string."""
+    index = {kind: i for i, kind in enumerate(kinds)}
+    index.update({kind.value: i for i, kind in enumerate(kinds)})
+    try:
+        return np.fromiter((index[value] for value in values), dtype=np.intp, count=len(values))
+    except KeyError as e:
+        raise ValueError(f"Unknown event type: {e.args[0]!r}") from None
+
+
+def _optional_column(columns, name: str, n: int, dtype, default) -> np.ndarray:
+    """Column as an array, or ``default`` everywhere when it is absent."""
+    # ``in`` checks keys of a mapping and column names of a DataFrame
+    if name not in columns:
+        return np.full(n, default, dtype=dtype)
+    return np.asarray(columns[name], dtype=dtype)
+
+
+def _hour_and_weekday(dates) -> tuple[np.ndarray, np.ndarray]:
+    """Local hour and weekday (Monday=0) of each date, like datetime.hour/weekday()."""
+    if hasattr(dates, 'dt'):  # pandas Series, possibly tz-aware
+        return dates.dt.hour.to_numpy(), dates.dt.weekday.to_numpy()
+    values = np.asarray(dates)
+    if values.dtype == object:  # datetime objects, possibly tz-aware
+        hour = np.fromiter((d.hour for d in values), dtype=np.int64, count=len(values))
+        weekday = np.fromiter((d.weekday() for d in values), dtype=np.int64, count=len(values))
+        return hour, weekday
+    values = values.astype('datetime64[s]')
+    days = values.astype('datetime64[D]')
+    hour = (values - days).astype('timedelta64[h]').astype(np.int64)
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekday = (days.astype(np.int64) + 3) % 7
+    return hour, weekday
+
+
+def round_array(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """round(x, ndigits) for every element, matching Python's correctly rounded result.
+
+    ``np.round`` scales by a power of ten first, which can land on the wrong
+    side of a tie; values that close to a half unit are re-rounded in Python.
+    """
+    scaled = np.asarray(values, dtype=np.float64) * 10.0 ** ndigits
+    rounded = np.rint(scaled) / 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
 # Singleton instance
 _engine: PricingEngine | None = None
 
@@ -38,6 +38,45 @@ class QuoteResponse(BaseModel):
     risk_level: RiskLevel
     confidence_score: float = Field(..., ge=0, le=1)
     breakdown: dict
+    model_version: str | None = None
+
+
+class QuoteBatchItem(BaseModel):
+    index: int
+    quote: QuoteResponse | None = None
+    error: str | None = None
+
+
+class QuoteBatchResponse(BaseModel):
+    results: list[QuoteBatchItem]
+    succeeded: int
+    failed: int
+
+
+class SweepRange(BaseModel):
+    """Inclusive range ``start, start + step, ..., stop``."""
+    start: float
+    stop: float
+    step: float = Field(default=1, gt=0)
+
+
+class QuoteSweepRequest(BaseModel):
+    """A base quote plus the inputs to sweep; omitted axes keep the base value."""
+    base: QuoteRequest
+    num_guards: list[int] | SweepRange | None = None
+    hours: list[float] | SweepRange | None = None
+    is_armed: list[bool] | None = None
+    requires_vehicle: list[bool] | None = None
+
+
+class QuoteSweepResponse(BaseModel):
+    """Grid results flattened in C order over ``axes`` (num_guards slowest)."""
+    axes: dict[str, list]
+    shape: list[int]
+    final_price: list[float]
+    risk_level: list[RiskLevel]
+    risk_score: list[float]
+    model_version: str | None = None
 
 
 class RiskAssessment(BaseModel):
@@ -45,6 +84,7 @@ class RiskAssessment(BaseModel):
     risk_score: float = Field(..., ge=0, le=1)
     factors: list[str]
     recommendations: list[str]
+    model_version: str | None = None
 
 
 class HealthResponse(BaseModel):
@@ -2,68 +2,173 @@
 Trained ML Model Predictor for GuardQuote
 Uses trained models for price and risk predictions.
 """
+import hashlib
 import os
 import pickle
+import threading
+import time
 from datetime import datetime
 from typing import Optional
 import numpy as np
+from ..config import get_settings
+from ..metrics import timed
+from .feature_encoder import FeatureEncoder
+from .pricing_engine import PricingEngine, round_array
+from .prediction_cache import PredictionCache
+
+# artifact_store and tree_engine pull in scikit-learn (over a second to
+# import), so they are imported on first model load rather than at app
+# import time, letting the server bind its port before models are ready.
+
+TREE_ENGINES = ("compiled", "sklearn")
+MODEL_FORMATS = ("pickle", "mmap")
 
 MODEL_PATH = os.path.join(
     os.path.dirname(__file__), "..", "..", "models", "trained", "guardquote_models.pkl"
 )
 
+# Directory written by src.models.artifact_store (memory-mapped .npy + manifest)
+EXPORT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "models", "trained", "guardquote_models"
+)
+
 # Risk level mappings
 RISK_LEVELS = ['low', 'medium', 'high', 'critical']
 
+# Inputs predict_grid can sweep, in grid axis order
+GRID_AXES = ('num_guards', 'hours', 'is_armed', 'has_vehicle')
+
+# Reported as the model version when the rule-based fallback served a request
+FALLBACK_VERSION = PricingEngine.MODEL_VERSION
+
+
+class ModelReloadError(RuntimeError):
+    """A new model could not be loaded; the current one stays in service."""
+
+
+class ReloadInProgressError(ModelReloadError):
+    """Another reload is still loading or warming up."""
+
+
+def artifact_version(path: str) -> str:
+    """Short content hash identifying a model artifact."""
+    from .artifact_store import MANIFEST_NAME
+
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        path = os.path.join(path, MANIFEST_NAME)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
 
 class TrainedPredictor:
     """ML-based predictor using trained models."""
 
     def __init__(self):
         self.models = None
+        self.encoder: Optional[FeatureEncoder] = None
+        # Objects actually serving predict/predict_proba (compiled or sklearn)
+        self.price_model = None
+        self.risk_model = None
+        self.engines: dict = {}
+        self.version = FALLBACK_VERSION
         self.loaded = False
+        # Milliseconds spent in each load phase, for the startup log
+        self.load_timings: dict = {}
+        settings = get_settings()
+        if settings.tree_engine not in TREE_ENGINES:
+            raise ValueError(
+                f"tree_engine must be one of {TREE_ENGINES}, got {settings.tree_engine!r}"
+            )
+        if settings.model_format not in MODEL_FORMATS:
+            raise ValueError(
+                f"model_format must be one of {MODEL_FORMATS}, got {settings.model_format!r}"
+            )
+        self.tree_engine = settings.tree_engine
+        self.model_format = settings.model_format
+        self.cache = PredictionCache(
+            settings.prediction_cache_size, settings.prediction_cache_ttl
+        )
         self._load_models()
 
     def _load_models(self):
         """Load trained models from disk."""
-        if os.path.exists(MODEL_PATH):
+        # Cached outputs belong to whatever model was loaded before
+        self.cache.clear()
+        path = EXPORT_PATH if self.model_format == "mmap" else MODEL_PATH
+        if os.path.exists(path):
             try:
-                with open(MODEL_PATH, 'rb') as f:
-                    self.models = pickle.load(f)
+                start = time.perf_counter()
+                from .artifact_store import load_exported
+                from . import tree_engine  # noqa: F401
+                imported = time.perf_counter()
+                if self.model_format == "mmap":
+                    self.models = load_exported(path)
+                else:
+                    with open(path, 'rb') as f:
+                        self.models = pickle.load(f)
+                unpickled = time.perf_counter()
+                self.encoder = FeatureEncoder.from_artifacts(self.models)
+                self._bind_feature_names()
+                self.price_model = self._serving_model('price_model')
+                self.risk_model = self._serving_model('risk_model')
+                self.version = artifact_version(path)
+                self.load_timings = {
+                    'imports_ms': (imported - start) * 1000,
+                    'unpickle_ms': (unpickled - imported) * 1000,
+                    'compile_ms': (time.perf_counter() - unpickled) * 1000,
+                }
                 self.loaded = True
-                print(f"✓ Loaded trained models from {MODEL_PATH}")
+                print(f"✓ Loaded trained models from {path}")
+                print(f"  Version: {self.version}")
                 print(f"  Price model: {self.models.get('price_model_name', 'Unknown')}")
                 print(f"  Trained at: {self.models.get('trained_at', 'Unknown')}")
+                print(f"  Inference engines: {self.engines}")
             except Exception as e:
                 print(f"✗ Error loading models: {e}")
                 self.loaded = False
         else:
-            print(f"✗ Model file not found: {MODEL_PATH}")
+            print(f"✗ Model file not found: {path}")
             self.loaded = False
 
-    def _encode_event_type(self, event_type: str) -> int:
-        """Encode event type to numeric value."""
-        event_types = ['concert', 'construction', 'corporate', 'private', 'residential', 'retail', 'sports']
-        try:
-            return event_types.index(event_type.lower())
-        except ValueError:
-            return 3  # default to 'private'
-
-    def _encode_state(self, state: str) -> int:
-        """Encode state to numeric value."""
-        states = ['AZ', 'CA', 'CO', 'FL', 'GA', 'IL', 'MA', 'NV', 'NY', 'TX', 'WA']
-        try:
-            return states.index(state.upper())
-        except ValueError:
-            return 1  # default to CA
-
-    def _encode_risk_zone(self, risk_zone: str) -> int:
-        """Encode risk zone to numeric value."""
-        zones = ['critical', 'high', 'low', 'medium']
-        try:
-            return zones.index(risk_zone.lower())
-        except ValueError:
-            return 3  # default to medium
+    def _bind_feature_names(self):
+        """Check model column order against the encoder, then drop the names.
+
+        The models were fit on DataFrames, so sklearn would otherwise compare
+        (and warn about) feature names on every ndarray predict call.
+        """
+        for model_key, features in (
+            ('price_model', self.encoder.price_features),
+            ('risk_model', self.encoder.risk_features),
+        ):
+            model = self.models[model_key]
+            fitted = getattr(model, 'feature_names_in_', None)
+            if fitted is None:
+                continue
+            if list(fitted) != features:
+                raise ValueError(
+                    f"{model_key} was fit on {list(fitted)}, artifact lists {features}"
+                )
+            del model.feature_names_in_
+
+    def _serving_model(self, model_key: str):
+        """Compile a tree ensemble to flat arrays unless sklearn is requested."""
+        from .tree_engine import compile_model, is_compiled
+
+        model = self.models[model_key]
+        if is_compiled(model):
+            # Exported artifacts only carry the compiled arrays
+            self.engines[model_key] = "compiled"
+            return model
+        if self.tree_engine == "compiled":
+            compiled = compile_model(model)
+            if compiled is not None:
+                self.engines[model_key] = "compiled"
+                return compiled
+        self.engines[model_key] = "sklearn"
+        return model
 
     def predict_price(
         self,
@@ -86,37 +191,17 @@ class TrainedPredictor:
                 event_type, num_guards, hours, is_armed, has_vehicle
             )
 
-        # Prepare features
-        features = np.array([[
-            self._encode_event_type(event_type),
-            self._encode_state(state),
-            self._encode_risk_zone(risk_zone),
-            int(zip_code[:3]) if zip_code else 900,
-            num_guards,
-            hours,
-            num_guards * hours,  # total_guard_hours
-            crowd_size,
-            event_date.weekday(),
-            event_date.hour,
-            event_date.month,
-            1 if event_date.weekday() >= 5 else 0,  # is_weekend
-            1 if event_date.hour >= 22 or event_date.hour < 6 else 0,  # is_night
-            1 if is_armed else 0,
-            1 if has_vehicle else 0,
-        ]])
+        with timed('encode'):
+            features, _ = self.encoder.encode_one(
+                event_type, state, zip_code, risk_zone, num_guards, hours,
+                crowd_size, event_date, is_armed, has_vehicle,
+            )
 
         # Predict
-        price_model = self.models['price_model']
-        predicted_price = price_model.predict(features)[0]
-
-        # Calculate confidence based on feature completeness
-        confidence = 0.95 if crowd_size > 0 else 0.88
+        with timed('predict_price'):
+            predicted_price = self._price_output(features)
 
-        return {
-            'predicted_price': round(max(predicted_price, 100), 2),
-            'confidence': confidence,
-            'model_used': self.models.get('price_model_name', 'Trained Model'),
-        }
+        return self._price_result(predicted_price, crowd_size)
 
     def predict_risk(
         self,
@@ -134,42 +219,268 @@ class TrainedPredictor:
         if not self.loaded:
             return self._fallback_risk(event_type, crowd_size, event_date)
 
-        # Prepare features
-        features = np.array([[
-            self._encode_event_type(event_type),
-            self._encode_state(state),
-            int(zip_code[:3]) if zip_code else 900,
-            num_guards,
-            hours,
-            crowd_size,
-            event_date.weekday(),
-            event_date.hour,
-            event_date.month,
-            1 if event_date.weekday() >= 5 else 0,
-            1 if event_date.hour >= 22 or event_date.hour < 6 else 0,
-            1 if is_armed else 0,
-        ]])
+        with timed('encode'):
+            _, features = self.encoder.encode_one(
+                event_type, state, zip_code, "medium", num_guards, hours,
+                crowd_size, event_date, is_armed,
+            )
 
         # Predict
-        risk_model = self.models['risk_model']
-        risk_class = risk_model.predict(features)[0]
-        risk_proba = risk_model.predict_proba(features)[0]
+        with timed('predict_risk'):
+            risk_proba = self._risk_output(features)
 
-        risk_level = RISK_LEVELS[risk_class]
-        risk_score = risk_proba[risk_class]
+        return self._risk_result(risk_proba, event_type, crowd_size, event_date, is_armed)
+
+    def predict_quote(
+        self,
+        event_type: str,
+        state: str,
+        zip_code: str,
+        risk_zone: str,
+        num_guards: int,
+        hours: float,
+        crowd_size: int,
+        event_date: datetime,
+        is_armed: bool = False,
+        has_vehicle: bool = False,
+    ) -> dict:
+        """Predict price and risk together from one shared encoding.
+
+        Returns ``{'price': ..., 'risk': ...}`` with the same payloads as
+        ``predict_price`` and ``predict_risk``. The risk class is the argmax
+        of a single ``predict_proba`` call.
+        """
+
+        if not self.loaded:
+            return {
+                'price': self._fallback_price(
+                    event_type, num_guards, hours, is_armed, has_vehicle
+                ),
+                'risk': self._fallback_risk(event_type, crowd_size, event_date),
+            }
+
+        with timed('encode'):
+            price_features, risk_features = self.encoder.encode_one(
+                event_type, state, zip_code, risk_zone, num_guards, hours,
+                crowd_size, event_date, is_armed, has_vehicle,
+            )
+
+        with timed('predict_price'):
+            predicted_price = self._price_output(price_features)
+        with timed('predict_risk'):
+            risk_proba = self._risk_output(risk_features)
+
+        return {
+            'price': self._price_result(predicted_price, crowd_size),
+            'risk': self._risk_result(
+                risk_proba, event_type, crowd_size, event_date, is_armed
+            ),
+        }
+
+    def _price_output(self, features) -> float:
+        """Raw price-model output for one encoded row, via the cache."""
+        key = b'price' + features.tobytes()
+        predicted_price = self.cache.get(key)
+        if predicted_price is None:
+            predicted_price = float(self.price_model.predict(features)[0])
+            self.cache.put(key, predicted_price)
+        return predicted_price
+
+    def _risk_output(self, features):
+        """Risk-model class probabilities for one encoded row, via the cache."""
+        key = b'risk' + features.tobytes()
+        risk_proba = self.cache.get(key)
+        if risk_proba is None:
+            risk_proba = self.risk_model.predict_proba(features)[0]
+            risk_proba.flags.writeable = False
+            self.cache.put(key, risk_proba)
+        return risk_proba
+
+    def _price_result(self, predicted_price: float, crowd_size: int) -> dict:
+        """Shape a raw price prediction into the API payload."""
+        # Calculate confidence based on feature completeness
+        confidence = 0.95 if crowd_size > 0 else 0.88
+
+        return {
+            'predicted_price': round(max(float(predicted_price), 100), 2),
+            'confidence': confidence,
+            'model_used': self.models.get('price_model_name', 'Trained Model'),
+            'model_version': self.version,
+        }
+
+    def _risk_result(
+        self, risk_proba, event_type: str, crowd_size: int,
+        event_date: datetime, is_armed: bool,
+    ) -> dict:
+        """Shape one row of class probabilities into the API payload."""
+        best = int(risk_proba.argmax())
+        risk_level = RISK_LEVELS[self.risk_model.classes_[best]]
 
         # Generate factors based on prediction
-        factors = self._generate_risk_factors(
-            event_type, crowd_size, event_date, is_armed, risk_level
-        )
+        with timed('factors'):
+            factors = self._generate_risk_factors(
+                event_type, crowd_size, event_date, is_armed, risk_level
+            )
 
         return {
             'risk_level': risk_level,
-            'risk_score': round(float(risk_score), 3),
-            'confidence': round(float(max(risk_proba)), 3),
+            'risk_score': round(float(risk_proba[best]), 3),
+            'confidence': round(float(risk_proba[best]), 3),
             'factors': factors,
+            'model_version': self.version,
+        }
+
+    def predict_batch(self, items: list[dict]) -> list[dict]:
+        """Predict price and risk for many quotes at once.
+
+        Each item takes the same keyword arguments as ``predict_price``.
+        All valid rows are stacked and scored with a single price-model
+        ``predict`` and a single risk-model ``predict_proba`` call. Items
+        that fail to encode get an ``error`` entry instead of failing the
+        whole batch.
+        """
+        results: list[dict] = [{} for _ in items]
+
+        if not self.loaded:
+            for result, item in zip(results, items):
+                try:
+                    result['price'] = self._fallback_price(
+                        item['event_type'], item['num_guards'], item['hours'],
+                        item.get('is_armed', False), item.get('has_vehicle', False),
+                    )
+                    result['risk'] = self._fallback_risk(
+                        item['event_type'], item['crowd_size'], item['event_date'],
+                    )
+                except Exception as e:
+                    result['error'] = str(e)
+            return results
+
+        valid = []
+        for i, item in enumerate(items):
+            try:
+                self.encoder.check_item(item)
+            except Exception as e:
+                results[i]['error'] = str(e)
+                continue
+            valid.append(i)
+
+        if not valid:
+            return results
+
+        with timed('encode'):
+            price_features, risk_features = self.encoder.encode_items(
+                [items[i] for i in valid]
+            )
+
+        with timed('predict_price'):
+            predicted_prices = self.price_model.predict(price_features)
+        with timed('predict_risk'):
+            risk_proba = self.risk_model.predict_proba(risk_features)
+
+        for row, i in enumerate(valid):
+            item = items[i]
+            results[i]['price'] = self._price_result(predicted_prices[row], item['crowd_size'])
+            results[i]['risk'] = self._risk_result(
+                risk_proba[row], item['event_type'], item['crowd_size'],
+                item['event_date'], item.get('is_armed', False),
+            )
+
+        return results
+
+    def predict_grid(self, base: dict, axes: dict) -> dict:
+        """Price and risk over the cartesian product of ``axes`` around ``base``.
+
+        ``base`` takes the same keyword arguments as ``predict_price``;
+        ``axes`` maps any of GRID_AXES to the values to sweep. The whole grid
+        is encoded as one column batch and scored with a single ``predict``
+        and a single ``predict_proba`` call. Returns ``final_price``,
+        ``risk_level`` and ``risk_score`` arrays flattened in C order over
+        the axes (in GRID_AXES order), plus ``model_version``.
+        """
+        names = [name for name in GRID_AXES if name in axes]
+        mesh = np.meshgrid(
+            *(np.asarray(axes[name], dtype=np.float64) for name in names), indexing='ij'
+        )
+        values = {name: grid.ravel() for name, grid in zip(names, mesh)}
+        size = len(next(iter(values.values()))) if values else 1
+
+        if not self.loaded:
+            return self._fallback_grid(base, values, size)
+
+        self.encoder.check_item(base)
+        columns = {
+            name: np.repeat(np.asarray(column), size)
+            for name, column in self.encoder.columns_for([base]).items()
+        }
+        columns.update(values)
+        return self.predict_columns(columns)
+
+    def predict_columns(self, columns) -> dict:
+        """Score a raw column batch (see ``FeatureEncoder.encode``) in one pass.
+
+        Returns ``final_price``, ``risk_level`` and ``risk_score`` arrays
+        shaped exactly as the single-quote payloads, plus ``model_version``.
+        Requires loaded models.
+        """
+        with timed('encode'):
+            price_features, risk_features = self.encoder.encode(columns)
+
+        with timed('predict_price'):
+            predicted_prices = self.price_model.predict(price_features)
+        with timed('predict_risk'):
+            risk_proba = self.risk_model.predict_proba(risk_features)
+
+        best = risk_proba.argmax(axis=1)
+        return {
+            'final_price': round_array(np.maximum(predicted_prices, 100)),
+            'risk_level': np.asarray(RISK_LEVELS)[self.risk_model.classes_[best]],
+            'risk_score': round_array(risk_proba[np.arange(len(best)), best], 3),
+            'model_version': self.version,
         }
 
+    def _fallback_grid(self, base: dict, values: dict, size: int) -> dict:
+        """Rule-based ``predict_grid``; fallback risk does not vary over the axes."""
+        point = {name: base.get(name, False) for name in GRID_AXES}
+        prices = np.empty(size)
+        for i in range(size):
+            point.update((name, column[i]) for name, column in values.items())
+            prices[i] = self._fallback_price(
+                base['event_type'], int(point['num_guards']), float(point['hours']),
+                bool(point['is_armed']), bool(point['has_vehicle']),
+            )['predicted_price']
+        risk = self._fallback_risk(base['event_type'], base['crowd_size'], base['event_date'])
+        return {
+            'final_price': prices,
+            'risk_level': np.full(size, risk['risk_level']),
+            'risk_score': np.full(size, risk['risk_score']),
+            'model_version': FALLBACK_VERSION,
+        }
+
+    def warmup(self, count: int):
+        """Run ``count`` throwaway predictions so first real requests are not cold.
+
+        Covers the single-quote and batch paths; the cache and its counters
+        are reset afterwards so warmup inputs do not show up as hits or misses.
+        """
+        if not self.loaded or count <= 0:
+            return
+        event_types = self.encoder.tables['event_type'].classes
+        items = [
+            {
+                'event_type': event_types[i % len(event_types)], 'state': 'CA',
+                'zip_code': '90001', 'risk_zone': 'medium', 'num_guards': 1 + i % 10,
+                'hours': 4.0 + i % 8, 'crowd_size': 100 * i,
+                'event_date': datetime(2026, 1 + i % 12, 1 + i % 28, i % 24),
+                'is_armed': i % 2 == 0, 'has_vehicle': i % 3 == 0,
+            }
+            for i in range(count)
+        ]
+        for item in items:
+            self.predict_quote(**item)
+        self.predict_batch(items)
+        self.cache.clear()
+        self.cache.reset_stats()
+
     def _generate_risk_factors(
         self, event_type: str, crowd_size: int, event_date: datetime,
         is_armed: bool, risk_level: str
@@ -221,6 +532,7 @@ class TrainedPredictor:
             'predicted_price': round(subtotal * 1.0875, 2),  # with tax
             'confidence': 0.75,
             'model_used': 'Rule-based fallback',
+            'model_version': FALLBACK_VERSION,
         }
 
     def _fallback_risk(
@@ -257,16 +569,53 @@ class TrainedPredictor:
             'risk_score': round(score, 3),
             'confidence': 0.70,
             'factors': ['Rule-based assessment'],
+            'model_version': FALLBACK_VERSION,
         }
 
 
 # Singleton instance
 _predictor: Optional[TrainedPredictor] = None
+_load_lock = threading.Lock()
+_reload_lock = threading.Lock()
 
 
 def get_predictor() -> TrainedPredictor:
-    """Get singleton predictor instance."""
+    """Get singleton predictor instance.
+
+    Loads the models on first use; concurrent first callers wait for the
+    same load instead of each starting their own.
+    """
     global _predictor
     if _predictor is None:
-        _predictor = TrainedPredictor()
+        with _load_lock:
+            if _predictor is None:
+                _predictor = TrainedPredictor()
     return _predictor
+
+
+def current_predictor() -> Optional[TrainedPredictor]:
+    """The singleton if it has been created, without triggering a load."""
+    return _predictor
+
+
+def reload_predictor(warmup_count: int = 0) -> TrainedPredictor:
+    """Load the current artifact into a new predictor and swap it in.
+
+    The new predictor is fully loaded and warmed before the singleton is
+    replaced, and the swap is a single reference assignment. Requests that
+    already hold the old predictor finish on it. Raises ModelReloadError
+    (leaving the old predictor in place) if the new artifact fails to load,
+    or ReloadInProgressError if another reload is still running.
+    """
+    global _predictor
+    if not _reload_lock.acquire(blocking=False):
+        raise ReloadInProgressError("A model reload is already in progress")
+    try:
+        candidate = TrainedPredictor()
+        if not candidate.loaded:
+            raise ModelReloadError("New model artifact failed to load")
+        candidate.warmup(warmup_count)
+        _predictor = candidate
+        return candidate
+    finally:
+        _reload_lock.release()
@@ -0,0 +1,258 @@
+"""
+Compiled tree-ensemble inference for GuardQuote.
+Flattens fitted sklearn forests into NumPy node arrays and evaluates all
+trees at once, level by level, without sklearn's per-call validation.
+"""
+from typing import Optional
+import numpy as np
+from sklearn.ensemble import (
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+
+# Rows evaluated per traversal pass; bounds the (rows x trees) node matrix
+CHUNK_ROWS = 4096
+
+
+class FlatForest:
+    """Every node of every tree in one set of flat arrays.
+
+    Leaves point to themselves, so a fixed ``max_depth`` number of steps
+    lands every row on its leaf without tracking which rows are done.
+    """
+
+    ARRAY_FIELDS = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots')
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.has_missing = bool(missing_left.any())
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def arrays(self) -> dict:
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_estimators(cls, estimators) -> "FlatForest":
+        """Flatten fitted DecisionTree estimators.
+
+        Classifier leaves already hold class fractions (scikit-learn >= 1.4),
+        which is exactly what ``DecisionTreeClassifier.predict_proba`` returns.
+        """
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            n = tree.node_count
+            node_ids = np.arange(offset, offset + n, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            missing.append(
+                np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(n)), dtype=bool)
+                & ~is_leaf
+            )
+            values.append(tree.value[:, 0, :].astype(np.float64))
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            missing_left=np.concatenate(missing),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index for every (row, tree) pair."""
+        n_rows, n_features = X.shape
+        flat_x = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees)).copy()
+
+        for _ in range(self.max_depth):
+            x = flat_x.take(row_offsets + self.feature.take(nodes))
+            go_left = x <= self.threshold.take(nodes)
+            if self.has_missing:
+                go_left |= np.isnan(x) & self.missing_left.take(nodes)
+            nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+
+        return nodes
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """Leaf values with shape (rows, trees, outputs)."""
+        return self.value[self.apply(X)]
+
+
+def _as_tree_input(X) -> np.ndarray:
+    # sklearn trees compare float32 inputs against float64 thresholds
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+def _sequential_sum(terms: np.ndarray) -> np.ndarray:
+    """Sum along axis 1 strictly left to right, like sklearn's accumulation loops.
+
+    ``ndarray.sum`` uses pairwise summation, which can differ in the last bit.
+    """
+    return np.cumsum(terms, axis=1)[:, -1]
+
+
+def _chunks(X: np.ndarray):
+    for start in range(0, X.shape[0], CHUNK_ROWS):
+        yield X[start:start + CHUNK_ROWS]
+
+
+class CompiledGradientBoostingRegressor:
+    """predict() for a fitted GradientBoostingRegressor."""
+
+    kind = 'gradient_boosting_regressor'
+
+    def __init__(self, forest: FlatForest, baseline: float, learning_rate: float,
+                 n_features_in: int):
+        self.forest = forest
+        self.baseline = baseline
+        self.learning_rate = learning_rate
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_sklearn(cls, model: GradientBoostingRegressor):
+        if model.init_ == 'zero':
+            baseline = 0.0
+        else:
+            baseline = float(model.init_.predict(np.zeros((1, model.n_features_in_)))[0])
+        return cls(
+            FlatForest.from_estimators(model.estimators_[:, 0]),
+            baseline, model.learning_rate, model.n_features_in_,
+        )
+
+    def params(self) -> dict:
+        return {
+            'baseline': self.baseline,
+            'learning_rate': self.learning_rate,
+            'n_features_in': self.n_features_in_,
+        }
+
+    def extra_arrays(self) -> dict:
+        return {}
+
+    def predict(self, X) -> np.ndarray:
+        X = _as_tree_input(X)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        row = 0
+        for chunk in _chunks(X):
+            leaves = self.forest.leaf_values(chunk)[:, :, 0]
+            terms = np.empty((chunk.shape[0], leaves.shape[1] + 1), dtype=np.float64)
+            terms[:, 0] = self.baseline
+            np.multiply(self.learning_rate, leaves, out=terms[:, 1:])
+            # baseline + lr * stage_1 + lr * stage_2 + ..., in sklearn's order
+            out[row:row + chunk.shape[0]] = _sequential_sum(terms)
+            row += chunk.shape[0]
+        return out
+
+
+class CompiledRandomForestRegressor:
+    """predict() for a fitted RandomForestRegressor."""
+
+    kind = 'random_forest_regressor'
+
+    def __init__(self, forest: FlatForest, n_features_in: int):
+        self.forest = forest
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_sklearn(cls, model: RandomForestRegressor):
+        return cls(FlatForest.from_estimators(model.estimators_), model.n_features_in_)
+
+    def params(self) -> dict:
+        return {'n_features_in': self.n_features_in_}
+
+    def extra_arrays(self) -> dict:
+        return {}
+
+    def predict(self, X) -> np.ndarray:
+        X = _as_tree_input(X)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        row = 0
+        for chunk in _chunks(X):
+            leaves = self.forest.leaf_values(chunk)[:, :, 0]
+            out[row:row + chunk.shape[0]] = _sequential_sum(leaves) / self.forest.n_trees
+            row += chunk.shape[0]
+        return out
+
+
+class CompiledRandomForestClassifier:
+    """predict()/predict_proba() for a fitted RandomForestClassifier."""
+
+    kind = 'random_forest_classifier'
+
+    def __init__(self, forest: FlatForest, classes: np.ndarray, n_features_in: int):
+        self.forest = forest
+        self.classes_ = classes
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_sklearn(cls, model: RandomForestClassifier):
+        return cls(
+            FlatForest.from_estimators(model.estimators_), model.classes_, model.n_features_in_
+        )
+
+    def params(self) -> dict:
+        return {'n_features_in': self.n_features_in_}
+
+    def extra_arrays(self) -> dict:
+        return {'classes': self.classes_}
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = _as_tree_input(X)
+        out = np.empty((X.shape[0], len(self.classes_)), dtype=np.float64)
+        row = 0
+        for chunk in _chunks(X):
+            leaves = self.forest.leaf_values(chunk)
+            out[row:row + chunk.shape[0]] = _sequential_sum(leaves) / self.forest.n_trees
+            row += chunk.shape[0]
+        return out
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+
+COMPILERS = {
+    GradientBoostingRegressor: CompiledGradientBoostingRegressor,
+    RandomForestRegressor: CompiledRandomForestRegressor,
+    RandomForestClassifier: CompiledRandomForestClassifier,
+}
+
+
+COMPILED_KINDS = {compiled.kind: compiled for compiled in COMPILERS.values()}
+
+
+def is_compiled(model) -> bool:
+    return type(model) in COMPILED_KINDS.values()
+
+
+def compile_model(model) -> Optional[object]:
+    """Compile a supported single-output tree ensemble, else return None."""
+    compiler = COMPILERS.get(type(model))
+    if compiler is None or getattr(model, 'n_outputs_', 1) != 1:
+        return None
+    return compiler.from_sklearn(model)
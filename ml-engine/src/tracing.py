@@ -0,0 +1,149 @@
+"""
+Per-request spans for the GuardQuote ML Engine.
+Stage timings collected while handling a request (validation, encode,
+predict_price, predict_risk, factors, serialize) are returned in a
+Server-Timing header and optionally appended to a JSON-lines trace file,
+so a caller such as the backend proxy can split end-to-end latency
+without a profiler.
+"""
+import json
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from .config import get_settings
+from .metrics import collect_stages, record_stages
+
+# perf_counter() when the current request arrived
+_request_start: ContextVar[Optional[float]] = ContextVar("guardquote_request_start", default=None)
+
+
+def mark_validated():
+    """Record time from request arrival to handler entry as the "validation" span.
+
+    FastAPI reads and validates the body before calling the handler, so
+    this covers body parsing and pydantic validation.
+    """
+    start = _request_start.get()
+    if start is not None:
+        record_stages({'validation': time.perf_counter() - start})
+
+
+def server_timing_header(spans: dict, total: float) -> str:
+    """Format spans (seconds) as a Server-Timing value in milliseconds."""
+    parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in spans.items()]
+    parts.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(parts)
+
+
+class TraceWriter:
+    """Appends one JSON object per request to a local file.
+
+    ``write`` only queues the record; a background thread does the disk I/O,
+    so requests on the event loop never wait on the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", buffering=1)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict):
+        self._queue.put(record)
+
+    def _drain(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._file.write(json.dumps(record) + "\n")
+        self._file.close()
+
+    def close(self):
+        """Write every queued record, then close the file."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+class TracingMiddleware:
+    """ASGI middleware collecting the spans of each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        settings = get_settings()
+        writer = get_trace_writer()
+        if not settings.server_timing_enabled and writer is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        with collect_stages() as spans:
+
+            async def send_with_timing(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if settings.server_timing_enabled:
+                        value = server_timing_header(spans, time.perf_counter() - start)
+                        message = {
+                            **message,
+                            "headers": [
+                                *message.get("headers", []),
+                                (b"server-timing", value.encode("latin-1")),
+                            ],
+                        }
+                await send(message)
+
+            token = _request_start.set(start)
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _request_start.reset(token)
+
+        if writer is not None:
+            headers = dict(scope["headers"])
+            writer.write({
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'request_id': headers.get(b"x-request-id", b"").decode("latin-1") or None,
+                'method': scope["method"],
+                'path': scope["path"],
+                'status': status,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'spans_ms': {name: round(seconds * 1000, 3) for name, seconds in spans.items()},
+            })
+
+
+# Singleton instance
+_writer: Optional[TraceWriter] = None
+
+
+def get_trace_writer() -> Optional[TraceWriter]:
+    """Get the trace file writer, or None when no trace file is configured."""
+    global _writer
+    path = get_settings().trace_file
+    if not path:
+        return None
+    if _writer is None or _writer.path != path:
+        close_trace_writer()
+        _writer = TraceWriter(path)
+    return _writer
+
+
+def close_trace_writer():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
@@ -0,0 +1,122 @@
+"""Shared fixtures: a small trained model artifact and an API client."""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier
+from sklearn.preprocessing import LabelEncoder
+
+PRICE_FEATURES = [
+    'event_type_encoded', 'state_encoded', 'risk_zone_encoded', 'zip_region',
+    'num_guards', 'hours_per_guard', 'total_guard_hours', 'crowd_size',
+    'day_of_week', 'hour_of_day', 'month',
+    'is_weekend', 'is_night_shift', 'is_armed', 'has_vehicle'
+]
+
+RISK_FEATURES = [
+    'event_type_encoded', 'state_encoded', 'zip_region',
+    'num_guards', 'hours_per_guard', 'crowd_size',
+    'day_of_week', 'hour_of_day', 'month',
+    'is_weekend', 'is_night_shift', 'is_armed'
+]
+
+
+def _training_frame(n: int = 400, seed: int = 0) -> tuple[pd.DataFrame, dict]:
+    """Synthetic training data shaped like preprocess_features output."""
+    rng = np.random.default_rng(seed)
+    event_types = ['concert', 'construction', 'corporate', 'private', 'residential', 'retail', 'sports']
+    states = ['AZ', 'CA', 'CO', 'FL', 'GA', 'IL', 'MA', 'NV', 'NY', 'TX', 'WA']
+    zones = ['critical', 'high', 'low', 'medium']
+
+    encoders = {
+        'event_type': LabelEncoder().fit(event_types),
+        'state': LabelEncoder().fit(states),
+        'risk_zone': LabelEncoder().fit(zones),
+    }
+
+    data = pd.DataFrame({
+        'event_type_encoded': rng.integers(0, len(event_types), n),
+        'state_encoded': rng.integers(0, len(states), n),
+        'risk_zone_encoded': rng.integers(0, len(zones), n),
+        'zip_region': rng.integers(100, 999, n),
+        'num_guards': rng.integers(1, 40, n),
+        'hours_per_guard': rng.uniform(2, 24, n).round(2),
+        'crowd_size': rng.integers(0, 20000, n),
+        'day_of_week': rng.integers(0, 7, n),
+        'hour_of_day': rng.integers(0, 24, n),
+        'month': rng.integers(1, 13, n),
+        'is_armed': rng.integers(0, 2, n),
+        'has_vehicle': rng.integers(0, 2, n),
+    })
+    data['total_guard_hours'] = data['num_guards'] * data['hours_per_guard']
+    data['is_weekend'] = (data['day_of_week'] >= 5).astype(int)
+    data['is_night_shift'] = ((data['hour_of_day'] >= 22) | (data['hour_of_day'] < 6)).astype(int)
+    data['final_price'] = (
+        data['total_guard_hours'] * (35 + 15 * data['is_armed'])
+        + 50 * data['num_guards'] * data['has_vehicle']
+        + rng.normal(0, 25, n)
+    )
+    data['risk_score'] = np.clip(
+        0.2 + data['crowd_size'] / 40000 + 0.15 * data['is_night_shift']
+        + 0.2 * data['is_armed'] + rng.normal(0, 0.05, n),
+        0, 1,
+    )
+    return data, encoders
+
+
+def build_artifacts() -> dict:
+    """Train small models with the same artifact layout as train_models.save_models."""
+    data, encoders = _training_frame()
+
+    price_model = GradientBoostingRegressor(n_estimators=20, max_depth=3, random_state=42)
+    price_model.fit(data[PRICE_FEATURES], data['final_price'])
+
+    risk_levels = np.digitize(data['risk_score'], [0.25, 0.5, 0.75])
+    risk_model = RandomForestClassifier(n_estimators=10, max_depth=6, random_state=42)
+    risk_model.fit(data[RISK_FEATURES], risk_levels)
+
+    return {
+        'price_model': price_model,
+        'price_scaler': None,
+        'price_model_name': 'Gradient Boosting',
+        'price_features': PRICE_FEATURES,
+        'risk_model': risk_model,
+        'risk_scaler': None,
+        'risk_features': RISK_FEATURES,
+        'accept_model': None,
+        'accept_scaler': None,
+        'accept_features': RISK_FEATURES + ['final_price'],
+        'encoders': encoders,
+        'trained_at': '2026-01-14T16:43:15.033095',
+    }
+
+
+@pytest.fixture(scope="session")
+def model_file(tmp_path_factory):
+    """Pickled model artifact on disk."""
+    path = tmp_path_factory.mktemp("models") / "guardquote_models.pkl"
+    with open(path, 'wb') as f:
+        pickle.dump(build_artifacts(), f)
+    return str(path)
+
+
+@pytest.fixture
+def predictor(model_file, monkeypatch):
+    """A TrainedPredictor loaded from the test artifact, installed as the singleton."""
+    from src.models import trained_predictor
+
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", model_file)
+    instance = trained_predictor.TrainedPredictor()
+    monkeypatch.setattr(trained_predictor, "_predictor", instance)
+    return instance
+
+
+@pytest.fixture
+def client(predictor):
+    """In-process API client backed by the test predictor."""
+    from fastapi.testclient import TestClient
+    from src.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
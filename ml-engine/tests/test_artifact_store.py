@@ -0,0 +1,39 @@
+"""Tests for the memory-mappable artifact format."""
+import numpy as np
+
+from src.config import get_settings
+from src.models import trained_predictor
+from src.models.artifact_store import export_artifacts, load_exported
+from tests.conftest import build_artifacts
+from tests.test_trained_predictor import INPUTS
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    artifacts = build_artifacts()
+    export_artifacts(artifacts, str(tmp_path))
+
+    loaded = load_exported(str(tmp_path))
+
+    forest = loaded['risk_model'].forest
+    assert isinstance(forest.threshold, np.memmap)
+    assert not forest.threshold.flags.writeable
+    assert loaded['price_features'] == artifacts['price_features']
+    np.testing.assert_array_equal(
+        loaded['encoders']['state'].classes_, artifacts['encoders']['state'].classes_
+    )
+
+
+def test_mmap_predictor_matches_pickle(predictor, tmp_path, monkeypatch):
+    export_artifacts(build_artifacts(), str(tmp_path))
+    monkeypatch.setattr(trained_predictor, "EXPORT_PATH", str(tmp_path))
+    monkeypatch.setattr(get_settings(), "model_format", "mmap")
+
+    mapped = trained_predictor.TrainedPredictor()
+
+    assert mapped.loaded
+    assert mapped.engines == {'price_model': 'compiled', 'risk_model': 'compiled'}
+    # Versions hash different files; everything else must be identical
+    mapped.version = predictor.version
+    assert mapped.predict_quote(**INPUTS) == predictor.predict_quote(**INPUTS)
+    batch = [dict(INPUTS, num_guards=n) for n in range(1, 6)]
+    assert mapped.predict_batch(batch) == predictor.predict_batch(batch)
@@ -0,0 +1,67 @@
+"""Tests for batched quoting."""
+from datetime import datetime
+
+import numpy as np
+
+QUOTE = {
+    "event_type": "concert",
+    "location_zip": "90210",
+    "num_guards": 6,
+    "hours": 8,
+    "date": "2026-03-14T20:00:00",
+    "is_armed": True,
+    "crowd_size": 1500,
+}
+
+
+def test_predict_batch_matches_single_predictions(predictor):
+    items = [
+        {
+            'event_type': event_type, 'state': 'CA', 'zip_code': '90210',
+            'risk_zone': 'medium', 'num_guards': guards, 'hours': 6.5,
+            'crowd_size': 800, 'event_date': datetime(2026, 6, 6, 23),
+            'is_armed': guards % 2 == 0, 'has_vehicle': False,
+        }
+        for event_type in ('concert', 'retail', 'sports')
+        for guards in (1, 4, 12)
+    ]
+
+    results = predictor.predict_batch(items)
+
+    for item, result in zip(items, results):
+        price = predictor.predict_price(**item)
+        risk_inputs = {k: v for k, v in item.items() if k not in ('risk_zone', 'has_vehicle')}
+        risk = predictor.predict_risk(**risk_inputs)
+        assert np.isclose(result['price']['predicted_price'], price['predicted_price'])
+        assert result['risk'] == risk
+
+
+def test_batch_endpoint_reports_errors_inline(client):
+    bad_zip = dict(QUOTE, location_zip="ABCDE")
+    bad_guards = dict(QUOTE, num_guards=0)
+
+    response = client.post("/api/v1/quote/batch", json=[QUOTE, bad_zip, bad_guards, QUOTE])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 2
+    assert body["failed"] == 2
+    results = body["results"]
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert results[0]["quote"] == results[3]["quote"]
+    assert results[1]["quote"] is None and results[1]["error"]
+    assert "num_guards" in results[2]["error"]
+
+    single = client.post("/api/v1/quote", json=QUOTE).json()
+    assert results[0]["quote"]["final_price"] == single["final_price"]
+
+
+def test_non_object_items_fail_only_themselves(client):
+    response = client.post("/api/v1/quote/batch", json=[5, QUOTE, "quote", None])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["succeeded"] == 1 and body["failed"] == 3
+    errors = [item["error"] for item in body["results"]]
+    assert errors[1] is None
+    assert all("valid dictionary" in errors[i] for i in (0, 2, 3))
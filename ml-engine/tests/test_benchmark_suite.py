@@ -0,0 +1,43 @@
+"""Tests for the benchmark suite (sampling, regression check, smoke run)."""
+import os
+import sys
+
+from src.models.schemas import QuoteRequest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import benchmark_suite  # noqa: E402
+
+
+def test_samples_are_valid_api_requests():
+    samples = benchmark_suite.load_samples(count=50)
+
+    assert len(samples) == 50
+    for sample in samples:
+        request = QuoteRequest.model_validate(sample['request'])
+        inputs = sample['inputs']
+        assert inputs['event_date'].weekday() == request.date.weekday()
+        assert inputs['zip_code'] == request.location_zip
+        assert inputs['num_guards'] == request.num_guards
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    baseline = {'results': {'a': {'p50': 100.0}, 'b': {'p50': 100.0}, 'gone': {'p50': 1.0}}}
+    current = {'results': {'a': {'p50': 109.0}, 'b': {'p50': 125.0}, 'new': {'p50': 5.0}}}
+
+    regressions = benchmark_suite.compare(current, baseline, threshold=0.10)
+
+    assert [r['case'] for r in regressions] == ['b']
+    assert round(regressions[0]['change'], 2) == 0.25
+
+
+def test_suite_smoke_run(predictor):
+    samples = benchmark_suite.load_samples(count=5)
+
+    results = benchmark_suite.run_suite(predictor, samples, iterations=5, warmup=1)
+
+    assert set(results) == {
+        'pricing_engine.calculate_quote', 'pricing_engine.assess_risk',
+        'predictor.predict_price', 'predictor.predict_risk', 'api.quote',
+    }
+    assert all(stats['iterations'] == 5 and stats['p50'] > 0 for stats in results.values())
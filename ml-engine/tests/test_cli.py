@@ -0,0 +1,111 @@
+"""Tests for the offline reprice command."""
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import _init_worker, event_dates, normalize_columns, reprice
+from src.config import get_settings
+from src.data.sources import representative_zips
+from src.models.pricing_engine import get_pricing_engine
+from src.models.schemas import QuoteRequest
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "training_data_2026.csv")
+
+
+def test_event_dates_match_weekday_and_hour():
+    dates = event_dates([1, 6, 12], [0, 5, 6], [9, 23, 0]).astype(datetime)
+    assert [(d.month, d.weekday(), d.hour) for d in dates] == [(1, 0, 9), (6, 5, 23), (12, 6, 0)]
+
+
+def test_normalize_columns_reports_missing_inputs():
+    with pytest.raises(ValueError, match="hours"):
+        normalize_columns(pd.DataFrame({'event_type': ['concert'], 'guards': [2]}))
+
+
+def test_reprice_in_process_and_pool_agree(predictor, model_file, tmp_path):
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "quotes.csv"
+    pd.read_csv(DATA, nrows=60).to_csv(source, index=False)
+
+    inline = reprice(str(source), str(tmp_path / "out.csv"), chunk_size=25,
+                     workers=0, model_path=model_file, log=lambda _: None)
+    pooled = reprice(str(source), str(tmp_path / "out.parquet"), chunk_size=16,
+                     workers=2, model_path=model_file, log=lambda _: None)
+
+    by_csv = pd.read_csv(tmp_path / "out.csv")
+    by_parquet = pd.read_parquet(tmp_path / "out.parquet")
+    assert len(by_csv) == len(by_parquet) == inline['rows'] == 60
+    assert np.allclose(by_csv['model_price'], by_parquet['model_price'])
+    assert (by_csv['rule_risk_level'] == by_parquet['rule_risk_level']).all()
+    assert inline['model_price_mae'] == pytest.approx(pooled['model_price_mae'])
+
+
+def test_reprice_matches_single_quote_paths(predictor, model_file, tmp_path):
+    row = {
+        'event_type': 'concert', 'state': 'NV', 'risk_zone': 'high', 'zip_code': '89101',
+        'guards': 4, 'duration': 6.5, 'crowd_size': 2500, 'day_of_week': 5,
+        'hour_of_day': 22, 'month': 7, 'is_armed': True, 'has_vehicle': False,
+        'price': 1800.0, 'risk_score': 0.8,
+    }
+    source = tmp_path / "one.csv"
+    pd.DataFrame([row]).to_csv(source, index=False)
+
+    reprice(str(source), str(tmp_path / "out.csv"), workers=0, model_path=model_file,
+            log=lambda _: None)
+    out = pd.read_csv(tmp_path / "out.csv").iloc[0]
+
+    date = datetime(2026, 7, 4, 22)
+    price = predictor.predict_price(
+        'concert', 'NV', '89101', 'high', 4, 6.5, 2500, date, True, False)
+    rules = get_pricing_engine().calculate_quote(QuoteRequest(
+        event_type='concert', location_zip='89101', num_guards=4, hours=6.5,
+        date=date, is_armed=True, crowd_size=2500))
+    assert out['model_price'] == price['predicted_price']
+    assert out['rule_price'] == rules.final_price
+    assert out['rule_risk_level'] == rules.risk_level.value
+    assert out['actual_risk_level'] == 'critical'
+    assert out['model_price_error'] == pytest.approx(price['predicted_price'] - 1800.0)
+
+
+def test_rows_without_zips_get_their_training_zip_region(predictor, model_file, tmp_path,
+                                                        monkeypatch):
+    source = tmp_path / "no_zip.csv"
+    frame = pd.read_csv(DATA, nrows=20)
+    frame.to_csv(source, index=False)
+    seen = []
+    predict_columns = predictor.predict_columns
+    monkeypatch.setattr(predictor, "predict_columns",
+                        lambda columns: seen.append(columns['zip_region']) or predict_columns(columns))
+
+    reprice(str(source), str(tmp_path / "out.csv"), workers=0, model_path=model_file,
+            log=lambda _: None)
+
+    expected = representative_zips(frame).str[:3].astype(float).to_numpy()
+    assert 'zip_code' not in frame.columns
+    assert np.array_equal(seen[0], expected)
+    assert len(set(expected)) > 1
+
+
+def test_mmap_format_rejects_a_pickle_model(model_file, monkeypatch):
+    monkeypatch.setattr(get_settings(), "model_format", "mmap")
+    with pytest.raises(ValueError, match="exported"):
+        _init_worker(model_file)
+
+
+def test_leading_zero_zips_keep_their_region(predictor, model_file, tmp_path, monkeypatch):
+    source = tmp_path / "boston.csv"
+    frame = pd.read_csv(DATA, nrows=2)
+    frame['zip_code'] = ['02101', '90001']
+    frame.to_csv(source, index=False)
+    seen = []
+    predict_columns = predictor.predict_columns
+    monkeypatch.setattr(predictor, "predict_columns",
+                        lambda columns: seen.append(columns['zip_region']) or predict_columns(columns))
+
+    reprice(str(source), str(tmp_path / "out.csv"), workers=0, model_path=model_file,
+            log=lambda _: None)
+
+    assert list(seen[0]) == [21.0, 900.0]
@@ -0,0 +1,107 @@
+"""Tests for the content-addressed feature cache."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.feature_cache import FeatureCache, cache_key, frame_digest, source_digest
+from src.data.sources import CsvSource, load_training_frame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import train_models  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "training_data_2026.csv")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "quotes.csv"
+    pd.read_csv(DATA, nrows=300).to_csv(path, index=False)
+    return str(path)
+
+
+def test_hit_rebuilds_the_preprocessed_frame_without_loading(source, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    miss = train_models.load_features(source, cache_dir=cache_dir)
+    assert miss.matrices == {}
+
+    monkeypatch.setattr(train_models, "load_training_data",
+                        lambda *args: pytest.fail("cache hit loaded the source"))
+    hit = train_models.load_features(source, cache_dir=cache_dir)
+
+    assert hit.features == miss.features
+    assert hit.high_water_mark == miss.high_water_mark == {'rows': 300}
+    for name in hit.data.columns:
+        pd.testing.assert_series_equal(hit.data[name], miss.data[name].reset_index(drop=True))
+    for name, features in hit.features.items():
+        assert isinstance(hit.matrices[name], np.memmap)
+        assert not hit.matrices[name].flags.writeable
+        assert np.array_equal(hit.matrices[name], miss.data[features].to_numpy(np.float32))
+    for name, encoder in hit.encoders.items():
+        assert list(encoder.classes_) == list(miss.encoders[name].classes_)
+
+
+def test_key_changes_with_the_data_and_the_feature_code(source):
+    digest = source_digest(CsvSource(source))
+    assert digest == source_digest(CsvSource(source, chunksize=7))
+    assert cache_key(digest, "v1") != cache_key(digest, "v2")
+
+    with open(source, 'a') as f:
+        f.write(open(DATA).readlines()[400])
+    assert source_digest(CsvSource(source)) != digest
+    assert source_digest(CsvSource(source, skip_rows=300)) != source_digest(CsvSource(source))
+
+    frame = load_training_frame(CsvSource(source))
+    assert frame_digest(frame) == frame_digest(load_training_frame(CsvSource(source, chunksize=50)))
+    assert frame_digest(frame) != frame_digest(frame.head(300))
+
+
+def test_location_data_changes_miss_the_cache(source, tmp_path, monkeypatch):
+    from src.models import location_index
+
+    cache_dir = str(tmp_path / "cache")
+    train_models.load_features(source, cache_dir=cache_dir)
+    train_models.load_features(source, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    locations = list(location_index.get_location_index().by_zip5.values())
+    moved = locations[0]._replace(risk_zone="high" if locations[0].risk_zone != "high" else "low")
+    monkeypatch.setattr(location_index, "_index", location_index.LocationIndex([moved] + locations[1:]))
+    train_models.load_features(source, cache_dir=cache_dir)
+
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cached_training_matches_fresh_preprocessing(source, tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    fresh = train_models.load_features(source, cache_dir=None)
+    train_models.load_features(source, cache_dir=cache_dir)
+    cached = train_models.load_features(source, cache_dir=cache_dir)
+    assert "preprocessing skipped" in capsys.readouterr().out
+    assert len(os.listdir(cache_dir)) == 1
+
+    predictions = []
+    for features in (fresh, cached):
+        price_features, risk_features = features.features['price'], features.features['risk']
+        (price, _, _), (risk, _), (accept, accept_scaler, accept_features) = train_models.train_all(
+            features.data, price_features, risk_features, jobs=1)
+        X_accept = accept_scaler.transform(features.data[accept_features])
+        predictions.append((price.predict(features.data[price_features]),
+                            risk.predict(features.data[risk_features]),
+                            accept.predict_proba(X_accept)))
+    for fresh_prediction, cached_prediction in zip(*predictions):
+        assert np.array_equal(fresh_prediction, cached_prediction)
+
+
+def test_concurrent_writers_keep_one_entry(source, tmp_path):
+    data, price_features, risk_features, encoders = train_models.preprocess_features(
+        load_training_frame(CsvSource(source)))
+    cache = FeatureCache(str(tmp_path / "cache"))
+    features = {'price': price_features, 'risk': risk_features}
+    first = cache.save("k", data, features, encoders, {'rows': 300})
+    assert cache.save("k", data, features, encoders, {'rows': 300}) == first
+    assert os.listdir(tmp_path / "cache") == ["k"]
+    assert cache.load("missing") is None
@@ -0,0 +1,101 @@
+"""Train/serve parity tests for the feature encoder."""
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from src.models.feature_encoder import FeatureEncoder
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+
+def _raw_training_rows() -> pd.DataFrame:
+    """Rows shaped like the ml_training_data table."""
+    dates = [datetime(2026, 1, 3, 23), datetime(2026, 2, 10, 8), datetime(2026, 7, 4, 14),
+             datetime(2026, 11, 29, 2)]
+    return pd.DataFrame({
+        'event_type_code': ['concert', 'retail', 'sports', 'private'],
+        'zip_code': ['90210', '10019', '78701', '02101'],
+        'state': ['CA', 'NY', 'TX', 'MA'],
+        'risk_zone': ['high', 'critical', None, 'low'],
+        'num_guards': [6, 2, 12, 1],
+        'hours_per_guard': [8.0, 4.5, 10.0, 12.25],
+        'total_guard_hours': [48.0, 9.0, 120.0, 12.25],
+        'crowd_size': [1500, 0, 20000, 40],
+        'day_of_week': [d.weekday() for d in dates],
+        'hour_of_day': [d.hour for d in dates],
+        'month': [d.month for d in dates],
+        'is_weekend': [d.weekday() >= 5 for d in dates],
+        'is_night_shift': [d.hour >= 22 or d.hour < 6 for d in dates],
+        'is_armed': [True, False, True, False],
+        'has_vehicle': [False, True, False, True],
+        'final_price': [1000.0, 500.0, 9000.0, 300.0],
+        'risk_score': [0.6, 0.3, 0.8, 0.1],
+        'was_accepted': [True, False, True, True],
+        'event_date': dates,
+    })
+
+
+def test_encoder_matches_training_preprocessing():
+    import train_models
+
+    df = _raw_training_rows()
+    data, price_features, risk_features, encoders = train_models.preprocess_features(df)
+    encoder = FeatureEncoder.from_artifacts({
+        'encoders': encoders,
+        'price_features': price_features,
+        'risk_features': risk_features,
+    })
+
+    items = [
+        {
+            'event_type': row.event_type_code, 'state': row.state, 'zip_code': row.zip_code,
+            'risk_zone': row.risk_zone if pd.notna(row.risk_zone) else 'medium', 'num_guards': row.num_guards,
+            'hours': row.hours_per_guard, 'crowd_size': row.crowd_size,
+            'event_date': row.event_date, 'is_armed': row.is_armed,
+            'has_vehicle': row.has_vehicle,
+        }
+        for row in df.itertuples()
+    ]
+    price_matrix, risk_matrix = encoder.encode_items(items)
+
+    np.testing.assert_array_equal(price_matrix, data[price_features].to_numpy(dtype=float))
+    np.testing.assert_array_equal(risk_matrix, data[risk_features].to_numpy(dtype=float))
+    assert price_matrix.flags['C_CONTIGUOUS']
+
+    for i, item in enumerate(items):
+        price_row, risk_row = encoder.encode_one(**item)
+        np.testing.assert_array_equal(price_row[0], price_matrix[i])
+        np.testing.assert_array_equal(risk_row[0], risk_matrix[i])
+
+
+def test_unknown_categories_use_defaults():
+    encoder = FeatureEncoder.from_artifacts({})
+    known, _ = encoder.encode_one('private', 'CA', '90210', 'medium', 1, 4.0, 0,
+                                  datetime(2026, 1, 5, 9))
+    unknown, _ = encoder.encode_one('gala', 'ZZ', '90210', 'unknown', 1, 4.0, 0,
+                                    datetime(2026, 1, 5, 9))
+    np.testing.assert_array_equal(known, unknown)
+
+
+def test_api_event_types_encode_as_their_training_classes():
+    vocabulary = ['concert', 'corporate', 'gov_rally', 'industrial', 'music_festival',
+                  'retail_lp', 'social_wedding', 'sports', 'tech_summit', 'vip_protection']
+    encoder = FeatureEncoder.from_artifacts({'encoders': {'event_type': LabelEncoder().fit(vocabulary)}})
+    table = encoder.tables['event_type']
+
+    assert table.code('retail') == vocabulary.index('retail_lp')
+    assert table.code('construction') == vocabulary.index('industrial')
+    assert table.code('private') == vocabulary.index('social_wedding')
+    assert table.code('music_festival') == vocabulary.index('music_festival')
+    # No 2026 counterpart: the documented default, not whatever sorts first
+    assert table.code('residential') == table.code('private') != table.code('concert')
+
+
+def test_default_label_must_be_in_the_vocabulary():
+    with pytest.raises(ValueError, match="private"):
+        FeatureEncoder.from_artifacts({'encoders': {'event_type': LabelEncoder().fit(['a', 'b'])}})
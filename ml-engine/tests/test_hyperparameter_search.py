@@ -0,0 +1,103 @@
+"""Tests for the budgeted successive-halving search."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.models import hyperparameter_search as search
+
+FEATURES = ['a', 'b', 'c']
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    data = pd.DataFrame(rng.normal(size=(300, 3)), columns=FEATURES)
+    data['y'] = 3 * data['a'] - 2 * data['b'] ** 2 + rng.normal(0, 0.1, len(data))
+    return data
+
+
+def family(space=None):
+    return search.SearchFamily(
+        ('price', 'Random Forest'),
+        RandomForestRegressor(n_estimators=5, max_depth=2, random_state=0),
+        space or {'n_estimators': [5, 20], 'max_depth': [2, 6]},
+        FEATURES, 'y',
+    )
+
+
+def test_doubling_latency_outweighs_a_small_accuracy_gain():
+    baseline = search.objective(0.900, 100.0, 100.0)
+    slower = search.objective(0.901, 200.0, 100.0)
+    assert baseline == pytest.approx(0.900)
+    assert slower == pytest.approx(0.901 - search.DEFAULT_LATENCY_WEIGHT)
+    assert slower < baseline
+
+
+def test_rungs_grow_by_eta_to_all_rows(monkeypatch):
+    monkeypatch.setattr(search, "MIN_ROWS", 10)
+    assert search.rung_sizes(2700, 27) == [100, 300, 900, 2700]
+    assert search.rung_sizes(150, 27) == [10, 16, 50, 150]
+    assert search.rung_sizes(5, 27) == [5]
+
+
+def test_configurations_start_with_the_baseline():
+    configurations = search.sample_configurations(family(), 10)
+    assert configurations[0] == {}
+    assert len(configurations) == 5  # baseline + the whole 2x2 grid
+    assert len({tuple(sorted(c.items())) for c in configurations}) == 5
+
+
+def test_search_builds_matrices_once_and_prefers_cheaper_models(frame, monkeypatch):
+    monkeypatch.setattr(search, "MIN_ROWS", 20)
+    built = []
+    build = search.build_search_data
+    monkeypatch.setattr(search, "build_search_data",
+                        lambda *args: built.append(args[1:3]) or build(*args))
+    # Serving cost grows with tree count; accuracy barely does on this data
+    monkeypatch.setattr(search, "measure_latency_us",
+                        lambda model, X: 10.0 * model.n_estimators)
+
+    other = family()._replace(key=('price', 'Other'))
+    chosen = search.successive_halving(
+        [family(), other], frame, np.arange(len(frame)), search.Budget(60),
+        latency_weight=0.5, log=lambda _: None,
+    )
+
+    assert built == [(FEATURES, 'y')]
+    assert chosen[('price', 'Random Forest')] == {'n_estimators': 5, 'max_depth': 6}
+    assert chosen[('price', 'Random Forest')] == chosen[('price', 'Other')]
+
+
+def test_spent_budget_keeps_defaults(frame):
+    lines = []
+    chosen = search.successive_halving(
+        [family()], frame, np.arange(len(frame)), search.Budget(0, clock="cpu"), log=lines.append,
+    )
+    assert chosen == {('price', 'Random Forest'): {}}
+    assert "keeping defaults" in lines[-1]
+
+
+def test_cpu_budget_counts_charged_seconds():
+    budget = search.Budget(1.0, clock="cpu")
+    budget.charge(0.6)
+    assert not budget.exhausted()
+    budget.charge(0.6)
+    assert budget.exhausted()
+    with pytest.raises(ValueError):
+        search.Budget(1.0, clock="gpu")
+
+
+def test_prebuilt_matrices_are_searched_as_is(frame):
+    X = np.ascontiguousarray(frame[FEATURES].to_numpy(np.float32))
+    X.flags.writeable = False  # as memory-mapped from the feature cache
+    rows = np.arange(len(frame))
+
+    built = search.build_search_data(frame, FEATURES, 'y', rows, X)
+    assert built.X is X
+    assert [list(train) for train, _ in built.folds] == \
+        [list(train) for train, _ in search.build_search_data(frame, FEATURES, 'y', rows).folds]
+    chosen = search.successive_halving([family()], frame, rows, search.Budget(60),
+                                       log=lambda _: None, matrices={tuple(FEATURES): X})
+    assert chosen == search.successive_halving([family()], frame, rows, search.Budget(60),
+                                               log=lambda _: None)
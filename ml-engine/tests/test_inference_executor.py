@@ -0,0 +1,111 @@
+"""Tests for the bounded inference executor."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+
+from src.api import executor as executor_module
+from src.api.executor import InferenceExecutor
+from tests.test_batch_quote import QUOTE
+
+
+async def test_saturated_queue_fails_fast():
+    executor = InferenceExecutor("thread", workers=1, queue_size=1, retry_after=2)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(lambda: None)
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "2"}
+        assert executor.rejected == 1
+
+        release.set()
+        assert await running is True
+        assert executor.pending == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_cancelled_requests_hold_their_slot_until_the_job_ends():
+    executor = InferenceExecutor("thread", workers=1, queue_size=1, retry_after=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        running.cancel()
+        await asyncio.sleep(0.01)
+
+        # The worker thread is still busy, so the queue is still full
+        assert executor.pending == 1
+        with pytest.raises(HTTPException):
+            await executor.run(lambda: None)
+
+        release.set()
+        for _ in range(100):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.pending == 0
+        assert await executor.run(lambda: "ok") == "ok"
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_quote_returns_503_when_saturated(client, monkeypatch):
+    full = InferenceExecutor("thread", workers=1, queue_size=0, retry_after=1)
+    monkeypatch.setattr(executor_module, "_executor", full)
+    try:
+        response = client.post("/api/v1/quote", json=QUOTE)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        assert client.get("/api/v1/health").status_code == 200
+        assert client.get("/api/v1/model-info").status_code == 200
+    finally:
+        full.shutdown()
+
+
+def test_rejects_unknown_executor_kind():
+    with pytest.raises(ValueError):
+        InferenceExecutor("gpu", workers=1, queue_size=1, retry_after=1)
+
+
+async def test_reload_warms_the_new_pool_before_swapping(monkeypatch):
+    executor = InferenceExecutor("thread", workers=2, queue_size=4, retry_after=1)
+    # Thread pools stand in for spawned ones; the swap logic is what is tested
+    executor.kind = "process"
+    monkeypatch.setattr(executor, "_create_pool", lambda: ThreadPoolExecutor(max_workers=2))
+    old = executor._pool
+    warmed = []
+    release = threading.Event()
+
+    def fake_run_predictor(method, *args):
+        warmed.append((method, args))
+        release.wait(timeout=5)
+        return None, {}
+
+    monkeypatch.setattr(executor_module, "run_predictor", fake_run_predictor)
+    try:
+        reload = asyncio.ensure_future(executor.reload_workers(3))
+        await asyncio.sleep(0.05)
+
+        # Still warming: the old pool keeps serving
+        assert executor._pool is old and not old._shutdown
+        assert await executor.run(lambda: "served") == "served"
+
+        release.set()
+        await reload
+        assert executor._pool is not old and old._shutdown
+        assert warmed == [('warmup', (3,))] * 2
+    finally:
+        release.set()
+        executor.shutdown()
+        old.shutdown()
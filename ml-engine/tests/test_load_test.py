@@ -0,0 +1,50 @@
+"""Tests for the bench/ load generator."""
+import asyncio
+
+import httpx
+
+from bench.load_test import find_knee, run_load, summarize_step
+from tests.test_batch_quote import QUOTE
+
+
+def _step(concurrency, rps, error_rate=0.0):
+    return {'concurrency': concurrency, 'throughput_rps': rps, 'error_rate': error_rate}
+
+
+def test_knee_is_first_step_near_peak_throughput():
+    steps = [_step(1, 100), _step(2, 190), _step(4, 300), _step(8, 320), _step(16, 318)]
+    assert find_knee(steps)['concurrency'] == 4
+
+
+def test_knee_ignores_failing_steps():
+    steps = [_step(1, 100), _step(2, 150), _step(4, 400, error_rate=0.2)]
+    assert find_knee(steps)['concurrency'] == 2
+    assert find_knee([_step(1, 100, error_rate=1.0)]) is None
+
+
+def test_summarize_step_counts_errors():
+    step = summarize_step([0.001, 0.002, 0.003], errors=1, elapsed=0.5)
+    assert step['requests'] == 4
+    assert step['throughput_rps'] == 6.0
+    assert step['error_rate'] == 0.25
+    assert step['p50_ms'] == 2.0
+
+
+def test_in_process_run(predictor):
+    from src.main import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_load(client, [QUOTE], levels=(1, 2), duration=0.1,
+                                  warmup=0.05, log=lambda line: None)
+
+    report = asyncio.run(run())
+
+    assert set(report) == {"/api/v1/quote", "/api/v1/quote/rule-based",
+                           "/api/v1/risk-assessment"}
+    for endpoint in report.values():
+        assert [step['concurrency'] for step in endpoint['steps']] == [1, 2]
+        assert all(step['error_rate'] == 0 and step['requests'] > 0
+                   for step in endpoint['steps'])
+        assert endpoint['knee'] is not None
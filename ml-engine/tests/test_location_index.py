@@ -0,0 +1,81 @@
+"""Tests for the ZIP -> state / risk zone / rate modifier index."""
+import pytest
+
+from src.models import location_index
+from src.models.location_index import (
+    UNKNOWN_LOCATION,
+    Location,
+    LocationIndex,
+    load_location_index,
+    merge_locations,
+    parse_seed_sql,
+)
+from tests.test_batch_quote import QUOTE
+
+SEED = """
+INSERT INTO locations (zip_code, city, state, risk_zone, rate_modifier) VALUES
+    -- Oregon (new market)
+    ('97201', 'Portland', 'OR', 'medium', 1.22),
+    ('10019', 'Manhattan, NY', 'NY', 'critical', 1.50)
+ON CONFLICT (zip_code) DO UPDATE SET city = EXCLUDED.city;
+
+UPDATE locations SET rate_modifier = 1.35, risk_zone = 'high' WHERE zip_code = '90001';  -- LA
+"""
+
+
+def test_parse_seed_sql_skips_comments_and_keeps_partial_updates():
+    rows = {location.zip_code: location for location in parse_seed_sql(SEED)}
+    assert rows['97201'] == Location('97201', 'Portland', 'OR', 'medium', 1.22)
+    assert rows['10019'].city == 'Manhattan, NY'
+    assert rows['90001'] == Location('90001', '', '', 'high', 1.35)
+
+
+def test_merge_overlays_later_sources_field_by_field():
+    base = [Location('90001', 'Los Angeles', 'CA', 'low', 1.0)]
+    merged = merge_locations(base, parse_seed_sql(SEED))
+    assert Location('90001', 'Los Angeles', 'CA', 'high', 1.35) in merged
+
+
+def test_resolve_zip5_then_zip3_then_default():
+    index = LocationIndex([
+        Location('90001', 'Los Angeles', 'CA', 'high', 1.35),
+        Location('90012', 'Downtown LA', 'CA', 'critical', 1.5),
+    ])
+    assert index.resolve('90012').city == 'Downtown LA'
+    assert index.resolve('90012-4801').city == 'Downtown LA'
+    assert index.resolve('90099').city == 'Los Angeles'
+    assert index.resolve('33101') is UNKNOWN_LOCATION
+
+
+def test_default_sources_include_seed_and_generator():
+    index = load_location_index()
+    assert index.resolve('97201').state == 'OR'  # seed_2026.sql only
+    assert index.resolve('94102').risk_zone == 'high'  # both sources
+    assert index.resolve('90210').rate_modifier == pytest.approx(1.40)  # seed UPDATE
+
+
+def test_quotes_use_the_resolved_location(client, predictor, monkeypatch):
+    monkeypatch.setattr(location_index, "_index", LocationIndex([
+        Location(QUOTE['location_zip'], 'Testville', 'NV', 'critical', 1.7),
+    ]))
+    seen = []
+    original = predictor.predict_quote
+    monkeypatch.setattr(predictor, "predict_quote",
+                        lambda **kwargs: seen.append(kwargs) or original(**kwargs))
+    predictor.cache.clear()
+
+    breakdown = client.post("/api/v1/quote", json=QUOTE).json()['breakdown']
+
+    # Startup warmup calls may interleave; pick out the request's call
+    call, = [kwargs for kwargs in seen if kwargs['zip_code'] == QUOTE['location_zip']]
+    assert call['state'] == 'NV' and call['risk_zone'] == 'critical'
+    assert breakdown['location'] == 'Testville, NV'
+    assert breakdown['location_multiplier'] == 1.7
+
+
+def test_reload_swaps_the_index(monkeypatch):
+    monkeypatch.setattr(location_index, "_index", None)
+    old = location_index.get_location_index()
+    replacement = LocationIndex([])
+    assert location_index.reload_location_index(replacement) is replacement
+    assert location_index.get_location_index() is replacement is not old
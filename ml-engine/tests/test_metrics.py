@@ -0,0 +1,91 @@
+"""Tests for the /metrics endpoint and the in-process metrics registry."""
+import re
+
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.metrics import EngineMetrics, Histogram, collect_stages, get_metrics, timed
+from src.models import trained_predictor
+from tests.test_batch_quote import QUOTE
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    """Value of one sample line in Prometheus text output (0 if absent)."""
+    for line in text.splitlines():
+        match = re.fullmatch(rf"{re.escape(name)}\{{(.*)\}} (\S+)", line)
+        if match and all(f'{key}="{value}"' in match.group(1) for key, value in labels.items()):
+            return float(match.group(2))
+    return 0.0
+
+
+def test_histogram_renders_cumulative_buckets():
+    metrics = EngineMetrics()
+    histogram = metrics.stage_latency.labels('encode')
+    for seconds in (0.00005, 0.0003, 0.0003, 20.0):
+        histogram.observe(seconds)
+
+    text = metrics.render()
+
+    name = 'guardquote_stage_duration_seconds'
+    assert _sample(text, f'{name}_bucket', stage='encode', le='0.0001') == 1
+    assert _sample(text, f'{name}_bucket', stage='encode', le='0.0005') == 3
+    assert _sample(text, f'{name}_bucket', stage='encode', le='10.0') == 3
+    assert _sample(text, f'{name}_bucket', stage='encode', le='+Inf') == 4
+    assert _sample(text, f'{name}_count', stage='encode') == 4
+
+
+def test_histogram_bucket_array_is_fixed():
+    histogram = Histogram()
+    for i in range(1000):
+        histogram.observe(i / 100)
+    assert len(histogram.counts) == len(histogram.bounds) + 1
+    assert sum(histogram.counts) == histogram.count == 1000
+
+
+def test_timed_is_a_no_op_without_collector():
+    with timed('encode'):
+        pass
+    with collect_stages() as stages:
+        with timed('encode'):
+            pass
+        with timed('encode'):
+            pass
+    assert set(stages) == {'encode'} and stages['encode'] >= 0
+
+
+def test_quote_records_route_and_stage_metrics(client):
+    before = get_metrics().render()
+
+    assert client.post("/api/v1/quote", json=QUOTE).status_code == 200
+    client.get("/no-such-page")
+    text = client.get("/metrics").text
+
+    def delta(name, **labels):
+        return _sample(text, name, **labels) - _sample(before, name, **labels)
+
+    assert delta('guardquote_http_requests_total',
+                 route='/api/v1/quote', method='POST', status='200') == 1
+    assert delta('guardquote_http_request_duration_seconds_count',
+                 route='/api/v1/quote', method='POST') == 1
+    assert delta('guardquote_http_requests_total', route='unmatched', status='404') == 1
+    assert _sample(text, 'guardquote_http_requests_in_flight', route='/api/v1/quote') == 0
+    for stage in ('encode', 'predict_price', 'predict_risk', 'serialize'):
+        assert delta('guardquote_stage_duration_seconds_count', stage=stage) == 1
+
+
+def test_fallbacks_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(tmp_path / "missing.pkl"))
+    monkeypatch.setattr(trained_predictor, "_predictor", trained_predictor.TrainedPredictor())
+    before = get_metrics().render()
+
+    with TestClient(app) as client:
+        client.post("/api/v1/quote", json=QUOTE)
+        client.post("/api/v1/risk-assessment", json=QUOTE)
+        text = client.get("/metrics").text
+
+    def delta(model):
+        return (_sample(text, 'guardquote_fallback_total', model=model)
+                - _sample(before, 'guardquote_fallback_total', model=model))
+
+    assert delta('price') == 1
+    assert delta('risk') == 2
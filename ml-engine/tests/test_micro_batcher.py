@@ -0,0 +1,83 @@
+"""Tests for dynamic micro-batching."""
+import asyncio
+
+from src.api import batcher as batcher_module
+from src.api.batcher import MicroBatcher
+from src.config import get_settings
+from src.metrics import collect_stages, record_stages
+from tests.test_batch_quote import QUOTE
+
+
+async def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    async def run_batch(items):
+        calls.append(len(items))
+        return [{'value': item['n'] * 2} for item in items]
+
+    batcher = MicroBatcher(run_batch, window_ms=20, max_size=100)
+    results = await asyncio.gather(*(batcher.submit({'n': n}) for n in range(10)))
+
+    assert results == [{'value': n * 2} for n in range(10)]
+    assert calls == [10]
+    assert batcher.stats()['batch_sizes'] == {'10': 1}
+
+
+async def test_max_size_flushes_before_window():
+    calls = []
+
+    async def run_batch(items):
+        calls.append(len(items))
+        return [{} for _ in items]
+
+    batcher = MicroBatcher(run_batch, window_ms=10_000, max_size=4)
+    await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit({}) for _ in range(8))), timeout=1
+    )
+
+    assert calls == [4, 4]
+    assert batcher.stats()['mean_batch_size'] == 4.0
+
+
+async def test_item_errors_only_fail_their_caller():
+    async def run_batch(items):
+        return [{'error': 'bad zip'} if item['bad'] else {'ok': True} for item in items]
+
+    batcher = MicroBatcher(run_batch, window_ms=5, max_size=10)
+    good, bad = await asyncio.gather(
+        batcher.submit({'bad': False}), batcher.submit({'bad': True}), return_exceptions=True
+    )
+
+    assert good == {'ok': True}
+    assert isinstance(bad, ValueError)
+
+
+async def test_every_caller_reports_the_batch_stages():
+    async def run_batch(items):
+        record_stages({'predict_price': 0.004})
+        return [{} for _ in items]
+
+    batcher = MicroBatcher(run_batch, window_ms=5, max_size=10)
+
+    async def request():
+        with collect_stages() as spans:
+            await batcher.submit({})
+        return spans
+
+    spans = await asyncio.gather(*(request() for _ in range(3)))
+
+    assert batcher.stats()['batch_sizes'] == {'3': 1}
+    assert spans == [{'predict_price': 0.004}] * 3
+
+
+def test_quote_route_uses_batcher_when_enabled(client, monkeypatch):
+    baseline = client.post("/api/v1/quote", json=QUOTE).json()
+
+    monkeypatch.setattr(get_settings(), "microbatch_enabled", True)
+    monkeypatch.setattr(batcher_module, "_batcher", None)
+
+    batched = client.post("/api/v1/quote", json=QUOTE).json()
+    info = client.get("/api/v1/model-info").json()
+
+    assert batched == baseline
+    assert info["micro_batching"]["requests"] == 1
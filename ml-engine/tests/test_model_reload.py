@@ -0,0 +1,96 @@
+"""Tests for zero-downtime model reload."""
+import pickle
+
+import pytest
+
+from src.config import get_settings
+from src.models import trained_predictor
+from tests.conftest import build_artifacts
+from tests.test_batch_quote import QUOTE
+from tests.test_trained_predictor import INPUTS
+
+SECRET = "test-reload-secret"
+
+
+@pytest.fixture
+def reload_secret(monkeypatch):
+    monkeypatch.setattr(get_settings(), "ml_engine_secret", SECRET)
+    monkeypatch.setattr(get_settings(), "model_warmup_requests", 4)
+
+
+def _write_retrained(path):
+    artifacts = build_artifacts()
+    artifacts['trained_at'] = '2026-02-01T09:00:00'
+    with open(path, 'wb') as f:
+        pickle.dump(artifacts, f)
+
+
+def test_reload_requires_secret(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ml_engine_secret", "")
+    assert client.post("/api/v1/model/reload").status_code == 403
+    assert client.post(
+        "/api/v1/model/reload", headers={"X-Internal-Secret": "anything"}
+    ).status_code == 403
+
+    monkeypatch.setattr(get_settings(), "ml_engine_secret", SECRET)
+    assert client.post(
+        "/api/v1/model/reload", headers={"X-Internal-Secret": "wrong"}
+    ).status_code == 403
+
+
+def test_reload_swaps_model_and_reports_version(client, predictor, reload_secret,
+                                                tmp_path, monkeypatch):
+    path = tmp_path / "guardquote_models.pkl"
+    _write_retrained(path)
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(path))
+
+    before = client.post("/api/v1/quote", json=QUOTE).json()
+    assert before['model_version'] == predictor.version
+
+    response = client.post("/api/v1/model/reload", headers={"X-Internal-Secret": SECRET})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['previous_version'] == predictor.version
+    assert body['model_version'] != predictor.version
+    assert trained_predictor.get_predictor() is not predictor
+    assert client.get("/api/v1/model-info").json()['model_version'] == body['model_version']
+    after = client.post("/api/v1/quote", json=QUOTE).json()
+    assert after['model_version'] == body['model_version']
+    risk = client.post("/api/v1/risk-assessment", json=QUOTE).json()
+    assert risk['model_version'] == body['model_version']
+
+
+def test_failed_reload_keeps_current_model(client, predictor, reload_secret,
+                                           tmp_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(tmp_path / "missing.pkl"))
+
+    response = client.post("/api/v1/model/reload", headers={"X-Internal-Secret": SECRET})
+
+    assert response.status_code == 500
+    assert trained_predictor.get_predictor() is predictor
+
+
+def test_concurrent_reload_is_rejected(predictor):
+    with trained_predictor._reload_lock:
+        with pytest.raises(trained_predictor.ReloadInProgressError):
+            trained_predictor.reload_predictor()
+
+
+def test_old_predictor_keeps_serving_after_swap(predictor, tmp_path, monkeypatch):
+    expected = predictor.predict_quote(**INPUTS)
+    path = tmp_path / "guardquote_models.pkl"
+    _write_retrained(path)
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(path))
+
+    new = trained_predictor.reload_predictor(warmup_count=4)
+
+    assert new.loaded and new is trained_predictor.get_predictor()
+    assert new.cache.stats()['entries'] == 0
+    # An in-flight request holding the previous instance is unaffected
+    assert predictor.predict_quote(**INPUTS) == expected
+
+
+def test_rule_based_quote_reports_version(client):
+    response = client.post("/api/v1/quote/rule-based", json=QUOTE)
+    assert response.json()['model_version'] == "rule-based"
@@ -0,0 +1,63 @@
+"""Tests for the model output cache."""
+from datetime import datetime
+
+import numpy as np
+
+from src.models.prediction_cache import PredictionCache
+from tests.test_trained_predictor import INPUTS
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.models.prediction_cache.time.monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+
+    cache.put(b'a', 1.0)
+    cache.put(b'b', 2.0)
+    assert cache.get(b'a') == 1.0
+    cache.put(b'c', 3.0)  # evicts b, the least recently used
+
+    assert cache.get(b'b') is None
+    assert cache.evictions == 1
+
+    now[0] += 61
+    assert cache.get(b'a') is None
+    assert cache.expirations == 1
+
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 2
+    assert stats['entries'] == 1 and stats['memory_bytes'] > 0
+
+
+def test_equivalent_requests_share_an_entry(predictor):
+    first = predictor.predict_quote(**INPUTS)
+    same_encoding = dict(
+        INPUTS,
+        zip_code=INPUTS['zip_code'][:3] + '99',
+        event_date=INPUTS['event_date'].replace(minute=45),
+    )
+    second = predictor.predict_quote(**same_encoding)
+
+    assert second == first
+    assert predictor.cache.hits == 2  # price and risk
+    assert predictor.cache.misses == 2
+
+
+def test_reload_flushes_cache(predictor):
+    predictor.predict_quote(**INPUTS)
+    assert predictor.cache.stats()['entries'] == 2
+
+    predictor._load_models()
+
+    assert predictor.cache.stats()['entries'] == 0
+    predictor.predict_quote(**dict(INPUTS, event_date=datetime(2026, 8, 22, 23)))
+    assert predictor.cache.hits == 0
+
+
+def test_memory_counts_array_buffers():
+    cache = PredictionCache(max_entries=4, ttl_seconds=60)
+    probabilities = np.zeros((1, 1000))[0]  # a view, as predict_proba(...)[0] is
+    cache.put(b'risk', probabilities)
+    assert cache.memory_bytes >= probabilities.nbytes
+    cache.put(b'pair', (probabilities, probabilities))
+    assert cache.memory_bytes >= 3 * probabilities.nbytes
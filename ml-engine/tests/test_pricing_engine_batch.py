@@ -0,0 +1,99 @@
+"""Tests for vectorized rule-based pricing."""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.pricing_engine import PricingEngine, round_array
+from src.models.schemas import EventType, QuoteRequest
+
+NUMBER_FIELDS = ('base_price', 'risk_multiplier', 'final_price', 'confidence_score')
+BREAKDOWN_FIELDS = ('base_hourly_rate', 'armed_premium', 'adjusted_hourly_rate',
+                    'labor_cost', 'vehicle_cost')
+
+
+def _random_requests(n: int, seed: int = 7) -> list[QuoteRequest]:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    return [
+        QuoteRequest(
+            event_type=rng.choice(list(EventType)),
+            location_zip="90001",
+            num_guards=rng.randint(1, 100),
+            hours=round(rng.uniform(1, 24), rng.choice([0, 1, 2])),
+            date=start + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+            is_armed=rng.random() < 0.4,
+            requires_vehicle=rng.random() < 0.3,
+            crowd_size=rng.choice([0, rng.randint(1, 500), rng.randint(500, 80000)]),
+        )
+        for _ in range(n)
+    ]
+
+
+def _columns(requests: list[QuoteRequest]) -> dict:
+    return {
+        field: [getattr(request, field) for request in requests]
+        for field in ('event_type', 'date', 'num_guards', 'hours', 'crowd_size',
+                      'is_armed', 'requires_vehicle')
+    }
+
+
+def _assert_matches_scalar(engine, requests, batch):
+    for i, request in enumerate(requests):
+        quote = engine.calculate_quote(request)
+        score, _ = engine.calculate_risk_score(request)
+        assert batch['risk_score'][i] == score
+        assert batch['risk_level'][i] == quote.risk_level.value
+        for field in NUMBER_FIELDS:
+            assert batch[field][i] == getattr(quote, field), field
+        for field in BREAKDOWN_FIELDS:
+            assert batch[field][i] == quote.breakdown[field], field
+
+
+def test_batch_matches_scalar_exactly():
+    engine = PricingEngine()
+    requests = _random_requests(3000)
+
+    _assert_matches_scalar(engine, requests, engine.calculate_quotes_batch(_columns(requests)))
+
+
+def test_dataframe_input_with_datetime64_dates():
+    engine = PricingEngine()
+    requests = _random_requests(500, seed=11)
+    frame = pd.DataFrame(_columns(requests))
+    frame['event_type'] = [request.event_type.value for request in requests]
+    frame['date'] = pd.to_datetime(frame['date'])
+
+    from_frame = engine.calculate_quotes_batch(frame)
+    from_numpy = engine.calculate_quotes_batch(
+        {**_columns(requests), 'date': frame['date'].to_numpy()}
+    )
+
+    _assert_matches_scalar(engine, requests, from_frame)
+    _assert_matches_scalar(engine, requests, from_numpy)
+
+
+def test_optional_columns_default_like_the_schema():
+    engine = PricingEngine()
+    request = QuoteRequest(event_type="concert", location_zip="90001", num_guards=3,
+                           hours=6, date=datetime(2026, 5, 2, 23))
+    batch = engine.calculate_quotes_batch({
+        'event_type': ['concert'], 'date': [request.date],
+        'num_guards': [3], 'hours': [6.0],
+    })
+    _assert_matches_scalar(engine, [request], batch)
+
+
+def test_unknown_event_type_is_rejected():
+    with pytest.raises(ValueError):
+        PricingEngine().calculate_quotes_batch({
+            'event_type': ['wedding'], 'date': [datetime(2026, 1, 1)],
+            'num_guards': [1], 'hours': [1.0],
+        })
+
+
+def test_round_array_matches_python_round_on_ties():
+    values = np.array([0.285, 1.005, 2.675, 1.115, 1234.565, 10.0, 0.125, 99.995])
+    assert round_array(values).tolist() == [round(v, 2) for v in values.tolist()]
@@ -0,0 +1,95 @@
+"""Tests for the streaming NDJSON /quote/stream endpoint."""
+import asyncio
+import json
+import time
+
+from src.api import executor as executor_module
+from src.api.executor import InferenceExecutor
+from src.api.routes import _ndjson_lines
+from src.config import get_settings
+from src.main import app
+from tests.test_batch_quote import QUOTE
+
+
+def _ndjson(rows) -> bytes:
+    return b"".join(
+        (row if isinstance(row, bytes) else json.dumps(row).encode()) + b"\n" for row in rows
+    )
+
+
+def test_stream_matches_single_quotes_across_chunks(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "quote_stream_chunk_size", 3)
+    rows = [dict(QUOTE, num_guards=guards) for guards in range(1, 9)]
+    rows[4] = dict(QUOTE, hours=40)
+    rows[6] = b"{not json"
+
+    response = client.post("/api/v1/quote/stream", content=_ndjson(rows),
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == "application/x-ndjson"
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [item['index'] for item in items] == list(range(8))
+    assert "hours" in items[4]['error'] and items[6]['error']
+    for item, row in zip(items, rows):
+        if item['error'] is None:
+            single = client.post("/api/v1/quote", json=row).json()
+            assert item['quote']['final_price'] == single['final_price']
+
+
+def test_stream_reads_body_incrementally(predictor, monkeypatch):
+    """Results for early chunks are sent before the rest of the body arrives."""
+    monkeypatch.setattr(get_settings(), "quote_stream_chunk_size", 2)
+    events = []
+    body = [_ndjson([QUOTE]) for _ in range(6)]
+
+    async def receive():
+        await asyncio.sleep(0)
+        if not body:
+            return {"type": "http.disconnect"}
+        events.append("request")
+        return {"type": "http.request", "body": body.pop(0), "more_body": bool(body)}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message["body"]:
+            events.append(message["body"].count(b"\n"))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/api/v1/quote/stream",
+        "raw_path": b"/api/v1/quote/stream", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/x-ndjson")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert events == ["request", "request", 2, "request", "request", 2,
+                      "request", "request", 2]
+
+
+def test_ndjson_lines_bounds_long_lines():
+    async def stream():
+        for data in (b'{"a": 1}\n\n{"b"', b': 2}\n' + b"x" * 50, b"y" * 50, b"\n{}"):
+            yield data
+
+    async def collect():
+        return [line async for line in _ndjson_lines(stream(), max_line=64)]
+
+    assert asyncio.run(collect()) == [b'{"a": 1}', b'{"b": 2}', None, b"{}"]
+
+
+def test_saturated_queue_fails_lines_after_the_retry_deadline(client, monkeypatch):
+    full = InferenceExecutor("thread", workers=1, queue_size=0, retry_after=1)
+    monkeypatch.setattr(executor_module, "_executor", full)
+    monkeypatch.setattr(get_settings(), "quote_stream_chunk_size", 2)
+    monkeypatch.setattr(get_settings(), "quote_stream_retry_seconds", 0.05)
+
+    start = time.monotonic()
+    response = client.post("/api/v1/quote/stream", content=_ndjson([QUOTE] * 3),
+                           headers={"Content-Type": "application/x-ndjson"})
+
+    assert time.monotonic() - start < 1
+    items = [json.loads(line) for line in response.text.splitlines()]
+    assert [item['index'] for item in items] == [0, 1, 2]
+    assert all(item['quote'] is None and "queue is full" in item['error'] for item in items)
+    assert full.rejected >= 4
@@ -0,0 +1,73 @@
+"""Tests for the /quote/sweep price-curve endpoint."""
+from fastapi.testclient import TestClient
+
+from src.config import get_settings
+from src.main import app
+from src.models import trained_predictor
+from tests.test_batch_quote import QUOTE
+
+
+def test_sweep_matches_single_quotes(client):
+    response = client.post("/api/v1/quote/sweep", json={
+        "base": QUOTE,
+        "num_guards": {"start": 2, "stop": 6, "step": 2},
+        "hours": [4, 12.5],
+        "requires_vehicle": [False, True],
+    })
+
+    assert response.status_code == 200
+    grid = response.json()
+    assert grid['shape'] == [3, 2, 1, 2]
+    assert grid['axes'] == {
+        'num_guards': [2, 4, 6], 'hours': [4.0, 12.5],
+        'is_armed': [True], 'requires_vehicle': [False, True],
+    }
+    assert len(grid['final_price']) == len(grid['risk_level']) == 12
+
+    i = 0
+    for guards in (2, 4, 6):
+        for hours in (4.0, 12.5):
+            for vehicle in (False, True):
+                quote = client.post("/api/v1/quote", json=dict(
+                    QUOTE, num_guards=guards, hours=hours, requires_vehicle=vehicle,
+                )).json()
+                assert grid['final_price'][i] == quote['final_price']
+                assert grid['risk_level'][i] == quote['risk_level']
+                assert grid['model_version'] == quote['model_version']
+                i += 1
+
+
+def test_sweep_rejects_out_of_range_values(client):
+    response = client.post("/api/v1/quote/sweep", json={
+        "base": QUOTE, "hours": {"start": 20, "stop": 28, "step": 4},
+    })
+    assert response.status_code == 422
+    assert "hours=28.0" in response.json()['detail']
+
+    response = client.post("/api/v1/quote/sweep", json={"base": QUOTE, "num_guards": []})
+    assert response.status_code == 422
+
+
+def test_sweep_size_limit(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "quote_sweep_max_points", 10)
+    response = client.post("/api/v1/quote/sweep", json={
+        "base": QUOTE, "num_guards": {"start": 1, "stop": 100},
+    })
+    assert response.status_code == 413
+
+
+def test_sweep_falls_back_without_models(tmp_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(tmp_path / "missing.pkl"))
+    monkeypatch.setattr(trained_predictor, "_predictor", trained_predictor.TrainedPredictor())
+
+    with TestClient(app) as client:
+        grid = client.post("/api/v1/quote/sweep", json={
+            "base": QUOTE, "is_armed": [False, True],
+        }).json()
+        quotes = [
+            client.post("/api/v1/quote", json=dict(QUOTE, is_armed=armed)).json()
+            for armed in (False, True)
+        ]
+
+    assert grid['model_version'] == trained_predictor.FALLBACK_VERSION
+    assert grid['final_price'] == [quote['final_price'] for quote in quotes]
@@ -0,0 +1,46 @@
+"""Tests for the dict + orjson response path."""
+import json
+
+import pytest
+
+from src.api import responses
+from src.models.pricing_engine import PricingEngine
+from src.models.schemas import (
+    QuoteBatchResponse,
+    QuoteRequest,
+    QuoteResponse,
+    RiskAssessment,
+)
+from tests.test_batch_quote import QUOTE
+
+
+@pytest.mark.parametrize("path, model", [
+    ("/api/v1/quote", QuoteResponse),
+    ("/api/v1/quote/rule-based", QuoteResponse),
+    ("/api/v1/risk-assessment", RiskAssessment),
+])
+def test_bodies_match_response_models(client, path, model):
+    response = client.post(path, json=QUOTE)
+    assert response.headers['content-type'] == "application/json"
+    body = response.json()
+    assert model.model_validate(body).model_dump(mode='json') == body
+
+
+def test_batch_body_matches_response_model(client):
+    body = client.post("/api/v1/quote/batch", json=[QUOTE, dict(QUOTE, hours=99)]).json()
+    assert QuoteBatchResponse.model_validate(body).model_dump(mode='json') == body
+
+
+def test_rule_based_payload_matches_model():
+    engine = PricingEngine()
+    request = QuoteRequest.model_validate(QUOTE)
+    assert (json.loads(responses.dumps(engine.calculate_quote_payload(request)))
+            == engine.calculate_quote(request).model_dump(mode='json'))
+
+
+def test_stdlib_fallback_encodes_the_same(monkeypatch):
+    body = {'final_price': 1342.62, 'risk_factors': ["Large crowd (1,500 people)"],
+            'location': "São Paulo", 'model_version': None, 'ok': True}
+    fast = responses.dumps(body)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(body) == fast
@@ -0,0 +1,92 @@
+"""Tests for background model loading and the readiness endpoint."""
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from src.api import startup
+from src.main import app
+from src.models import trained_predictor
+
+
+def _wait_for(client, state: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get("/api/v1/ready").json()
+        if body['status'] == state or time.monotonic() > deadline:
+            return body
+        time.sleep(0.01)
+
+
+def test_ready_after_background_load(model_file, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", model_file)
+    monkeypatch.setattr(trained_predictor, "_predictor", None)
+    release = threading.Event()
+    load = trained_predictor.get_predictor
+
+    def slow_load():
+        release.wait(timeout=10)
+        return load()
+
+    monkeypatch.setattr(startup, "get_predictor", slow_load)
+
+    with TestClient(app) as client:
+        # Serving before the models are in memory
+        assert client.get("/api/v1/ready").status_code == 503
+        assert client.get("/api/v1/health").json()['status'] == "starting"
+
+        release.set()
+        body = _wait_for(client, "ready")
+
+        assert body['status'] == "ready"
+        assert client.get("/api/v1/ready").status_code == 200
+        assert {'unpickle_ms', 'warmup_ms', 'app_imports_ms'} <= set(body['timings_ms'])
+        health = client.get("/api/v1/health").json()
+        assert health['status'] == "healthy" and health['model_loaded']
+
+
+def test_missing_models_are_not_ready(tmp_path, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", str(tmp_path / "missing.pkl"))
+    monkeypatch.setattr(trained_predictor, "_predictor", None)
+
+    with TestClient(app) as client:
+        body = _wait_for(client, "failed")
+
+        assert body['status'] == "failed"
+        assert client.get("/api/v1/ready").status_code == 503
+        health = client.get("/api/v1/health").json()
+        assert health['status'] == "degraded"
+        assert not health['model_loaded']
+
+
+def test_warmup_leaves_cache_empty(predictor):
+    predictor.warmup(8)
+
+    stats = predictor.cache.stats()
+    assert stats['entries'] == 0
+    assert stats['hits'] == stats['misses'] == 0
+
+
+def test_model_info_does_not_wait_for_the_load(model_file, monkeypatch):
+    monkeypatch.setattr(trained_predictor, "MODEL_PATH", model_file)
+    monkeypatch.setattr(trained_predictor, "_predictor", None)
+    release = threading.Event()
+    load = trained_predictor.get_predictor
+
+    def slow_load():
+        release.wait(timeout=10)
+        return load()
+
+    monkeypatch.setattr(startup, "get_predictor", slow_load)
+
+    with TestClient(app) as client:
+        # Held as a load in progress would hold it; get_predictor() would block here
+        with trained_predictor._load_lock:
+            started = time.monotonic()
+            info = client.get("/api/v1/model-info").json()
+            assert time.monotonic() - started < 1
+        assert info['status'] == "starting"
+
+        release.set()
+        _wait_for(client, "ready")
+        assert client.get("/api/v1/model-info").json()['status'] == "loaded"
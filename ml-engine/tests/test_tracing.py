@@ -0,0 +1,84 @@
+"""Tests for per-request spans (Server-Timing header and trace file)."""
+import json
+import time
+
+from src.config import get_settings
+from src.tracing import close_trace_writer, get_trace_writer, server_timing_header
+from tests.test_batch_quote import QUOTE
+
+QUOTE_SPANS = {'validation', 'encode', 'predict_price', 'predict_risk', 'factors', 'serialize'}
+
+
+def _timings(response) -> dict:
+    entries = {}
+    for entry in response.headers['server-timing'].split(", "):
+        name, duration = entry.split(";dur=")
+        entries[name] = float(duration)
+    return entries
+
+
+def test_server_timing_header_format():
+    header = server_timing_header({'encode': 0.0012, 'predict_price': 0.0005}, 0.004)
+    assert header == "encode;dur=1.200, predict_price;dur=0.500, total;dur=4.000"
+
+
+def test_quote_returns_server_timing(client):
+    response = client.post("/api/v1/quote", json=QUOTE)
+
+    timings = _timings(response)
+    assert set(timings) == QUOTE_SPANS | {'total'}
+    assert all(duration >= 0 for duration in timings.values())
+    assert sum(timings[name] for name in QUOTE_SPANS) <= timings['total'] * 1.01
+
+
+def test_risk_assessment_spans(client):
+    timings = _timings(client.post("/api/v1/risk-assessment", json=QUOTE))
+    assert {'validation', 'encode', 'predict_risk', 'factors', 'serialize'} <= set(timings)
+    assert 'predict_price' not in timings
+
+
+def test_server_timing_can_be_disabled(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", False)
+    response = client.post("/api/v1/quote", json=QUOTE)
+    assert response.status_code == 200
+    assert 'server-timing' not in response.headers
+
+
+def test_spans_written_to_trace_file(client, tmp_path, monkeypatch):
+    trace_file = tmp_path / "trace.jsonl"
+    monkeypatch.setattr(get_settings(), "trace_file", str(trace_file))
+    try:
+        client.post("/api/v1/quote", json=QUOTE, headers={"X-Request-ID": "req-42"})
+        client.get("/api/v1/event-types")
+    finally:
+        close_trace_writer()
+
+    quote, event_types = [json.loads(line) for line in trace_file.read_text().splitlines()]
+    assert quote['request_id'] == "req-42"
+    assert quote['path'] == "/api/v1/quote" and quote['status'] == 200
+    assert set(quote['spans_ms']) == QUOTE_SPANS
+    assert event_types['request_id'] is None and event_types['spans_ms'] == {}
+
+
+def test_trace_file_writes_do_not_block_requests(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "trace_file", str(tmp_path / "trace.jsonl"))
+    writer = get_trace_writer()
+    written = []
+
+    class SlowDisk:
+        def write(self, line):
+            time.sleep(0.5)
+            written.append(line)
+
+        def close(self):
+            pass
+
+    writer._file = SlowDisk()
+    try:
+        start = time.perf_counter()
+        for _ in range(3):
+            assert client.get("/api/v1/event-types").status_code == 200
+        assert time.perf_counter() - start < 0.5
+    finally:
+        close_trace_writer()
+    assert len(written) == 3
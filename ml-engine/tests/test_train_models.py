@@ -0,0 +1,154 @@
+"""Tests for the parallel training stages."""
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, cross_val_score
+
+from src.data.sources import CsvSource, load_training_frame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import train_models  # noqa: E402
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "training_data_2026.csv")
+
+
+@pytest.fixture(scope="module")
+def training():
+    frame = load_training_frame(CsvSource(DATA)).head(150).copy()
+    return train_models.preprocess_features(frame)
+
+
+def test_fold_fits_score_like_cross_val_score(training, capsys):
+    data, price_features, _, _ = training
+    tasks = train_models.price_tasks(data, price_features)
+    results = train_models.run_fits(data, tasks, jobs=1)
+
+    y = data['final_price'].to_numpy()
+    model = train_models.price_candidates()['Gradient Boosting']
+    expected = cross_val_score(clone(model), data[price_features], y, scoring='r2',
+                               cv=KFold(train_models.PRICE_CV_FOLDS, shuffle=True, random_state=42))
+
+    folds = [results[('price', 'Gradient Boosting', fold)]
+             for fold in range(train_models.PRICE_CV_FOLDS)]
+    assert np.allclose([r2_score(y[fold.test], fold.y_pred) for fold in folds], expected)
+    # Fold 0 is the holdout fit; nothing is refit for it
+    train, test = train_models._holdout_split(data)
+    assert np.array_equal(folds[0].test, test) and len(test) == len(data) // 5
+    assert ('price', 'Ridge Regression', 1) not in results
+    assert len(tasks) == 2 * train_models.PRICE_CV_FOLDS + 1
+
+
+def test_pool_matches_serial_training(training, capsys):
+    data, price_features, risk_features, _ = training
+    X_price = data[price_features]
+    X_risk = data[risk_features]
+
+    serial = train_models.train_all(data, price_features, risk_features, jobs=1)
+    pooled = train_models.train_all(data, price_features, risk_features, jobs=2)
+
+    (price, _, name), (risk, _), (accept, accept_scaler, accept_features) = serial
+    (pooled_price, _, pooled_name), (pooled_risk, _), (pooled_accept, _, _) = pooled
+    assert name == pooled_name
+    if not hasattr(price, 'feature_names_in_'):
+        X_price = X_price.to_numpy()  # Ridge is fit on scaled arrays
+    assert np.allclose(price.predict(X_price), pooled_price.predict(X_price))
+    assert np.array_equal(risk.predict(X_risk), pooled_risk.predict(X_risk))
+    assert np.allclose(accept.coef_, pooled_accept.coef_)
+    assert accept_scaler is not None
+    assert accept_features == risk_features + ['final_price']
+    assert "Running 13 fits on 2 process(es)" in capsys.readouterr().out
+
+
+def test_searched_parameters_override_the_defaults():
+    params = {('price', 'Gradient Boosting'): {'n_estimators': 300, 'learning_rate': 0.2},
+              ('risk', 'Random Forest'): {'max_depth': 6}}
+    candidates = train_models.price_candidates(params)
+    assert candidates['Gradient Boosting'].get_params()['n_estimators'] == 300
+    assert candidates['Random Forest'].get_params()['max_depth'] == 15
+    assert train_models.risk_classifier(params).max_depth == 6
+    assert train_models.risk_classifier().max_depth == 10
+
+
+@pytest.fixture
+def trained_dir(tmp_path, monkeypatch):
+    """Models trained on the first 300 rows of a CSV that later grows to 400."""
+    monkeypatch.setattr(train_models, "MODEL_DIR", str(tmp_path / "models"))
+    source = tmp_path / "quotes.csv"
+    raw = pd.read_csv(DATA, nrows=400)
+    raw.head(300).to_csv(source, index=False)
+    train_models.main(["--source", str(source), "--jobs", "1"])
+    raw.to_csv(source, index=False)
+    return source
+
+
+def _saved(tmp_path):
+    with open(tmp_path / "models" / "guardquote_models.pkl", 'rb') as f:
+        return pickle.load(f)
+
+
+def test_incremental_run_extends_ensembles_from_the_mark(trained_dir, tmp_path, capsys):
+    before = _saved(tmp_path)
+    assert before['high_water_mark'] == {'rows': 300}
+
+    # 300 rows make a noisy baseline; only the drift test exercises the threshold
+    train_models.main(["--source", str(trained_dir), "--incremental", "--drift-threshold", "10"])
+    after = _saved(tmp_path)
+
+    assert after['high_water_mark'] == {'rows': 400}
+    assert after['training_rows'] == 400
+    assert after['incremental_updates'] == 1
+    assert after['price_model'].n_estimators > before['price_model'].n_estimators
+    assert after['holdout_metrics'] == before['holdout_metrics']
+    assert "Drift on 100 new rows" in capsys.readouterr().out
+
+    train_models.main(["--source", str(trained_dir), "--incremental", "--drift-threshold", "10"])
+    assert "Only 0 new rows" in capsys.readouterr().out
+    assert _saved(tmp_path)['incremental_updates'] == 1
+
+
+def test_drift_falls_back_to_a_full_retrain(trained_dir, tmp_path, capsys):
+    train_models.main(["--source", str(trained_dir), "--incremental", "--drift-threshold", "-1"])
+
+    saved = _saved(tmp_path)
+    assert "retraining on the full history" in capsys.readouterr().out
+    assert 'incremental_updates' not in saved
+    assert saved['training_rows'] == 400
+
+
+@pytest.mark.parametrize("baseline", [
+    {'price_mae': 0.0, 'risk_accuracy': 0.9},
+    {'price_mae': 12.5, 'risk_accuracy': 0.0},
+    {'price_mae': 12.5},
+    None,
+])
+def test_unusable_drift_baselines_require_a_full_retrain(baseline):
+    with pytest.raises(train_models.FullRetrainRequired, match="baseline"):
+        train_models.measure_drift({'holdout_metrics': baseline}, pd.DataFrame())
+
+
+def test_unseen_labels_require_a_full_retrain(training):
+    data, _, _, encoders = training
+    rows = load_training_frame(CsvSource(DATA)).head(60).copy()
+    rows['state'] = rows['state'].cat.rename_categories(lambda state: "ZZ" if state == "CA" else state)
+    with pytest.raises(train_models.FullRetrainRequired, match="encoders"):
+        train_models.train_incremental(rows, {'encoders': encoders})
+
+
+def test_only_ensembles_are_warm_started():
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(200, 4)), rng.normal(size=200)
+    model = GradientBoostingRegressor(n_estimators=20, random_state=0).fit(X[:150], y[:150])
+    assert train_models.extend_ensemble(model, X[150:], y[150:], seen_rows=150) == 7
+    assert model.n_estimators == len(model.estimators_) == 27
+    assert not model.warm_start
+    with pytest.raises(train_models.FullRetrainRequired):
+        train_models.extend_ensemble(Ridge().fit(X, y), X, y, seen_rows=200)
@@ -0,0 +1,29 @@
+"""Tests for TrainedPredictor inference paths."""
+from datetime import datetime
+
+import pytest
+
+INPUTS = {
+    'event_type': 'sports', 'state': 'NY', 'zip_code': '10019', 'risk_zone': 'high',
+    'num_guards': 10, 'hours': 6.0, 'crowd_size': 12000,
+    'event_date': datetime(2026, 8, 22, 23), 'is_armed': True, 'has_vehicle': True,
+}
+RISK_INPUTS = {k: v for k, v in INPUTS.items() if k not in ('risk_zone', 'has_vehicle')}
+
+
+def test_predict_quote_matches_separate_calls(predictor):
+    fused = predictor.predict_quote(**INPUTS)
+
+    assert fused['price'] == predictor.predict_price(**INPUTS)
+    assert fused['risk'] == predictor.predict_risk(**RISK_INPUTS)
+
+
+def test_risk_class_is_argmax_of_probabilities(predictor):
+    _, features = predictor.encoder.encode_one(**INPUTS)
+    risk_model = predictor.models['risk_model']
+
+    result = predictor.predict_risk(**RISK_INPUTS)
+
+    expected = risk_model.predict(features)[0]
+    assert result['risk_level'] == ['low', 'medium', 'high', 'critical'][expected]
+    assert result['risk_score'] == pytest.approx(risk_model.predict_proba(features).max(), abs=1e-3)
@@ -0,0 +1,207 @@
+"""Tests for the chunked training data sources."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.sources import (
+    COLUMN_ALIASES, TRAINING_COLUMNS, CsvSource, ParquetSource, PostgresSource,
+    high_water_mark, load_training_frame, normalize_chunk, open_source,
+)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data", "processed", "training_data_2026.csv")
+
+
+def test_csv_columns_are_mapped_and_downcast():
+    frame = load_training_frame(CsvSource(DATA, chunksize=250))
+    raw = pd.read_csv(DATA)
+
+    assert list(frame.columns) == list(TRAINING_COLUMNS)
+    assert len(frame) == len(raw)
+    assert frame['event_type_code'].dtype == 'category'
+    assert frame['num_guards'].dtype == np.int8
+    assert frame['final_price'].dtype == np.float32
+    assert frame['was_accepted'].dtype == bool
+    assert np.allclose(frame['hours_per_guard'], raw['duration'], atol=1e-4)
+    assert (frame['num_guards'] == raw['guards']).all()
+    assert frame.memory_usage(deep=True).sum() < raw.memory_usage(deep=True).sum() / 4
+
+
+def test_string_booleans_are_parsed_not_cast(tmp_path):
+    raw = pd.read_csv(DATA, nrows=6)
+    raw['is_armed'] = ['t', 'f', 'true', 'False', '0', None]
+    raw['has_vehicle'] = [1, 0, 1, 0, 1, 0]
+
+    frame = normalize_chunk(raw)
+
+    assert frame['is_armed'].tolist() == [True, False, True, False, False, False]
+    assert frame['has_vehicle'].tolist() == [True, False, True, False, True, False]
+
+    raw['is_armed'] = ['t', 'maybe', 'f', 'f', 'f', 'f']
+    with pytest.raises(ValueError, match="is_armed"):
+        normalize_chunk(raw)
+
+
+def test_missing_zips_come_from_the_location_index():
+    from src.models.location_index import get_location_index
+
+    frame = load_training_frame(CsvSource(DATA))
+    index = get_location_index()
+    for zip_code, state in zip(frame['zip_code'].head(50), frame['state'].head(50)):
+        assert index.resolve(zip_code).state == state
+
+
+def test_categories_union_across_chunks():
+    chunks = [
+        pd.DataFrame({'event_type': ['concert'], 'state': ['CA'], 'guards': [2], 'duration': [4.0],
+                      'price': [500.0], 'accepted': [1]}),
+        pd.DataFrame({'event_type': ['retail'], 'state': ['NY'], 'guards': [300], 'duration': [8.0],
+                      'price': [900.0], 'accepted': [0]}),
+    ]
+
+    class Chunks:
+        def chunks(self):
+            yield from chunks
+
+    frame = load_training_frame(Chunks())
+    assert list(frame['event_type_code']) == ['concert', 'retail']
+    assert list(frame['state']) == ['CA', 'NY']
+    assert list(frame['num_guards']) == [2, 300]
+    assert list(frame['total_guard_hours']) == [8.0, 2400.0]
+    assert list(frame['was_accepted']) == [True, False]
+
+
+def test_parquet_matches_csv(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "training.parquet"
+    pd.read_csv(DATA).to_parquet(path)
+
+    source = open_source(str(path), chunksize=300)
+    assert isinstance(source, ParquetSource)
+    pd.testing.assert_frame_equal(
+        load_training_frame(source), load_training_frame(CsvSource(DATA, chunksize=300)),
+    )
+
+
+class FakeCursor:
+    def __init__(self, rows, columns, log):
+        self.rows = rows
+        self.description = [(name,) for name in columns]
+        self.log = log
+
+    def execute(self, query, params=()):
+        self.log.append(('execute', query, params))
+
+    def fetchmany(self, size):
+        self.log.append(('fetchmany', size, self.itersize))
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.log.append(('close',))
+
+
+class FakeConnection:
+    def __init__(self, frame, log):
+        self.frame = frame
+        self.log = log
+
+    def cursor(self, name=None):
+        self.log.append(('cursor', name))
+        rows = list(self.frame.itertuples(index=False, name=None))
+        return FakeCursor(rows, list(self.frame.columns), self.log)
+
+    def close(self):
+        self.log.append(('close connection',))
+
+
+def test_postgres_reads_through_a_named_cursor():
+    raw = pd.read_csv(DATA, nrows=25).rename(columns=COLUMN_ALIASES)
+    log = []
+    source = PostgresSource("dbname=test", chunksize=10,
+                            connect=lambda dsn: FakeConnection(raw, log))
+
+    frame = load_training_frame(source)
+
+    assert len(frame) == 25
+    assert log[0] == ('cursor', 'guardquote_training')
+    assert log[1] == ('execute', 'SELECT * FROM "ml_training_data"', ())
+    assert [entry for entry in log if entry[0] == 'fetchmany'] == [('fetchmany', 10, 10)] * 4
+    assert log[-1] == ('close connection',)
+
+
+def test_postgres_reads_after_the_high_water_mark():
+    raw = pd.read_csv(DATA, nrows=5).rename(columns=COLUMN_ALIASES)
+    raw.insert(0, 'id', range(101, 106))
+    raw['created_at'] = pd.date_range("2026-03-01", periods=5, freq="h")
+    log = []
+    source = open_source("postgres", chunksize=10, since={'rows': 100, 'id': 100})
+    source._connect = lambda dsn: FakeConnection(raw, log)
+
+    frame = load_training_frame(source)
+
+    assert log[1] == ('execute', 'SELECT * FROM "ml_training_data" WHERE id > %s ORDER BY id', (100,))
+    assert frame['id'].dtype == np.int64
+    assert high_water_mark(frame, {'rows': 100, 'id': 100}) == {
+        'rows': 105, 'id': 105, 'created_at': '2026-03-01T04:00:00'}
+    assert high_water_mark(frame.head(0), {'rows': 105, 'id': 105}) == {'rows': 105, 'id': 105}
+
+
+def test_files_resume_after_the_rows_already_read(tmp_path):
+    pytest.importorskip("pyarrow")
+    raw = pd.read_csv(DATA, nrows=250)
+    path = tmp_path / "training.parquet"
+    raw.to_parquet(path)
+    expected = load_training_frame(CsvSource(DATA, chunksize=60)).iloc[170:250].reset_index(drop=True)
+
+    for spec in (DATA, str(path)):
+        tail = load_training_frame(open_source(spec, chunksize=60, since={'rows': 170}))
+        pd.testing.assert_frame_equal(tail.head(80), expected, check_categorical=False)
+    assert high_water_mark(tail.head(80), {'rows': 170}) == {'rows': 250}
+
+
+def test_open_source_dispatch():
+    assert isinstance(open_source("postgres"), PostgresSource)
+    assert open_source("postgresql://u@db/guardquote").dsn == "postgresql://u@db/guardquote"
+    assert isinstance(open_source("history.PQ"), ParquetSource)
+    assert isinstance(open_source(DATA), CsvSource)
+
+
+def test_preprocess_features_encodes_categoricals_like_strings():
+    import train_models
+
+    compact = load_training_frame(CsvSource(DATA))
+    plain = compact.astype({name: object for name in ('event_type_code', 'zip_code',
+                                                       'state', 'risk_zone')})
+
+    data, price_features, _, encoders = train_models.preprocess_features(compact)
+    expected, _, _, expected_encoders = train_models.preprocess_features(plain)
+
+    assert data is compact
+    for name in price_features:
+        assert np.array_equal(data[name].to_numpy(float), expected[name].to_numpy(float)), name
+    for name, encoder in encoders.items():
+        assert list(encoder.classes_) == list(expected_encoders[name].classes_)
+
+
+def test_missing_state_and_zip_get_serving_defaults():
+    import train_models
+    from src.models.feature_encoder import DEFAULT_LABELS, DEFAULT_ZIP_REGION
+
+    compact = load_training_frame(CsvSource(DATA)).head(4).copy()
+    compact['state'] = pd.Categorical(['CA', 'NY', None, 'TX'])
+    compact['zip_code'] = pd.Categorical(['60601', None, '10001', '73301'])
+    plain = compact.astype({'state': object, 'zip_code': object})
+
+    for frame in (compact, plain):
+        data, _, _, encoders = train_models.preprocess_features(frame)
+        states = encoders['state'].inverse_transform(data['state_encoded'])
+        assert list(states) == ['CA', 'NY', DEFAULT_LABELS['state'], 'TX']
+        assert list(data['zip_region']) == [606, DEFAULT_ZIP_REGION, 100, 733]
+
+    with pytest.raises(ValueError, match="missing"):
+        train_models._label_encode(pd.Series(pd.Categorical(['CA', None]), name='state'))
@@ -0,0 +1,69 @@
+"""The compiled tree engine must reproduce sklearn exactly."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier, RandomForestRegressor
+
+from src.config import get_settings
+from src.models import trained_predictor
+from src.models.tree_engine import compile_model
+from tests.test_trained_predictor import INPUTS
+
+DATA_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "data", "processed", "training_data_2026.csv"
+)
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    df = pd.read_csv(DATA_PATH)
+    for column in ('event_type', 'state', 'risk_zone'):
+        df[column] = pd.factorize(df[column])[0]
+    X = df.drop(columns=['price', 'risk_score']).to_numpy(dtype=float)
+    return X, df['price'].to_numpy(), np.digitize(df['risk_score'], [0.25, 0.5, 0.75])
+
+
+def test_gradient_boosting_matches_sklearn(training_data):
+    X, y, _ = training_data
+    model = GradientBoostingRegressor(n_estimators=50, max_depth=5, random_state=42).fit(X, y)
+
+    np.testing.assert_array_equal(compile_model(model).predict(X), model.predict(X))
+
+
+def test_random_forest_regressor_matches_sklearn(training_data):
+    X, y, _ = training_data
+    # n_jobs=1 so sklearn sums trees in a fixed order
+    model = RandomForestRegressor(
+        n_estimators=30, max_depth=15, random_state=42, n_jobs=1
+    ).fit(X, y)
+
+    np.testing.assert_array_equal(compile_model(model).predict(X), model.predict(X))
+
+
+def test_random_forest_classifier_matches_sklearn(training_data):
+    X, _, y = training_data
+    model = RandomForestClassifier(
+        n_estimators=30, max_depth=10, random_state=42, n_jobs=1
+    ).fit(X, y)
+    compiled = compile_model(model)
+
+    np.testing.assert_array_equal(compiled.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_unsupported_models_are_not_compiled():
+    from sklearn.linear_model import Ridge
+
+    assert compile_model(Ridge().fit([[0.0], [1.0]], [0.0, 1.0])) is None
+
+
+def test_sklearn_engine_switch(predictor, monkeypatch):
+    assert predictor.engines == {'price_model': 'compiled', 'risk_model': 'compiled'}
+
+    monkeypatch.setattr(get_settings(), "tree_engine", "sklearn")
+    fallback = trained_predictor.TrainedPredictor()
+
+    assert fallback.engines == {'price_model': 'sklearn', 'risk_model': 'sklearn'}
+    assert fallback.predict_quote(**INPUTS) == predictor.predict_quote(**INPUTS)